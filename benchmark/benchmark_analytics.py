@@ -0,0 +1,135 @@
+# ProcessScheduler benchmark
+# Time the indicators computed after solving, on large synthetic solutions
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import numpy as np
+import processscheduler as ps
+from processscheduler.solution import SchedulingSolution, SolutionColumns
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--sizes",
+    default="10000,100000",
+    help="comma separated list of numbers of tasks",
+)
+parser.add_argument(
+    "-w", "--nb_workers", default=100, help="number of workers, with a cost"
+)
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.sizes.split(",")]
+nb_workers = int(args.nb_workers)
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tNumPy version:", np.__version__)
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_solution(size):
+    """each worker processes its tasks one after the other, with gaps"""
+    problem = ps.SchedulingProblem(f"Analytics{size}")
+    workers = [
+        ps.Worker(
+            f"W{i}",
+            cost=(
+                ps.ConstantCostPerPeriod(3)
+                if i % 2
+                else ps.PolynomialCostFunction(lambda t: t // 10 + 1)
+            ),
+        )
+        for i in range(nb_workers)
+    ]
+    rng = np.random.default_rng(0)
+    durations = rng.integers(1, 10, size)
+    gaps = rng.integers(0, 3, size)
+    task_workers = np.arange(size) % nb_workers
+    starts = np.zeros(size, dtype=np.int64)
+    next_starts = np.zeros(nb_workers, dtype=np.int64)
+    for i in range(size):
+        starts[i] = next_starts[task_workers[i]] + gaps[i]
+        next_starts[task_workers[i]] = starts[i] + durations[i]
+    ends = starts + durations
+    task_names = [f"T{i}" for i in range(size)]
+    assignments = [[] for _ in range(nb_workers)]
+    for i in range(size):
+        assignments[task_workers[i]].append((task_names[i], starts[i], ends[i]))
+    solution = SchedulingSolution(problem)
+    solution.horizon = int(ends.max())
+    solution.set_columns(
+        SolutionColumns(
+            task_names,
+            ["FixedDurationTask"] * size,
+            starts,
+            ends,
+            durations,
+            [False] * size,
+            [True] * size,
+            [[workers[j].name] for j in task_workers],
+            [worker.name for worker in workers],
+            ["Worker"] * nb_workers,
+            assignments,
+        )
+    )
+    due_dates = starts + 5
+    return problem, solution, due_dates
+
+
+def to_objects(solution):
+    """the same solution, with one object per task and per resource"""
+    objects_solution = SchedulingSolution(solution.problem)
+    objects_solution.horizon = solution.horizon
+    for task_solution in solution.tasks.values():
+        objects_solution.add_task_solution(task_solution)
+    for resource_solution in solution.resources.values():
+        objects_solution.add_resource_solution(resource_solution)
+    return objects_solution
+
+
+results = []
+for size in N:
+    print(f"-> {size} tasks")
+    problem, columnar_solution, due_dates = build_solution(size)
+    objects_solution = to_objects(columnar_solution)
+    for columnar, solution in [(False, objects_solution), (True, columnar_solution)]:
+        times = []
+        init_time = time.perf_counter()
+        analytics = ps.SolutionAnalytics(solution, problem)
+        times.append(time.perf_counter() - init_time)
+        for compute in [
+            analytics.get_flowtime,
+            analytics.get_utilizations,
+            analytics.get_idle_gaps,
+            analytics.get_costs,
+            lambda: analytics.get_tardiness(due_dates),
+        ]:
+            init_time = time.perf_counter()
+            compute()
+            times.append(time.perf_counter() - init_time)
+        results.append((size, columnar, [t * 1000 for t in times]))
+
+print("#### Results (ms) ####")
+print("size\tcolumnar\tinit\tflowtime\tutil.\tgaps\tcosts\ttardiness")
+for size, columnar, times in results:
+    print(f"{size}\t{columnar}\t\t" + "\t".join(f"{t:.1f}" for t in times))
@@ -0,0 +1,88 @@
+# ProcessScheduler benchmark
+# Compare the events and array buffer encodings
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import processscheduler as ps
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--nb_tasks",
+    default="10,20,40,80",
+    help="comma separated list of numbers of loading and unloading tasks",
+)
+parser.add_argument(
+    "-mt", "--max_time", default=60, help="Maximum time in seconds to find a solution"
+)
+parser.add_argument("-l", "--logics", default=None, help="SMT logics")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.nb_tasks.split(",")]
+mt = int(args.max_time)  # max time in seconds
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_problem(nb_tasks):
+    """nb_tasks tasks unload a buffer, nb_tasks tasks load it. The buffer
+    level must stay positive"""
+    problem = ps.SchedulingProblem(f"BufferEncoding{nb_tasks}", horizon=4 * nb_tasks)
+    buffer = ps.NonConcurrentBuffer(
+        "Buffer", initial_state=nb_tasks // 2, lower_bound=0
+    )
+    for i in range(nb_tasks):
+        unloading_task = ps.FixedDurationTask(f"UnloadTask_{i}", duration=i % 3 + 1)
+        loading_task = ps.FixedDurationTask(f"LoadTask_{i}", duration=i % 4 + 1)
+        ps.TaskUnloadBuffer(unloading_task, buffer, quantity=i % 2 + 1)
+        ps.TaskLoadBuffer(loading_task, buffer, quantity=i % 2 + 1)
+    return problem
+
+
+results = []
+for nb_tasks in N:
+    for buffer_encoding in ["array", "events"]:
+        print(f"-> {nb_tasks} tasks, {buffer_encoding} encoding")
+        init_time = time.perf_counter()
+        problem = build_problem(nb_tasks)
+        solver = ps.SchedulingSolver(
+            problem,
+            max_time=mt,
+            logics=args.logics,
+            buffer_encoding=buffer_encoding,
+        )
+        build_time = time.perf_counter() - init_time
+
+        init_time = time.perf_counter()
+        solution = solver.solve()
+        solve_time = time.perf_counter() - init_time
+
+        results.append((nb_tasks, buffer_encoding, build_time, solve_time, solution))
+
+print("#### Results ####")
+print("tasks\tencoding\tbuild(s)\tsolve(s)\tsolved")
+for nb_tasks, encoding, build_time, solve_time, solution in results:
+    print(
+        f"{nb_tasks}\t{encoding:8}\t{build_time:.2f}\t\t{solve_time:.2f}\t\t{bool(solution)}"
+    )
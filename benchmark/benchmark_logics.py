@@ -63,7 +63,9 @@ model_creation_times = []
 computation_times = []
 
 test_init_time = time.perf_counter()
+# None: the logics is selected from the assertions
 all_logics = [
+    None,
     "QF_LRA",
     "HORN",
     "QF_LIA",
@@ -0,0 +1,107 @@
+# ProcessScheduler benchmark
+# Compare the pairwise and time_indexed resource encodings
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import processscheduler as ps
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--nb_tasks",
+    default="100,500,2000",
+    help="comma separated list of numbers of tasks per worker",
+)
+parser.add_argument(
+    "-mt", "--max_time", default=60, help="Maximum time in seconds to find a solution"
+)
+parser.add_argument("-l", "--logics", default=None, help="SMT logics")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.nb_tasks.split(",")]
+mt = int(args.max_time)  # max time in seconds
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def get_model_size(assertions):
+    """the number of distinct sub-expressions of the assertions, the number
+    of assertions hides the size of a single large Distinct"""
+    visited = set()
+    to_visit = list(assertions)
+    while to_visit:
+        expression = to_visit.pop()
+        if expression.get_id() in visited:
+            continue
+        visited.add(expression.get_id())
+        to_visit.extend(expression.children())
+    return len(visited)
+
+
+def build_problem(nb_tasks):
+    """one single worker that has to process nb_tasks tasks"""
+    problem = ps.SchedulingProblem(f"ResourceEncoding{nb_tasks}")
+    worker = ps.Worker("Worker")
+    for i in range(nb_tasks):
+        task = ps.FixedDurationTask(f"Task_{i}", duration=i % 5 + 1)
+        task.add_required_resource(worker)
+    return problem
+
+
+results = []
+for nb_tasks in N:
+    for resource_encoding in ["pairwise", "time_indexed"]:
+        print(f"-> {nb_tasks} tasks, {resource_encoding} encoding")
+        init_time = time.perf_counter()
+        problem = build_problem(nb_tasks)
+        solver = ps.SchedulingSolver(
+            problem,
+            max_time=mt,
+            logics=args.logics,
+            resource_encoding=resource_encoding,
+        )
+        build_time = time.perf_counter() - init_time
+        model_size = get_model_size(solver._solver.assertions())
+
+        init_time = time.perf_counter()
+        solution = solver.solve()
+        solve_time = time.perf_counter() - init_time
+
+        results.append(
+            (
+                nb_tasks,
+                resource_encoding,
+                build_time,
+                model_size,
+                solve_time,
+                solution,
+            )
+        )
+
+print("#### Results ####")
+print("tasks\tencoding\tbuild(s)\tmodel size\tsolve(s)\tsolved")
+for nb_tasks, encoding, build_time, model_size, solve_time, solution in results:
+    print(
+        f"{nb_tasks}\t{encoding:12}\t{build_time:.2f}\t\t{model_size}\t\t{solve_time:.2f}\t\t{bool(solution)}"
+    )
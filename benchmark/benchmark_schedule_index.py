@@ -0,0 +1,128 @@
+# ProcessScheduler benchmark
+# Time queries on large synthetic solutions, compared to linear scans
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import random
+import uuid
+
+import processscheduler as ps
+from processscheduler.solution import ResourceSolution, SchedulingSolution
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--sizes",
+    default="10000,100000",
+    help="comma separated list of numbers of assignments of the resource",
+)
+parser.add_argument("-q", "--nb_queries", default=1000, help="number of queries")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.sizes.split(",")]
+nb_queries = int(args.nb_queries)
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_solution(size):
+    """one resource processes its tasks one after the other, with gaps"""
+    rng = random.Random(0)
+    resource_solution = ResourceSolution("Machine")
+    start = 0
+    for i in range(size):
+        start += rng.randint(0, 3)
+        end = start + rng.randint(1, 10)
+        resource_solution.assignments.append((f"T{i}", start, end))
+        start = end
+    solution = SchedulingSolution(ps.SchedulingProblem(f"ScheduleIndex{size}"))
+    solution.horizon = start
+    solution.add_resource_solution(resource_solution)
+    return solution
+
+
+def scan_tasks_at(assignments, t):
+    return [name for name, start, end in assignments if start <= t < end]
+
+
+def scan_first_free_slot(assignments, duration, earliest):
+    slot = earliest
+    for _, start, end in assignments:
+        if end > slot:
+            if start >= slot + duration:
+                return slot
+            slot = end
+    return slot
+
+
+results = []
+for size in N:
+    print(f"-> {size} assignments")
+    solution = build_solution(size)
+    assignments = solution.resources["Machine"].assignments
+    rng = random.Random(1)
+    times = [rng.randint(0, solution.horizon) for _ in range(nb_queries)]
+
+    init_time = time.perf_counter()
+    index = solution.get_schedule_index("Machine")
+    build_time = time.perf_counter() - init_time
+
+    init_time = time.perf_counter()
+    for t in times:
+        index.get_tasks_at(t)
+    index_at_time = time.perf_counter() - init_time
+    init_time = time.perf_counter()
+    for t in times:
+        index.get_first_free_slot(4, t)
+    index_slot_time = time.perf_counter() - init_time
+
+    # the linear scans, on a tenth of the queries
+    init_time = time.perf_counter()
+    for t in times[: nb_queries // 10]:
+        assert scan_tasks_at(assignments, t) == index.get_tasks_at(t)
+    scan_at_time = (time.perf_counter() - init_time) * 10
+    init_time = time.perf_counter()
+    for t in times[: nb_queries // 10]:
+        assert scan_first_free_slot(assignments, 4, t) == index.get_first_free_slot(
+            4, t
+        )
+    scan_slot_time = (time.perf_counter() - init_time) * 10
+    results.append(
+        (
+            size,
+            [
+                t * 1000
+                for t in [
+                    build_time,
+                    index_at_time,
+                    scan_at_time,
+                    index_slot_time,
+                    scan_slot_time,
+                ]
+            ],
+        )
+    )
+
+print(f"#### Results (ms, {nb_queries} queries) ####")
+print("size\tbuild\tat (index)\tat (scan)\tslot (index)\tslot (scan)")
+for size, times in results:
+    print(f"{size}\t" + "\t".join(f"{t:.1f}" for t in times))
@@ -0,0 +1,86 @@
+# ProcessScheduler benchmark
+# Compare the pairwise, network and permutation encodings of sort_no_duplicates
+import argparse
+import random
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import processscheduler as ps
+from processscheduler.util import sort_no_duplicates
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--nb_integers",
+    default="10,50,200,1000",
+    help="comma separated list of numbers of integers to sort",
+)
+parser.add_argument(
+    "-m",
+    "--methods",
+    default="pairwise,network,permutation",
+    help="comma separated list of sort methods",
+)
+parser.add_argument(
+    "-mt", "--max_time", default=60, help="Maximum time in seconds to find a solution"
+)
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.nb_integers.split(",")]
+methods = args.methods.split(",")
+mt = int(args.max_time)  # max time in seconds
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+results = []
+for n in N:
+    # n integers with distinct values, the solver has to find the
+    # values and the sorted list
+    values = list(range(n))
+    random.Random(n).shuffle(values)
+    for method in methods:
+        print(f"-> {n} integers, {method} encoding")
+        init_time = time.perf_counter()
+        integers = [z3.Int(f"x_{i}") for i in range(n)]
+        sorted_integers, assertions = sort_no_duplicates(integers, method)
+        solver = z3.Solver()
+        solver.set("timeout", mt * 1000)
+        solver.add(assertions)
+        solver.add([x == v for x, v in zip(integers, values)])
+        build_time = time.perf_counter() - init_time
+
+        init_time = time.perf_counter()
+        result = solver.check()
+        solve_time = time.perf_counter() - init_time
+        if result == z3.sat:
+            model = solver.model()
+            assert [model.eval(x).as_long() for x in sorted_integers] == sorted(values)
+
+        results.append((n, method, build_time, len(assertions), solve_time, result))
+
+print("#### Results ####")
+print("n\tmethod\t\tbuild(s)\tassertions\tsolve(s)\tresult")
+for n, method, build_time, nb_assertions, solve_time, result in results:
+    print(
+        f"{n}\t{method:12}\t{build_time:.2f}\t\t{nb_assertions}\t\t{solve_time:.2f}\t\t{result}"
+    )
@@ -0,0 +1,119 @@
+# ProcessScheduler benchmark
+# Compare the makespan optimization with and without symmetry breaking
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import processscheduler as ps
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--sizes",
+    default="6,9,12,15",
+    help="comma separated list of problem sizes",
+)
+parser.add_argument(
+    "-mt", "--max_time", default=60, help="Maximum time in seconds to find a solution"
+)
+parser.add_argument("-l", "--logics", default=None, help="SMT logics")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.sizes.split(",")]
+mt = int(args.max_time)  # max time in seconds
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_dev_team(size):
+    """each dev team selects one of three workers A and one of three workers B"""
+    problem = ps.SchedulingProblem(f"DevTeam{size}")
+    workers_a = [ps.Worker(f"A_{i}") for i in range(3)]
+    workers_b = [ps.Worker(f"B_{i}") for i in range(3)]
+    for i in range(size):
+        task = ps.FixedDurationTask(f"DevTeam_{i}", duration=1, priority=10)
+        task.add_required_resource(ps.SelectWorkers(workers_a))
+        task.add_required_resource(ps.SelectWorkers(workers_b))
+    return problem
+
+
+def build_cumulative(size):
+    """identical tasks processed by a cumulative worker of size 4"""
+    problem = ps.SchedulingProblem(f"Cumulative{size}")
+    machine = ps.CumulativeWorker("Machine", size=4)
+    for i in range(size):
+        task = ps.FixedDurationTask(f"Task_{i}", duration=2)
+        task.add_required_resource(machine)
+    return problem
+
+
+def build_n_queens(size):
+    """n-queens type scheduling, without any symmetry"""
+    problem = ps.SchedulingProblem(f"NQueens{size}")
+    workers = [ps.Worker(f"W-{i}") for i in range(size)]
+    tasks = {
+        (i, j): ps.FixedDurationTask(f"T-{i}-{j}", duration=1)
+        for i in range(size)
+        for j in range(size)
+    }
+    for i in range(size):
+        for j in range(1, size):
+            ps.TaskPrecedence(tasks[i, j - 1], tasks[i, j], offset=0)
+    for j in range(size):
+        for i in range(size):
+            tasks[(i + j) % size, j].add_required_resource(workers[i])
+    return problem
+
+
+results = []
+for size in N:
+    for build_problem in [build_dev_team, build_cumulative, build_n_queens]:
+        for symmetry_breaking in [False, True]:
+            print(f"-> {build_problem.__name__} {size}, {symmetry_breaking}")
+            problem = build_problem(size)
+            problem.add_objective_makespan()
+            init_time = time.perf_counter()
+            solver = ps.SchedulingSolver(
+                problem,
+                max_time=mt,
+                logics=args.logics,
+                symmetry_breaking=symmetry_breaking,
+            )
+            solution = solver.solve()
+            solve_time = time.perf_counter() - init_time
+            results.append(
+                (
+                    build_problem.__name__[6:],
+                    size,
+                    symmetry_breaking,
+                    solve_time,
+                    solution.horizon if solution else None,
+                )
+            )
+
+print("#### Results ####")
+print("problem\t\tsize\tsymmetry\tsolve(s)\thorizon")
+for problem_name, size, symmetry_breaking, solve_time, horizon in results:
+    print(
+        f"{problem_name:12}\t{size}\t{symmetry_breaking}\t\t{solve_time:.2f}\t\t{horizon}"
+    )
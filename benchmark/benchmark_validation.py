@@ -0,0 +1,125 @@
+# ProcessScheduler benchmark
+# Time the validation of large synthetic solutions, without the solver
+import argparse
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import numpy as np
+import processscheduler as ps
+from processscheduler.solution import SchedulingSolution, SolutionColumns
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--sizes",
+    default="10000,100000",
+    help="comma separated list of numbers of tasks",
+)
+parser.add_argument("-w", "--nb_workers", default=100, help="number of workers")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.sizes.split(",")]
+nb_workers = int(args.nb_workers)
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tNumPy version:", np.__version__)
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_problem_and_solution(size):
+    """each worker processes a chain of tasks, with time windows,
+    unavailabilities and workloads"""
+    problem = ps.SchedulingProblem(f"Validation{size}")
+    workers = [ps.Worker(f"W{i}") for i in range(nb_workers)]
+    rng = np.random.default_rng(0)
+    durations = rng.integers(1, 10, size)
+    gaps = rng.integers(0, 3, size)
+    task_workers = np.arange(size) % nb_workers
+    starts = np.zeros(size, dtype=np.int64)
+    next_starts = np.zeros(nb_workers, dtype=np.int64)
+    for i in range(size):
+        starts[i] = next_starts[task_workers[i]] + gaps[i]
+        next_starts[task_workers[i]] = starts[i] + durations[i]
+    ends = starts + durations
+    tasks = []
+    for i in range(size):
+        task = ps.FixedDurationTask(f"T{i}", duration=int(durations[i]))
+        task.add_required_resource(workers[task_workers[i]])
+        if i >= nb_workers:
+            ps.TaskPrecedence(tasks[i - nb_workers], task)
+        ps.TaskEndBeforeLax(task, int(ends[i]) + 5)
+        tasks.append(task)
+    horizon = int(ends.max())
+    for worker in workers:
+        ps.ResourceUnavailable(worker, [(horizon + 1, horizon + 10)])
+    for worker in workers[:10]:
+        ps.WorkLoad(worker, {(0, horizon // 2): horizon})
+    task_names = [task.name for task in tasks]
+    assignments = [[] for _ in range(nb_workers)]
+    for i in range(size):
+        assignments[task_workers[i]].append((task_names[i], starts[i], ends[i]))
+    solution = SchedulingSolution(problem)
+    solution.horizon = horizon
+    solution.set_columns(
+        SolutionColumns(
+            task_names,
+            ["FixedDurationTask"] * size,
+            starts,
+            ends,
+            durations,
+            [False] * size,
+            [True] * size,
+            [[workers[j].name] for j in task_workers],
+            [worker.name for worker in workers],
+            ["Worker"] * nb_workers,
+            assignments,
+        )
+    )
+    return problem, solution
+
+
+def to_objects(solution):
+    """the same solution, with one object per task and per resource"""
+    objects_solution = SchedulingSolution(solution.problem)
+    objects_solution.horizon = solution.horizon
+    for task_solution in solution.tasks.values():
+        objects_solution.add_task_solution(task_solution)
+    for resource_solution in solution.resources.values():
+        objects_solution.add_resource_solution(resource_solution)
+    return objects_solution
+
+
+results = []
+for size in N:
+    print(f"-> {size} tasks")
+    problem, columnar_solution = build_problem_and_solution(size)
+    objects_solution = to_objects(columnar_solution)
+    for columnar, solution in [(False, objects_solution), (True, columnar_solution)]:
+        init_time = time.perf_counter()
+        violations = solution.validate()
+        validation_time = time.perf_counter() - init_time
+        results.append((size, columnar, validation_time, len(violations)))
+
+print("#### Results ####")
+print("size\tcolumnar\tvalidate(s)\tviolations")
+for size, columnar, validation_time, nb_violations in results:
+    print(f"{size}\t{columnar}\t\t{validation_time:.3f}\t\t{nb_violations}")
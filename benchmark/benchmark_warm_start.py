@@ -0,0 +1,124 @@
+# ProcessScheduler benchmark
+# Rescheduling after a 5% perturbation, with and without warm start
+import argparse
+import random
+import time
+from datetime import datetime
+import subprocess
+import platform
+import uuid
+
+import processscheduler as ps
+import z3
+
+#
+# Argument parser
+#
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "-n",
+    "--nb_tasks",
+    default="100,200,400",
+    help="comma separated list of numbers of tasks",
+)
+parser.add_argument(
+    "-p",
+    "--perturbation",
+    default=5,
+    help="percentage of tasks whose duration changes",
+)
+parser.add_argument(
+    "-mt", "--max_time", default=60, help="Maximum time in seconds to find a solution"
+)
+parser.add_argument("-l", "--logics", default=None, help="SMT logics")
+
+args = parser.parse_args()
+
+N = [int(n) for n in args.nb_tasks.split(",")]
+perturbation = int(args.perturbation)
+mt = int(args.max_time)  # max time in seconds
+
+bench_id = uuid.uuid4().hex[:8]
+bench_date = datetime.now()
+print("#### Benchmark information header ####")
+print("Date:", bench_date)
+print("Id:", bench_id)
+print("Software:")
+print("\tPython version:", platform.python_version())
+print("\tProcessScheduler version:", ps.__VERSION__)
+commit_short_hash = subprocess.check_output(
+    ["git", "rev-parse", "--short", "HEAD"]
+).strip()
+print("\tz3 version:", z3.Z3_get_full_version())
+print("\tProcessScheduler commit number:", commit_short_hash.decode("utf-8"))
+
+
+def build_problem(nb_tasks, perturbed, target_makespan=None):
+    """nb_tasks tasks, a worker for 20 tasks and nb_tasks / 2 precedences.
+    If perturbed, the duration of some tasks is changed by one period.
+    If target_makespan is set, the optimization stops as soon as this value
+    is reached."""
+    ps.clear_main_context()
+    rnd = random.Random(1)
+    durations = [rnd.randint(1, 10) for _ in range(nb_tasks)]
+    if perturbed:
+        perturbation_rnd = random.Random(42)
+        nb_perturbed_tasks = nb_tasks * perturbation // 100
+        for i in perturbation_rnd.sample(range(nb_tasks), nb_perturbed_tasks):
+            durations[i] = max(1, durations[i] + perturbation_rnd.choice([-1, 1]))
+    problem = ps.SchedulingProblem(f"WarmStart{nb_tasks}")
+    workers = [ps.Worker(f"Worker_{i}") for i in range(max(1, nb_tasks // 20))]
+    tasks = [
+        ps.FixedDurationTask(f"Task_{i}", duration=durations[i])
+        for i in range(nb_tasks)
+    ]
+    for task in tasks:
+        task.add_required_resource(rnd.choice(workers))
+    for _ in range(nb_tasks // 2):
+        i, j = sorted(rnd.sample(range(nb_tasks), 2))
+        ps.TaskPrecedence(tasks[i], tasks[j])
+    makespan = ps.Indicator("MakeSpan", problem.horizon, bounds=(target_makespan, None))
+    ps.MinimizeObjective("MinimizeMakeSpan", makespan)
+    return problem
+
+
+def solve(problem, initial_solution=None):
+    solver = ps.SchedulingSolver(
+        problem, max_time=mt, logics=args.logics, initial_solution=initial_solution
+    )
+    init_time = time.perf_counter()
+    solution = solver.solve()
+    return solution, time.perf_counter() - init_time
+
+
+results = []
+for nb_tasks in N:
+    print(f"-> {nb_tasks} tasks")
+    # the previous plan
+    previous_solution, _ = solve(build_problem(nb_tasks, perturbed=False))
+    # the reference makespan of the new plan, the best one found by a cold
+    # start within max_time
+    reference_solution, _ = solve(build_problem(nb_tasks, perturbed=True))
+    target = reference_solution.horizon
+    # time to reach the reference makespan
+    cold_solution, cold_time = solve(build_problem(nb_tasks, True, target))
+    warm_solution, warm_time = solve(
+        build_problem(nb_tasks, True, target), initial_solution=previous_solution
+    )
+    results.append(
+        (
+            nb_tasks,
+            target,
+            cold_solution.horizon,
+            cold_time,
+            warm_solution.horizon,
+            warm_time,
+        )
+    )
+
+print("#### Results ####")
+print("tasks\ttarget\tcold\tcold(s)\twarm\twarm(s)\tspeedup")
+for nb_tasks, target, cold, cold_time, warm, warm_time in results:
+    print(
+        f"{nb_tasks}\t{target}\t{cold}\t{cold_time:.2f}\t{warm}\t{warm_time:.2f}\t{cold_time / warm_time:.1f}"
+    )
@@ -48,9 +48,18 @@ from processscheduler.resource_constraint import (
 from processscheduler.resource import Worker, CumulativeWorker, SelectWorkers
 from processscheduler.cost import ConstantCostPerPeriod, PolynomialCostFunction
 from processscheduler.problem import SchedulingProblem
+from processscheduler.ir import ProblemIR
 from processscheduler.solver import SchedulingSolver
+from processscheduler.cache import SolutionCache, get_problem_fingerprint
+from processscheduler.analytics import SolutionAnalytics
 from processscheduler.buffer import NonConcurrentBuffer
-from processscheduler.context import main_context, SchedulingContext, clear_main_context
+from processscheduler.context import (
+    main_context,
+    SchedulingContext,
+    clear_main_context,
+    get_main_context,
+    set_main_context,
+)
 from processscheduler.json_io import (
     export_json_to_file,
     export_json_to_string,
@@ -0,0 +1,438 @@
+"""Key performance indicators computed from a solution, after solving."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from processscheduler.cost import ConstantCostPerPeriod, PolynomialCostFunction
+from processscheduler.problem import SchedulingProblem
+from processscheduler.resource import CumulativeWorker
+from processscheduler.solution import SchedulingSolution
+
+# the names of the indicators created by the SchedulingProblem methods
+_RESOURCE_INDICATOR_NAMES = re.compile(
+    r"^(Utilization|Nb Tasks Assigned|Total Cost) \((.*)\)$"
+)
+
+
+class SolutionAnalytics:
+    """Compute indicators from the values of a solution, using NumPy. Any
+    indicator can be computed after solving, without declaring it in the
+    problem and solving again.
+
+    Task indicators are arrays in the order of task_names, resource
+    indicators are dicts indexed by resource names. The problem is required
+    for costs, priorities and to check the indicators reported by the solver.
+    """
+
+    def __init__(
+        self,
+        solution: SchedulingSolution,
+        problem: Optional[SchedulingProblem] = None,
+    ) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:
+            raise ModuleNotFoundError("numpy is not installed.") from exc
+
+        if not isinstance(solution, SchedulingSolution):
+            raise TypeError("solution must be a SchedulingSolution instance")
+        if problem is not None and not isinstance(problem, SchedulingProblem):
+            raise TypeError("problem must be a SchedulingProblem instance")
+
+        self.solution = solution
+        self.problem = problem
+        self.horizon = solution.horizon
+
+        columns = solution.columns
+        if columns is not None:
+            # a columnar solution, the arrays are used as is
+            self.task_names = columns.task_names
+            self.starts = columns.starts
+            self.ends = columns.ends
+            self.durations = columns.durations
+            self.scheduled = columns.scheduled
+            self.resource_names = columns.resource_names
+            assignments_indptr = columns.assignments_indptr
+            self.assignment_starts = columns.assignment_starts
+            self.assignment_ends = columns.assignment_ends
+        else:
+            task_solutions = list(solution.tasks.values())
+            nb_tasks = len(task_solutions)
+            self.task_names = list(solution.tasks)
+            self.starts = np.fromiter(
+                (task.start for task in task_solutions), np.int64, nb_tasks
+            )
+            self.ends = np.fromiter(
+                (task.end for task in task_solutions), np.int64, nb_tasks
+            )
+            self.durations = np.fromiter(
+                (task.duration for task in task_solutions), np.int64, nb_tasks
+            )
+            self.scheduled = np.fromiter(
+                (task.scheduled for task in task_solutions), bool, nb_tasks
+            )
+            self.resource_names = list(solution.resources)
+            assignments = [
+                resource.assignments for resource in solution.resources.values()
+            ]
+            assignments_indptr = np.cumsum(
+                [0]
+                + [len(resource_assignments) for resource_assignments in assignments]
+            )
+            self.assignment_starts = np.array(
+                [start for items in assignments for _, start, _ in items],
+                dtype=np.int64,
+            )
+            self.assignment_ends = np.array(
+                [end for items in assignments for _, _, end in items], dtype=np.int64
+            )
+        # the assignments of the resource j are the items from
+        # assignments_indptr[j] to assignments_indptr[j + 1]
+        self.assignments_indptr = assignments_indptr
+        # the index of the resource of each assignment
+        self.assignment_resources = np.repeat(
+            np.arange(len(self.resource_names)), np.diff(assignments_indptr)
+        )
+        self._resource_indices = {name: i for i, name in enumerate(self.resource_names)}
+        self._np = np
+        self._task_indices = None  # type: Optional[Dict[str, int]]
+
+    #
+    # Task indicators
+    #
+    def get_task_index(self, task_name: str) -> int:
+        return self.get_task_indices()[task_name]
+
+    def get_task_indices(self) -> Dict[str, int]:
+        """The index of each task name, computed on first lookup"""
+        if self._task_indices is None:
+            self._task_indices = dict(zip(self.task_names, range(len(self.task_names))))
+        return self._task_indices
+
+    def get_flowtime(self) -> int:
+        """The sum of the ends of the scheduled tasks"""
+        return int(self.ends[self.scheduled].sum())
+
+    def get_makespan(self) -> int:
+        """The greatest end of the scheduled tasks"""
+        if not self.scheduled.any():
+            return 0
+        return int(self.ends[self.scheduled].max())
+
+    def get_tardiness(self, due_dates: Union[Dict[str, int], Sequence[int]]):
+        """The tardiness of each task, i.e. max(0, end - due date), 0 for the
+        tasks without any due date and for the tasks that are not scheduled.
+        Due dates are a dict of task names to due dates, or an array of the
+        due dates of all the tasks in the order of task_names."""
+        np = self._np
+        if not isinstance(due_dates, dict):
+            due_dates = np.asarray(due_dates, dtype=np.int64)
+            if due_dates.shape != self.ends.shape:
+                raise ValueError("due_dates must have one value per task")
+            return np.where(self.scheduled, np.maximum(self.ends - due_dates, 0), 0)
+        indices = np.fromiter(
+            map(self.get_task_indices().__getitem__, due_dates),
+            np.int64,
+            len(due_dates),
+        )
+        dates = np.fromiter(due_dates.values(), np.int64, len(due_dates))
+        tardiness = np.zeros(len(self.task_names), dtype=np.int64)
+        tardiness[indices] = np.maximum(self.ends[indices] - dates, 0)
+        tardiness[~self.scheduled] = 0
+        return tardiness
+
+    def get_priorities_total(self) -> int:
+        """The sum of end * priority of the scheduled tasks"""
+        priorities = self._get_problem_tasks_values(lambda task: task.priority)
+        return int((self.ends * priorities)[self.scheduled].sum())
+
+    #
+    # Resource indicators
+    #
+    def get_assignments(self, resource_name: str):
+        """The start and end arrays of the assignments of a resource"""
+        resource_index = self._resource_indices[resource_name]
+        first = self.assignments_indptr[resource_index]
+        last = self.assignments_indptr[resource_index + 1]
+        return (
+            self.assignment_starts[first:last],
+            self.assignment_ends[first:last],
+        )
+
+    def get_busy_times(self) -> Dict[str, int]:
+        """The sum of the durations of the tasks assigned to each resource"""
+        np = self._np
+        busy_times = np.bincount(
+            self.assignment_resources,
+            weights=self.assignment_ends - self.assignment_starts,
+            minlength=len(self.resource_names),
+        )
+        return dict(zip(self.resource_names, np.rint(busy_times).astype(int).tolist()))
+
+    def get_nb_tasks_assigned(self) -> Dict[str, int]:
+        """The number of tasks assigned to each resource"""
+        nb_tasks = self._np.bincount(
+            self.assignment_resources, minlength=len(self.resource_names)
+        )
+        return dict(zip(self.resource_names, nb_tasks.tolist()))
+
+    def get_utilizations(self) -> Dict[str, float]:
+        """The busy time of each resource, as a percentage of the horizon"""
+        if self.horizon == 0:
+            return {resource_name: 0.0 for resource_name in self.resource_names}
+        return {
+            resource_name: busy_time * 100 / self.horizon
+            for resource_name, busy_time in self.get_busy_times().items()
+        }
+
+    def get_idle_gaps(self) -> Dict[str, object]:
+        """The time intervals where each resource is not busy, between 0 and
+        the horizon, as an array of (start, end) rows for each resource.
+        Assignments of a cumulative worker may overlap."""
+        np = self._np
+        gap_resources, gap_starts, gap_ends = self._get_gaps()
+        # the gaps are sorted by resource, split them at each new resource
+        boundaries = np.searchsorted(
+            gap_resources, np.arange(1, len(self.resource_names))
+        )
+        return dict(
+            zip(
+                self.resource_names,
+                np.split(np.column_stack((gap_starts, gap_ends)), boundaries),
+            )
+        )
+
+    def get_idle_times(self) -> Dict[str, int]:
+        """The total length of the idle gaps of each resource"""
+        gap_resources, gap_starts, gap_ends = self._get_gaps()
+        idle_times = self._np.bincount(
+            gap_resources,
+            weights=gap_ends - gap_starts,
+            minlength=len(self.resource_names),
+        )
+        return dict(zip(self.resource_names, idle_times.astype(int).tolist()))
+
+    def _get_gaps(self):
+        """The resource indices, starts and ends of all the idle gaps, sorted
+        by resource and start"""
+        np = self._np
+        nb_resources = len(self.resource_names)
+        starts = self.assignment_starts
+        ends = self.assignment_ends
+        resources = self.assignment_resources
+        # values of each resource are shifted above the values of the previous
+        # ones, so that a single sort or cumulative max does not mix resources
+        span = max(self.horizon, int(ends.max()) if len(ends) else 0) + 1
+        offsets = resources * span
+        # assignments are grouped by resource, sort them by start if needed
+        keys = starts + offsets
+        if np.any(keys[1:] < keys[:-1]):
+            order = np.argsort(keys, kind="stable")
+            starts = starts[order]
+            ends = ends[order]
+            resources = resources[order]
+        # the greatest end of the previous assignments of the same resource
+        latest_ends = np.maximum.accumulate(ends + offsets) - offsets
+        first = np.ones(len(starts), dtype=bool)
+        first[1:] = resources[1:] != resources[:-1]
+        previous_ends = np.empty_like(latest_ends)
+        previous_ends[1:] = latest_ends[:-1]
+        previous_ends[first] = 0
+        is_gap = starts > previous_ends
+        # the gap after the last assignment of each resource
+        last_ends = np.zeros(nb_resources, dtype=np.int64)
+        last = np.ones(len(starts), dtype=bool)
+        last[:-1] = resources[:-1] != resources[1:]
+        last_ends[resources[last]] = latest_ends[last]
+        is_last_gap = last_ends < self.horizon
+        gap_resources = np.concatenate((resources[is_gap], np.flatnonzero(is_last_gap)))
+        gap_starts = np.concatenate((previous_ends[is_gap], last_ends[is_last_gap]))
+        gap_ends = np.concatenate(
+            (starts[is_gap], np.full(is_last_gap.sum(), self.horizon))
+        )
+        order = np.argsort(gap_resources, kind="stable")
+        return gap_resources[order], gap_starts[order], gap_ends[order]
+
+    def get_costs(self) -> Dict[str, float]:
+        """The cost of each resource that has a cost function: the cost per
+        period times the busy time for a ConstantCostPerPeriod, the area
+        under the curve over each assignment for a PolynomialCostFunction"""
+        costs = {}
+        for resource_name in self.resource_names:
+            cost = self._get_cost_function(resource_name)
+            if isinstance(cost, ConstantCostPerPeriod):
+                costs[resource_name] = self._get_constant_cost(resource_name, cost)
+            elif isinstance(cost, PolynomialCostFunction):
+                costs[resource_name] = (
+                    self._get_double_variable_cost(resource_name, cost) / 2
+                )
+        return costs
+
+    #
+    # Buffer indicators
+    #
+    def get_buffer_profiles(self) -> Dict[str, object]:
+        """The level of each buffer at each instant from 0 to the horizon. A
+        state change at time t applies from t on."""
+        np = self._np
+        instants = np.arange(self.horizon + 1)
+        profiles = {}
+        for buffer_name, buffer_solution in self.solution.buffers.items():
+            states = np.array(buffer_solution.state, dtype=np.int64)
+            change_times = np.array(buffer_solution.state_change_times, dtype=np.int64)
+            profiles[buffer_name] = states[
+                np.searchsorted(change_times, instants, side="right")
+            ]
+        return profiles
+
+    #
+    # Check the indicators reported by the solver
+    #
+    def check_indicators(self) -> Dict[str, Tuple[int, int]]:
+        """Compute again the indicators the solver reported and return the
+        ones that differ, as a dict of indicator names to the (reported,
+        computed) values. Custom indicators, and cost indicators that depend
+        on which workers of a cumulative worker are selected, are skipped."""
+        if self.problem is None:
+            raise ValueError("the problem is required to check the indicators")
+        busy_times = self.get_busy_times()
+        nb_tasks_assigned = self.get_nb_tasks_assigned()
+        mismatches = {}
+        for name, reported in self.solution.indicators.items():
+            computed = None
+            if name == "FlowTime":
+                computed = self.get_flowtime()
+            elif name == "PriorityTotal":
+                computed = self.get_priorities_total()
+            elif name == "SmallestStartTime":
+                computed = int(self.starts.min())
+            elif name == "GreatestStartTime":
+                computed = int(self.starts.max())
+            else:
+                match = _RESOURCE_INDICATOR_NAMES.match(name)
+                if match is None:
+                    continue
+                kind, resource_names = match.groups()
+                if kind == "Utilization":
+                    computed = self._get_solver_utilization(
+                        busy_times.get(resource_names, 0)
+                    )
+                elif kind == "Nb Tasks Assigned":
+                    computed = nb_tasks_assigned.get(resource_names, 0)
+                else:
+                    computed = self._get_solver_cost(resource_names.split(","))
+            if computed is not None and computed != reported:
+                mismatches[name] = (reported, computed)
+        return mismatches
+
+    def _get_solver_utilization(self, busy_time: int) -> Optional[int]:
+        """The utilization, rounded the same way as the solver indicator"""
+        if self.problem.horizon_defined_value is not None:
+            return busy_time * int(100 / self.problem.horizon_defined_value)
+        if self.horizon == 0:
+            return None
+        return busy_time * 100 // self.horizon
+
+    def _get_solver_cost(self, resource_names: List[str]) -> Optional[int]:
+        """The total cost of the resources, rounded the same way as the
+        solver indicator, None if it cannot be computed again"""
+        constant_costs = 0
+        variable_costs = 0
+        for resource_name in resource_names:
+            if resource_name not in self._resource_indices:
+                continue
+            try:
+                cost = self._get_cost_function(resource_name)
+            except ValueError:
+                return None
+            if isinstance(cost, ConstantCostPerPeriod):
+                constant_costs += self._get_constant_cost(resource_name, cost)
+            elif isinstance(cost, PolynomialCostFunction):
+                variable_costs += round(
+                    self._get_double_variable_cost(resource_name, cost)
+                )
+        return constant_costs + variable_costs // 2
+
+    def _get_constant_cost(
+        self, resource_name: str, cost: ConstantCostPerPeriod
+    ) -> int:
+        starts, ends = self.get_assignments(resource_name)
+        return cost.value * int((ends - starts).sum())
+
+    def _get_double_variable_cost(
+        self, resource_name: str, cost: PolynomialCostFunction
+    ) -> float:
+        """Twice the area under the cost curve, computed with the trapezoidal
+        rule over each assignment as in the cost indicator"""
+        starts, ends = self.get_assignments(resource_name)
+        return float(
+            (self._evaluate(cost, starts) + self._evaluate(cost, ends)).dot(
+                ends - starts
+            )
+        )
+
+    def _get_cost_function(self, resource_name: str):
+        """The cost function of the resource, None if it has no cost. For a
+        cumulative worker, the cost per period of each of its workers must
+        be the same."""
+        if self.problem is None:
+            raise ValueError("the problem is required to compute costs")
+        resource = self.problem.context.get_resource_by_name(resource_name)
+        if resource is None:
+            return None
+        if isinstance(resource, CumulativeWorker) and resource.encoding != "native":
+            costs = [worker.cost for worker in resource.get_workers()]
+            if all(cost is None for cost in costs):
+                return None
+            if any(
+                not isinstance(cost, ConstantCostPerPeriod)
+                or cost.value != costs[0].value
+                for cost in costs
+            ):
+                raise ValueError(
+                    f"the cost of {resource_name} depends on the selected workers"
+                )
+            return costs[0]
+        return resource.cost
+
+    def _evaluate(self, cost: PolynomialCostFunction, values):
+        """Evaluate the cost function on an array, item by item if it does
+        not accept arrays"""
+        np = self._np
+        try:
+            results = np.asarray(cost.f(values), dtype=np.float64)
+        except TypeError:
+            results = None
+        if results is None or results.shape != values.shape:
+            results = np.array(
+                [cost.f(value) for value in values.tolist()], dtype=np.float64
+            )
+        return results
+
+    def _get_problem_tasks_values(self, get_value):
+        """An array of a value of the problem tasks, in the order of the
+        task names"""
+        if self.problem is None:
+            raise ValueError("the problem is required to compute this indicator")
+        np = self._np
+        values = np.zeros(len(self.task_names), dtype=np.int64)
+        for i, task_name in enumerate(self.task_names):
+            task = self.problem.context.get_task_by_name(task_name)
+            if task is not None:
+                values[i] = get_value(task)
+        return values
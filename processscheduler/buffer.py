@@ -47,17 +47,19 @@ class NonConcurrentBuffer(_NamedUIDObject):
         # loading tasks contribute to increment the buffer state
         self.loading_tasks = {}
         # a list that contains the instants where the buffer state changes
+        # they are sorted with the array encoding, not with the events one
         self.state_changes_time = []
-        # a list that stores the buffer state between each state change
+        # a list that stores the buffer state after each state change
         # the first item of this list is always the initial state
         self.buffer_states = []
 
         # add this task to the current context
-        if ps_context.main_context is None:
+        main_context = ps_context.get_main_context()
+        if main_context is None:
             raise AssertionError(
                 "No context available. First create a SchedulingProblem"
             )
-        ps_context.main_context.add_buffer(self)
+        main_context.add_buffer(self)
 
     def add_unloading_task(self, task, quantity) -> None:
         self.unloading_tasks[task] = quantity
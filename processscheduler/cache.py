@@ -0,0 +1,255 @@
+"""Problem fingerprints and an on-disk cache of solutions."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+import pickle
+import time
+import uuid
+import warnings
+from typing import Optional, Union
+
+from processscheduler.ir import ProblemIR
+from processscheduler.problem import SchedulingProblem
+from processscheduler.solution import SchedulingSolution
+from processscheduler.solver import SchedulingSolver
+
+# the task fields ignored by the structural fingerprint
+_DURATION_FIELDS = ["duration", "min_duration", "max_duration", "allowed_durations"]
+
+
+def get_problem_fingerprint(
+    problem: Union[SchedulingProblem, ProblemIR], structural: Optional[bool] = False
+) -> str:
+    """Return a content hash of the problem definition: tasks, resources,
+    buffers, constraints and objectives. It only depends on names and values,
+    not on uuids or on the order z3 variables were created in, nor on the
+    name of the problem.
+
+    If structural is True, task durations are ignored, so that two problems
+    that only differ by their durations have the same fingerprint."""
+    if isinstance(problem, SchedulingProblem):
+        problem = ProblemIR.from_problem(problem)
+    elif not isinstance(problem, ProblemIR):
+        raise TypeError("problem must be a SchedulingProblem or a ProblemIR")
+
+    tasks = []
+    for task in problem.tasks:
+        task_values = dict(zip(task.__slots__, task._values()))
+        if structural:
+            for field in _DURATION_FIELDS:
+                del task_values[field]
+        tasks.append(task_values)
+    content = {
+        "problem": [
+            problem.horizon,
+            problem.delta_time,
+            problem.start_time,
+            problem.end_time,
+        ],
+        "tasks": tasks,
+        "resources": [resource._values() for resource in problem.resources],
+        "buffers": [buffer._values() for buffer in problem.buffers],
+        "constraints": [
+            # dict keys, e.g. WorkLoad time intervals, are not json keys
+            (
+                constraint.kind,
+                sorted(
+                    (argument, f"{value}")
+                    for argument, value in constraint.arguments.items()
+                ),
+                constraint.optional,
+            )
+            for constraint in problem.constraints
+        ],
+        "objectives": [objective._values() for objective in problem.objectives],
+    }
+    content_string = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(content_string.encode("utf-8")).hexdigest()
+
+
+class SolutionCache:
+    """An on-disk cache of solutions, indexed by problem fingerprints.
+
+    Each proven solution, i.e. optimal or satisfying a problem without
+    objective, is stored twice: under the fingerprint of the problem, and
+    under its structural fingerprint. An identical problem gets the cached
+    solution back without building nor solving the model; a problem that
+    only differs by task durations is warm started from the cached solution
+    of the structurally identical one. Solutions that may not be optimal,
+    e.g. after a timeout, are only used to warm start.
+
+    The least recently used entries are evicted when there are more than
+    max_entries files in the cache directory. Only use a directory you
+    trust, entries are pickle files.
+    """
+
+    def __init__(self, directory: str, max_entries: Optional[int] = 256) -> None:
+        if not (isinstance(max_entries, int) and max_entries > 0):
+            raise TypeError("max_entries must be a strict positive integer")
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _load(self, key: str) -> Optional[dict]:
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                entry = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # mark as recently used
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+        return entry
+
+    def _store(self, key: str, entry: dict) -> None:
+        # write to a temporary file first, so that a concurrent reader
+        # never reads a partial entry. The name is unique to each call, so
+        # that concurrent writers, processes or threads, do not share it
+        path = self._get_path(key)
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary_path, "wb") as cache_file:
+            pickle.dump(entry, cache_file)
+        os.replace(temporary_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries"""
+        paths = [
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.endswith(".pickle")
+        ]
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=lambda path: os.stat(path).st_mtime_ns)
+        for path in paths[: len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:  # already removed by another process
+                pass
+
+    def __len__(self) -> int:
+        return len(
+            [
+                filename
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".pickle")
+            ]
+        )
+
+    def clear(self) -> None:
+        """Remove all the entries"""
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pickle"):
+                os.remove(os.path.join(self.directory, filename))
+
+    def put(
+        self,
+        problem: Union[SchedulingProblem, ProblemIR],
+        solution: SchedulingSolution,
+        proven: Optional[bool] = True,
+    ) -> None:
+        """Store the solution of a problem. If proven is False, the solution
+        may not be optimal, it is only used to warm start structurally
+        identical problems."""
+        self._put(
+            get_problem_fingerprint(problem),
+            get_problem_fingerprint(problem, True),
+            solution,
+            proven,
+        )
+
+    def _put(
+        self,
+        fingerprint: str,
+        structural_fingerprint: str,
+        solution: SchedulingSolution,
+        proven: bool,
+    ) -> None:
+        entry = {
+            "horizon": solution.horizon,
+            "tasks": solution.tasks,
+            "resources": solution.resources,
+            "buffers": solution.buffers,
+            "indicators": solution.indicators,
+        }
+        if proven:
+            self._store(fingerprint, entry)
+        self._store(f"structural_{structural_fingerprint}", entry)
+
+    def _build_solution(self, problem, entry: dict) -> SchedulingSolution:
+        solution = SchedulingSolution(problem)
+        solution.horizon = entry["horizon"]
+        solution.tasks = entry["tasks"]
+        solution.resources = entry["resources"]
+        solution.buffers = entry["buffers"]
+        solution.indicators = entry["indicators"]
+        return solution
+
+    def get_solution(
+        self, problem: Union[SchedulingProblem, ProblemIR]
+    ) -> Optional[SchedulingSolution]:
+        """Return the cached solution of an identical problem, None if there
+        is no such solution"""
+        entry = self._load(get_problem_fingerprint(problem))
+        if entry is None:
+            return None
+        return self._build_solution(problem, entry)
+
+    def get_initial_solution(
+        self, problem: Union[SchedulingProblem, ProblemIR]
+    ) -> Optional[SchedulingSolution]:
+        """Return the cached solution of a structurally identical problem,
+        None if there is no such solution"""
+        entry = self._load(f"structural_{get_problem_fingerprint(problem, True)}")
+        if entry is None:
+            return None
+        return self._build_solution(problem, entry)
+
+    def solve(self, problem: Union[SchedulingProblem, ProblemIR], **solver_options):
+        """Solve the problem, or return the cached solution of an identical
+        problem. solver_options are passed to the SchedulingSolver. The
+        solution of a structurally identical problem, if any, is used as
+        initial solution. Problems that have no IR, e.g. with z3 assertions,
+        are solved without the cache."""
+        try:
+            fingerprint = get_problem_fingerprint(problem)
+            structural_fingerprint = get_problem_fingerprint(problem, True)
+        except ValueError as exc:
+            warnings.warn(f"the problem is solved without the cache: {exc}")
+            return SchedulingSolver(problem, **solver_options).solve()
+
+        entry = self._load(fingerprint)
+        if entry is not None:
+            print(f"Solution cache:\n===============\n\t{problem.name} cached solution")
+            return self._build_solution(problem, entry)
+        entry = self._load(f"structural_{structural_fingerprint}")
+        if entry is not None and "initial_solution" not in solver_options:
+            solver_options["initial_solution"] = self._build_solution(problem, entry)
+        solver = SchedulingSolver(problem, **solver_options)
+        solution = solver.solve()
+        if solution:
+            self._put(
+                fingerprint, structural_fingerprint, solution, solver.optimality_proven
+            )
+        return solution
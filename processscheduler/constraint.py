@@ -38,12 +38,15 @@ class Constraint(_NamedUIDObject):
 
         # by default, this constraint has to be applied
         if self.optional:
-            self.applied = Bool("constraint_%s_applied" % self.uid)
+            self.applied = Bool(
+                "constraint_%s_applied" % self.uid,
+                ps_context.get_main_context().z3_context,
+            )
         else:
             self.applied = True
 
         # store this constraint into the current context
-        ps_context.main_context.add_constraint(self)
+        ps_context.get_main_context().add_constraint(self)
 
     def set_created_from_assertion(self) -> None:
         """Set the flag created_from_assertion True. This flag must be set to True
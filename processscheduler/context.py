@@ -15,10 +15,11 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
-from typing import List, Union
+import contextvars
+from typing import Dict, List, Optional, Set, Union
 import warnings
 
-from z3 import BoolRef, ArithRef
+from z3 import BoolRef, ArithRef, Context
 
 from processscheduler.constraint import Constraint
 
@@ -29,7 +30,10 @@ class SchedulingContext:
     The methods defined in this class ensures
     """
 
-    def __init__(self):
+    def __init__(self, z3_context: Optional[Context] = None):
+        # the z3 context all the variables are created in, None stands for
+        # the z3 default context
+        self.z3_context = z3_context
         # set and clear variables
         self.clear()
 
@@ -57,6 +61,20 @@ class SchedulingContext:
         # list of buffers
         self.buffers = []  # type: List[Buffer]
 
+        #
+        # Indices, kept in sync with the above lists
+        #
+        self._tasks_by_name = {}  # type: Dict[str, Task]
+        self._resources_by_name = {}  # type: Dict[str, Worker]
+        self._cumulative_workers_by_name = {}  # type: Dict[str, CumulativeWorker]
+        self._buffers_by_name = {}  # type: Dict[str, Buffer]
+        self._tasks_by_type = {}  # type: Dict[type, List[Task]]
+        self._constraints_by_type = {}  # type: Dict[type, List[Constraint]]
+        self._constraints_set = set()  # type: Set[Constraint]
+        # built on demand, since the tasks of a constraint are set
+        # after the constraint is added to the context
+        self._constraints_by_task = None  # type: Optional[Dict[Task, List[Constraint]]]
+
     def add_indicator(self, indicator: "Indicator") -> bool:
         """Add an indicatr to the problem"""
         if indicator not in self.indicators:
@@ -68,18 +86,27 @@ class SchedulingContext:
 
     def add_task(self, task: "Task") -> int:
         """Add a single task to the problem. There must not be two tasks with the same name"""
-        if task.name in [t.name for t in self.tasks]:
+        if task.name in self._tasks_by_name:
             raise ValueError(f"a task with the name {task.name} already exists.")
         self.tasks.append(task)
+        self._tasks_by_name[task.name] = task
+        self._tasks_by_type.setdefault(type(task), []).append(task)
         return len(self.tasks)
 
+    def remove_task(self, task: "Task") -> None:
+        """Remove a task from the problem"""
+        self.tasks.remove(task)
+        del self._tasks_by_name[task.name]
+        self._tasks_by_type[type(task)].remove(task)
+
     def add_resource(self, resource: "Worker") -> None:
         """Add a single resource to the problem"""
-        if resource.name in [t.name for t in self.resources]:
+        if resource.name in self._resources_by_name:
             raise ValueError(
                 f"a resource with the name {resource.name} already exists."
             )
         self.resources.append(resource)
+        self._resources_by_name[resource.name] = resource
 
     def add_resource_select_workers(self, resource: "SelectWorker") -> None:
         """Add a single resource to the problem"""
@@ -87,11 +114,12 @@ class SchedulingContext:
 
     def add_resource_cumulative_worker(self, resource: "SelectWorker") -> None:
         """Add a single resource to the problem"""
-        if resource.name in [t.name for t in self.select_workers]:
+        if resource.name in self._cumulative_workers_by_name:
             raise ValueError(
                 f"a resource with the name {resource.name} already exists."
             )
         self.cumulative_workers.append(resource)
+        self._cumulative_workers_by_name[resource.name] = resource
 
     def append_z3_assertion(self, z3_asst):
         self.z3_assertions.append(z3_asst)
@@ -100,8 +128,13 @@ class SchedulingContext:
         """Add a constraint to the problem. A constraint can be either
         a z3 assertion or a processscheduler Constraint instance."""
         if isinstance(constraint, Constraint):
-            if constraint not in self.constraints:
+            if constraint not in self._constraints_set:
                 self.constraints.append(constraint)
+                self._constraints_set.add(constraint)
+                self._constraints_by_type.setdefault(type(constraint), []).append(
+                    constraint
+                )
+                self._constraints_by_task = None
             else:
                 raise AssertionError("constraint already added to the problem.")
         elif isinstance(constraint, BoolRef):
@@ -111,24 +144,139 @@ class SchedulingContext:
                 "You must provide either a _Constraint or BoolRef instance."
             )
 
+    def remove_constraint(self, constraint: Constraint) -> None:
+        """Remove a constraint from the problem"""
+        self.constraints.remove(constraint)
+        self._constraints_set.remove(constraint)
+        self._constraints_by_type[type(constraint)].remove(constraint)
+        self._constraints_by_task = None
+
+    def has_constraint(self, constraint: Constraint) -> bool:
+        """Return True if the constraint is part of the problem"""
+        return constraint in self._constraints_set
+
     def add_objective(self, objective: "Objective") -> None:
         """Add an optimization objective"""
         self.objectives.append(objective)
 
     def add_buffer(self, buffer: "Buffer") -> None:
         """Add a single task to the problem. There must not be two tasks with the same name"""
-        if buffer.name in [b.name for b in self.buffers]:
+        if buffer.name in self._buffers_by_name:
             raise ValueError(f"a buffer with the name {buffer.name} already exists.")
         self.buffers.append(buffer)
+        self._buffers_by_name[buffer.name] = buffer
+
+    #
+    # Lookups
+    #
+    def get_task_by_name(self, name: str) -> Optional["Task"]:
+        """Return the task with the given name, None if there is no such task"""
+        return self._tasks_by_name.get(name)
+
+    def get_resource_by_name(
+        self, name: str
+    ) -> Optional[Union["Worker", "CumulativeWorker"]]:
+        """Return the worker or cumulative worker with the given name, None if
+        there is no such resource"""
+        if name in self._cumulative_workers_by_name:
+            return self._cumulative_workers_by_name[name]
+        return self._resources_by_name.get(name)
+
+    def get_buffer_by_name(self, name: str) -> Optional["Buffer"]:
+        """Return the buffer with the given name, None if there is no such buffer"""
+        return self._buffers_by_name.get(name)
+
+    def get_tasks_by_type(self, task_type: type) -> List["Task"]:
+        """Return the tasks that are instances of task_type, in the order they
+        were added"""
+        tasks = []
+        for a_type, tasks_of_type in self._tasks_by_type.items():
+            if issubclass(a_type, task_type):
+                tasks.extend(tasks_of_type)
+        return sorted(tasks, key=lambda task: task.task_number)
+
+    def get_constraints_by_type(self, constraint_type: type) -> List[Constraint]:
+        """Return the constraints that are instances of constraint_type"""
+        constraints = []
+        for a_type, constraints_of_type in self._constraints_by_type.items():
+            if issubclass(a_type, constraint_type):
+                constraints.extend(constraints_of_type)
+        return constraints
+
+    def get_tasks_of_resource(self, resource: "Resource") -> List["Task"]:
+        """Return the tasks that may be processed by a worker, by any worker
+        of a cumulative worker or of a SelectWorkers instance"""
+        if hasattr(resource, "cumulative_workers"):  # CumulativeWorker
+            workers = resource.get_workers()
+        elif hasattr(resource, "list_of_workers"):  # SelectWorkers
+            workers = resource.list_of_workers
+        else:
+            workers = [resource]
+        # each worker maps the tasks it may process to its busy intervals
+        tasks = {}
+        for worker in workers:
+            tasks.update(dict.fromkeys(worker.busy_intervals))
+        return list(tasks)
 
+    def get_constraints_of_task(self, task: "Task") -> List[Constraint]:
+        """Return the constraints that apply to a task"""
+        if self._constraints_by_task is None:
+            self._constraints_by_task = {}
+            for constraint in self.constraints:
+                for constrained_task in _get_constraint_tasks(constraint):
+                    self._constraints_by_task.setdefault(constrained_task, []).append(
+                        constraint
+                    )
+        return self._constraints_by_task.get(task, [])
 
-# Define a global context
-# None by default
-# the scheduling problem will set this variable
-main_context = None
+
+def _get_constraint_tasks(constraint: Constraint) -> List["Task"]:
+    """Return the tasks a constraint refers to, either as attributes or in
+    lists of tasks"""
+    from processscheduler.task import Task
+
+    tasks = []
+    for value in vars(constraint).values():
+        if isinstance(value, Task):
+            tasks.append(value)
+        elif isinstance(value, list):
+            tasks.extend(item for item in value if isinstance(item, Task))
+    return list(dict.fromkeys(tasks))
+
+
+# The current context. It is a context variable so that problems built
+# concurrently in different threads or asyncio tasks do not interfere.
+# None by default, the scheduling problem sets this variable
+_main_context = contextvars.ContextVar(
+    "main_context", default=None
+)  # type: contextvars.ContextVar[Optional[SchedulingContext]]
+
+
+def get_main_context() -> Optional[SchedulingContext]:
+    """Return the current context"""
+    return _main_context.get()
+
+
+def set_main_context(context: Optional[SchedulingContext]) -> contextvars.Token:
+    """Set the current context, return a token to restore the previous one"""
+    return _main_context.set(context)
+
+
+def reset_main_context(token: contextvars.Token) -> None:
+    """Restore the context that was current before set_main_context"""
+    _main_context.reset(token)
 
 
 def clear_main_context() -> None:
     """Clear current context"""
+    main_context = _main_context.get()
     if main_context is not None:
         main_context.clear()
+
+
+def __getattr__(name: str):
+    """Read the current context as the module main_context attribute, for
+    backward compatibility. Use set_main_context to change it"""
+    if name == "main_context":
+        return _main_context.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
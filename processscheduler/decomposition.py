@@ -0,0 +1,111 @@
+"""Split a model into independent sub-models."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Dict, List, Set, Tuple
+
+from z3 import BoolRef, ExprRef, Z3_OP_UNINTERPRETED, is_const
+
+
+def get_constant_names(expression: ExprRef) -> Set[str]:
+    """Return the names of all the uninterpreted constants of an expression.
+    Shared sub-expressions are visited once."""
+    names = set()
+    visited = set()
+    to_visit = [expression]
+    while to_visit:
+        expr = to_visit.pop()
+        expr_id = expr.get_id()
+        if expr_id in visited:
+            continue
+        visited.add(expr_id)
+        if is_const(expr):
+            if expr.decl().kind() == Z3_OP_UNINTERPRETED:
+                names.add(expr.decl().name())
+        else:
+            to_visit.extend(expr.children())
+    return names
+
+
+class _UnionFind:
+    """Disjoint sets of strings, with path halving and union by size"""
+
+    def __init__(self):
+        self.parent = {}  # type: Dict[str, str]
+        self.size = {}  # type: Dict[str, int]
+
+    def find(self, item: str) -> str:
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+            return item
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, item_1: str, item_2: str) -> None:
+        root_1 = self.find(item_1)
+        root_2 = self.find(item_2)
+        if root_1 == root_2:
+            return
+        if self.size[root_1] < self.size[root_2]:
+            root_1, root_2 = root_2, root_1
+        self.parent[root_2] = root_1
+        self.size[root_1] += self.size[root_2]
+
+
+def get_connected_components(
+    assertions: List[BoolRef], shared_names: List[str]
+) -> List[Tuple[List[BoolRef], Set[str]]]:
+    """Split a list of assertions into groups that share no variable.
+
+    Two assertions are in the same group if they have a variable in common,
+    or if they are linked by a chain of such assertions. Variables named in
+    shared_names (typically the horizon) do not link assertions, they are
+    copied to each group. Assertions that only contain shared variables, or
+    no variable at all, are added to each group.
+    Return a list of (assertions, variable names) tuples.
+    """
+    union_find = _UnionFind()
+    assertions_names = []
+    for assertion in assertions:
+        names = [
+            name for name in get_constant_names(assertion) if name not in shared_names
+        ]
+        for name in names:
+            union_find.find(name)
+        for name in names[1:]:
+            union_find.union(names[0], name)
+        assertions_names.append(names)
+
+    components = {}  # type: Dict[str, Tuple[List[BoolRef], Set[str]]]
+    global_assertions = []
+    for assertion, names in zip(assertions, assertions_names):
+        if not names:
+            global_assertions.append(assertion)
+            continue
+        root = union_find.find(names[0])
+        if root not in components:
+            components[root] = ([], set())
+        components[root][0].append(assertion)
+        components[root][1].update(names)
+
+    if not components:
+        return [(global_assertions, set())]
+    for component_assertions, _ in components.values():
+        component_assertions.extend(global_assertions)
+    return list(components.values())
@@ -0,0 +1,356 @@
+"""Greedy schedule generation, used to seed the solver."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import insort
+from typing import Dict, List, Optional, Tuple
+
+from processscheduler.resource import CumulativeWorker, Worker
+from processscheduler.resource_constraint import ResourceUnavailable
+from processscheduler.task import (
+    Task,
+    FixedDurationTask,
+    VariableDurationTask,
+    ZeroDurationTask,
+)
+from processscheduler.task_constraint import (
+    TaskPrecedence,
+    TaskStartAt,
+    TaskStartAfterStrict,
+    TaskStartAfterLax,
+    TaskEndAt,
+    TaskEndBeforeStrict,
+    TaskEndBeforeLax,
+)
+
+
+class _Timeline:
+    """The sorted busy intervals of a worker"""
+
+    def __init__(self):
+        self.intervals = []  # type: List[Tuple[int, int]]
+
+    def is_free(self, start: int, end: int) -> bool:
+        """True if [start, end) does not overlap any busy interval. A zero
+        duration interval only must not be strictly inside a busy one."""
+        for busy_start, busy_end in self.intervals:
+            if busy_start >= end:
+                break
+            if start < busy_end and busy_start < end:
+                return False
+        return True
+
+    def add(self, start: int, end: int) -> None:
+        insort(self.intervals, (start, end))
+
+    def next_ends(self, time: int) -> List[int]:
+        """The ends of busy intervals after time"""
+        return [end for _, end in self.intervals if end > time]
+
+
+class GreedyScheduler:
+    """Build a feasible schedule with a schedule generation scheme.
+
+    Tasks are scheduled one after the other according to a priority rule:
+    tasks with the highest priority first, then the ones with the
+    longest duration. Each task is scheduled at the earliest time its
+    predecessors, release dates and required workers allow.
+
+    * the serial scheme schedules the next task at the earliest possible
+      time, possibly before already scheduled tasks,
+    * the parallel scheme moves forward in time, and at each time starts as
+      many eligible tasks as possible.
+
+    Only a subset of problems is supported: mandatory tasks, workers,
+    cumulative workers and selected workers, precedences, start/end
+    constraints and resource unavailabilities. The schedule method returns
+    None for any other problem, or if no feasible schedule is found.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.context = problem.context
+        self.horizon = problem.horizon_defined_value
+        self.durations = {}  # type: Dict[Task, int]
+        self.predecessors = {}  # type: Dict[Task, List[Tuple[Task, int]]]
+        self.successors = {}  # type: Dict[Task, List[Tuple[Task, int]]]
+        self.releases = {}  # type: Dict[Task, int]
+        self.deadlines = {}  # type: Dict[Task, int]
+        self.fixed_starts = {}  # type: Dict[Task, int]
+        self.unavailabilities = {}  # type: Dict[Worker, List[Tuple[int, int]]]
+        self.is_supported = self._read_problem()
+
+    def _read_problem(self) -> bool:
+        """Collect the data of the problem, return False if unsupported"""
+        if self.context.buffers:
+            return False
+        for task in self.context.tasks:
+            if task.optional or task.work_amount > 0:
+                return False
+            if isinstance(task, FixedDurationTask):
+                self.durations[task] = task.duration_defined_value
+            elif isinstance(task, VariableDurationTask):
+                if task.allowed_durations:
+                    self.durations[task] = min(task.allowed_durations)
+                else:
+                    self.durations[task] = task.min_duration
+            elif isinstance(task, ZeroDurationTask):
+                self.durations[task] = 0
+            else:
+                return False
+            # dynamic workers are not supported
+            selected_workers = [
+                worker
+                for select_workers in task.select_workers
+                for worker in select_workers.list_of_workers
+            ]
+            for worker in task.required_resources:
+                if worker not in task.synced_resources + selected_workers:
+                    return False
+            self.predecessors[task] = []
+            self.successors[task] = []
+            self.releases[task] = 0
+
+        for constraint in self.context.constraints:
+            if constraint.optional or constraint.created_from_assertion:
+                return False
+            if isinstance(constraint, TaskPrecedence):
+                if constraint.kind == "tight" or not (
+                    isinstance(constraint.task_before, Task)
+                    and isinstance(constraint.task_after, Task)
+                ):
+                    return False
+                delay = constraint.offset + (1 if constraint.kind == "strict" else 0)
+                self.predecessors[constraint.task_after].append(
+                    (constraint.task_before, delay)
+                )
+                self.successors[constraint.task_before].append(
+                    (constraint.task_after, delay)
+                )
+            elif isinstance(constraint, (TaskStartAt, TaskEndAt)):
+                if isinstance(constraint, TaskStartAt):
+                    start = constraint.value
+                else:
+                    start = constraint.value - self.durations[constraint.task]
+                if self.fixed_starts.get(constraint.task, start) != start:
+                    return False
+                self.fixed_starts[constraint.task] = start
+            elif isinstance(constraint, TaskStartAfterLax):
+                self._add_release(constraint.task, constraint.value)
+            elif isinstance(constraint, TaskStartAfterStrict):
+                self._add_release(constraint.task, constraint.value + 1)
+            elif isinstance(constraint, TaskEndBeforeLax):
+                self._add_deadline(constraint.task, constraint.value)
+            elif isinstance(constraint, TaskEndBeforeStrict):
+                self._add_deadline(constraint.task, constraint.value - 1)
+            elif isinstance(constraint, ResourceUnavailable):
+                if isinstance(constraint.resource, CumulativeWorker):
+                    workers = constraint.resource.get_workers()
+                else:
+                    workers = [constraint.resource]
+                for worker in workers:
+                    self.unavailabilities.setdefault(worker, []).extend(
+                        constraint.list_of_time_intervals
+                    )
+            else:
+                return False
+
+        # the only supported assertion is the horizon bound
+        for assertion in self.context.z3_assertions:
+            if self.horizon is None or not assertion.eq(
+                self.problem.horizon <= self.horizon
+            ):
+                return False
+        return True
+
+    def _add_release(self, task: Task, value: int) -> None:
+        self.releases[task] = max(self.releases[task], value)
+
+    def _add_deadline(self, task: Task, value: int) -> None:
+        self.deadlines[task] = min(self.deadlines.get(task, value), value)
+
+    def _priority_key(self, task: Task):
+        return (-task.priority, -self.durations[task], task.task_number)
+
+    def _find_workers(
+        self, task: Task, start: int, timelines: Dict[Worker, _Timeline]
+    ) -> Optional[List[Worker]]:
+        """Return the workers to assign if the task can start at start,
+        None otherwise"""
+        end = start + self.durations[task]
+        assigned = []
+        for worker in task.synced_resources:
+            if not timelines[worker].is_free(start, end):
+                return None
+            assigned.append(worker)
+        for select_workers in task.select_workers:
+            if select_workers.kind == "max":
+                nb_workers_to_select = 1
+            else:
+                nb_workers_to_select = select_workers.nb_workers_to_select
+            # as in the solver, a worker already assigned to the task, e.g. a
+            # required one, is selected as well
+            nb_already_selected = len(
+                [
+                    worker
+                    for worker in select_workers.list_of_workers
+                    if worker in assigned
+                ]
+            )
+            if (
+                select_workers.kind != "min"
+                and nb_already_selected > select_workers.nb_workers_to_select
+            ):
+                return None
+            nb_workers_to_select = max(nb_workers_to_select - nb_already_selected, 0)
+            selected = [
+                worker
+                for worker in select_workers.list_of_workers
+                if worker not in assigned and timelines[worker].is_free(start, end)
+            ][:nb_workers_to_select]
+            if len(selected) < nb_workers_to_select:
+                return None
+            assigned.extend(selected)
+        return assigned
+
+    def _candidate_times(
+        self, task: Task, time: int, timelines: Dict[Worker, _Timeline]
+    ) -> List[int]:
+        """The times after time a busy worker of the task may become free"""
+        workers = list(task.synced_resources)
+        for select_workers in task.select_workers:
+            workers.extend(select_workers.list_of_workers)
+        times = set()
+        for worker in workers:
+            times.update(timelines[worker].next_ends(time))
+        return sorted(times)
+
+    def _earliest_start(self, task: Task, schedule: Dict) -> int:
+        earliest_start = self.releases[task]
+        for predecessor, delay in self.predecessors[task]:
+            predecessor_end = schedule[predecessor][0] + self.durations[predecessor]
+            earliest_start = max(earliest_start, predecessor_end + delay)
+        return earliest_start
+
+    def _init_timelines(self) -> Dict[Worker, _Timeline]:
+        timelines = {}
+        for worker in self.context.resources:
+            timelines[worker] = _Timeline()
+            for lower_bound, upper_bound in self.unavailabilities.get(worker, []):
+                timelines[worker].add(lower_bound, upper_bound)
+        return timelines
+
+    def schedule(
+        self, scheme: Optional[str] = "serial"
+    ) -> Optional[Dict[Task, Tuple[int, List[Worker]]]]:
+        """Return a dict that maps each task to its start and the list of
+        assigned workers, or None if no schedule is found."""
+        if scheme not in ["serial", "parallel"]:
+            raise ValueError("scheme must be either 'serial' or 'parallel'")
+        if not self.is_supported:
+            return None
+
+        timelines = self._init_timelines()
+        schedule = {}  # type: Dict[Task, Tuple[int, List[Worker]]]
+
+        # tasks with a fixed start are scheduled first
+        for task, start in self.fixed_starts.items():
+            workers = self._find_workers(task, start, timelines)
+            if workers is None:
+                return None
+            self._assign(task, start, workers, schedule, timelines)
+
+        nb_unscheduled_predecessors = {
+            task: len(self.predecessors[task]) for task in self.context.tasks
+        }
+        eligible = [
+            task
+            for task in self.context.tasks
+            if task not in schedule and nb_unscheduled_predecessors[task] == 0
+        ]
+
+        def release_successors(task):
+            for successor, _ in self.successors[task]:
+                nb_unscheduled_predecessors[successor] -= 1
+                if (
+                    nb_unscheduled_predecessors[successor] == 0
+                    and successor not in schedule
+                ):
+                    eligible.append(successor)
+
+        for task in list(schedule):
+            release_successors(task)
+
+        if scheme == "serial":
+            while eligible:
+                task = min(eligible, key=self._priority_key)
+                eligible.remove(task)
+                start = self._earliest_start(task, schedule)
+                workers = self._find_workers(task, start, timelines)
+                if workers is None:
+                    for start in self._candidate_times(task, start, timelines):
+                        workers = self._find_workers(task, start, timelines)
+                        if workers is not None:
+                            break
+                if workers is None:
+                    return None
+                self._assign(task, start, workers, schedule, timelines)
+                release_successors(task)
+        else:
+            time = 0
+            while eligible:
+                eligible.sort(key=self._priority_key)
+                next_times = []
+                for task in list(eligible):
+                    earliest_start = self._earliest_start(task, schedule)
+                    if earliest_start > time:
+                        next_times.append(earliest_start)
+                        continue
+                    workers = self._find_workers(task, time, timelines)
+                    if workers is None:
+                        next_times.extend(
+                            self._candidate_times(task, time, timelines)[:1]
+                        )
+                        continue
+                    eligible.remove(task)
+                    self._assign(task, time, workers, schedule, timelines)
+                    release_successors(task)
+                    # a zero duration task may release successors at time
+                    next_times.append(time + self.durations[task])
+                if eligible:
+                    if not next_times:
+                        return None
+                    time = min(next_times)
+
+        if len(schedule) < len(self.context.tasks):  # precedence cycle
+            return None
+        # check deadlines and horizon
+        for task, (start, _) in schedule.items():
+            end = start + self.durations[task]
+            if task in self.deadlines and end > self.deadlines[task]:
+                return None
+            if self.horizon is not None and end > self.horizon:
+                return None
+            for predecessor, delay in self.predecessors[task]:
+                predecessor_end = schedule[predecessor][0] + self.durations[predecessor]
+                if predecessor_end + delay > start:
+                    return None
+        return schedule
+
+    def _assign(self, task, start, workers, schedule, timelines) -> None:
+        schedule[task] = (start, workers)
+        for worker in workers:
+            timelines[worker].add(start, start + self.durations[task])
@@ -0,0 +1,595 @@
+"""Intermediate representation of a scheduling problem, as plain python data
+that can be compared, copied and serialized."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from processscheduler.buffer import NonConcurrentBuffer
+from processscheduler.cost import ConstantCostPerPeriod
+from processscheduler.problem import SchedulingProblem
+from processscheduler.resource import CumulativeWorker, SelectWorkers, Worker
+from processscheduler.task import (
+    FixedDurationTask,
+    VariableDurationTask,
+    ZeroDurationTask,
+)
+import processscheduler.resource_constraint as resource_constraint
+import processscheduler.task_constraint as task_constraint
+
+# the constraints the IR supports, and the attributes that store
+# their arguments. Attribute names are the same as the constructor parameters
+_CONSTRAINT_ARGUMENTS = {
+    "TaskPrecedence": ("task_before", "task_after", "offset", "kind"),
+    "TasksStartSynced": ("task_1", "task_2"),
+    "TasksEndSynced": ("task_1", "task_2"),
+    "TasksDontOverlap": ("task_1", "task_2"),
+    "TasksContiguous": ("list_of_tasks", "sort_method"),
+    "TaskStartAt": ("task", "value"),
+    "TaskStartAfterStrict": ("task", "value"),
+    "TaskStartAfterLax": ("task", "value"),
+    "TaskEndAt": ("task", "value"),
+    "TaskEndBeforeStrict": ("task", "value"),
+    "TaskEndBeforeLax": ("task", "value"),
+    "OptionalTasksDependency": ("task_1", "task_2"),
+    "ForceScheduleNOptionalTasks": (
+        "list_of_optional_tasks",
+        "nb_tasks_to_schedule",
+        "kind",
+    ),
+    "TaskLoadBuffer": ("task", "buffer", "quantity"),
+    "TaskUnloadBuffer": ("task", "buffer", "quantity"),
+    "ResourceUnavailable": ("resource", "list_of_time_intervals"),
+    "WorkLoad": ("resource", "dict_time_intervals_and_bound", "kind"),
+    "ResourceTasksDistance": (
+        "resource",
+        "distance",
+        "list_of_time_intervals",
+        "mode",
+        "sort_method",
+    ),
+}
+# arguments that refer to tasks, resources or buffers, stored by name
+_TASK_ARGUMENTS = {"task", "task_1", "task_2", "task_before", "task_after"}
+_TASK_LIST_ARGUMENTS = {"list_of_tasks", "list_of_optional_tasks"}
+
+# the builtin objectives, from the name of the variable they optimize
+_OBJECTIVE_KINDS = {
+    "horizon": "makespan",
+    "Indicator_FlowTime": "flowtime",
+    "Indicator_PriorityTotal": "priorities",
+    "Indicator_SmallestStartTime": "start_latest",
+    "Indicator_GreatestStartTime": "start_earliest",
+}
+
+
+class _IRItem:
+    """Base class for IR items: equality, repr and pickling from slots"""
+
+    __slots__ = ()
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __repr__(self) -> str:
+        arguments = ", ".join(
+            f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__
+        )
+        return f"{type(self).__name__}({arguments})"
+
+    def __getstate__(self):
+        return self._values()
+
+    def __setstate__(self, state) -> None:
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+class TaskIR(_IRItem):
+    """A task. kind is the name of the task class. Each required resource
+    is a tuple: ("Worker", name, dynamic), ("CumulativeWorker", name),
+    ("SelectWorkers", list_of_worker_names, nb_workers_to_select, kind) or
+    ("CumulativeWorker", name, nb_workers_to_select, kind) to select among
+    the workers of a cumulative worker."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "duration",
+        "min_duration",
+        "max_duration",
+        "allowed_durations",
+        "work_amount",
+        "priority",
+        "optional",
+        "required_resources",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        duration: Optional[int] = None,
+        min_duration: Optional[int] = 0,
+        max_duration: Optional[int] = None,
+        allowed_durations: Optional[List[int]] = None,
+        work_amount: Optional[int] = 0,
+        priority: Optional[int] = 1,
+        optional: Optional[bool] = False,
+        required_resources: Optional[List[Tuple]] = None,
+    ) -> None:
+        if kind not in [
+            "FixedDurationTask",
+            "VariableDurationTask",
+            "ZeroDurationTask",
+        ]:
+            raise ValueError(f"task kind {kind} is not supported")
+        self.name = name
+        self.kind = kind
+        self.duration = duration
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.allowed_durations = allowed_durations
+        self.work_amount = work_amount
+        self.priority = priority
+        self.optional = optional
+        self.required_resources = (
+            [] if required_resources is None else required_resources
+        )
+
+
+class ResourceIR(_IRItem):
+    """A Worker or a CumulativeWorker, depending on kind. cost is the
+    constant cost per period, or None. encoding is the encoding of a
+    CumulativeWorker."""
+
+    __slots__ = ("name", "kind", "productivity", "cost", "size", "encoding")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        productivity: Optional[int] = 1,
+        cost: Optional[int] = None,
+        size: Optional[int] = None,
+        encoding: Optional[str] = None,
+    ) -> None:
+        if kind not in ["Worker", "CumulativeWorker"]:
+            raise ValueError(f"resource kind {kind} is not supported")
+        self.name = name
+        self.kind = kind
+        self.productivity = productivity
+        self.cost = cost
+        self.size = size
+        self.encoding = encoding
+
+
+class BufferIR(_IRItem):
+    """A NonConcurrentBuffer"""
+
+    __slots__ = ("name", "initial_state", "final_state", "lower_bound", "upper_bound")
+
+    def __init__(
+        self,
+        name: str,
+        initial_state: Optional[int] = None,
+        final_state: Optional[int] = None,
+        lower_bound: Optional[int] = None,
+        upper_bound: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.initial_state = initial_state
+        self.final_state = final_state
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+
+class ConstraintIR(_IRItem):
+    """A constraint. kind is the name of the constraint class, arguments
+    the constructor arguments where tasks, resources and buffers are
+    replaced by their names."""
+
+    __slots__ = ("kind", "arguments", "optional")
+
+    def __init__(
+        self, kind: str, arguments: Dict[str, Any], optional: Optional[bool] = False
+    ) -> None:
+        if kind not in _CONSTRAINT_ARGUMENTS:
+            raise ValueError(f"constraint kind {kind} is not supported")
+        self.kind = kind
+        self.arguments = arguments
+        self.optional = optional
+
+
+class ObjectiveIR(_IRItem):
+    """A builtin objective: makespan, flowtime, priorities, start_latest
+    or start_earliest"""
+
+    __slots__ = ("kind", "weight")
+
+    def __init__(self, kind: str, weight: Optional[int] = 1) -> None:
+        if kind not in _OBJECTIVE_KINDS.values():
+            raise ValueError(f"objective kind {kind} is not supported")
+        self.kind = kind
+        self.weight = weight
+
+
+class ProblemIR(_IRItem):
+    """The intermediate representation of a scheduling problem.
+
+    The IR is made of plain python data: it is cheap to build, to copy, to
+    compare and it can be pickled, for example to be sent to a process pool.
+    No z3 object is created until the compile method is called, which the
+    SchedulingSolver does when it is given a ProblemIR. Compiling calls the
+    usual constructors, it takes as long as declaring the problem directly.
+
+    The IR can be declared from scratch with the add_* methods, or built
+    from an existing problem with from_problem. Constraints are compiled
+    after all the tasks and their required resources."""
+
+    __slots__ = (
+        "name",
+        "horizon",
+        "delta_time",
+        "start_time",
+        "end_time",
+        "tasks",
+        "resources",
+        "buffers",
+        "constraints",
+        "objectives",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        horizon: Optional[int] = None,
+        delta_time: Optional[timedelta] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> None:
+        self.name = name
+        self.horizon = horizon
+        self.delta_time = delta_time
+        self.start_time = start_time
+        self.end_time = end_time
+        self.tasks = []  # type: List[TaskIR]
+        self.resources = []  # type: List[ResourceIR]
+        self.buffers = []  # type: List[BufferIR]
+        self.constraints = []  # type: List[ConstraintIR]
+        self.objectives = []  # type: List[ObjectiveIR]
+
+    def add_task(self, name: str, kind: str, **kwargs) -> TaskIR:
+        """Declare a task, kwargs are the ones of TaskIR"""
+        task = TaskIR(name, kind, **kwargs)
+        self.tasks.append(task)
+        return task
+
+    def add_resource(self, name: str, kind: str = "Worker", **kwargs) -> ResourceIR:
+        """Declare a worker or a cumulative worker"""
+        resource = ResourceIR(name, kind, **kwargs)
+        self.resources.append(resource)
+        return resource
+
+    def add_buffer(self, name: str, **kwargs) -> BufferIR:
+        """Declare a buffer"""
+        buffer = BufferIR(name, **kwargs)
+        self.buffers.append(buffer)
+        return buffer
+
+    def add_constraint(
+        self, kind: str, arguments: Dict[str, Any], optional: Optional[bool] = False
+    ) -> ConstraintIR:
+        """Declare a constraint, tasks, resources and buffers are passed by name"""
+        constraint = ConstraintIR(kind, arguments, optional)
+        self.constraints.append(constraint)
+        return constraint
+
+    def add_objective(self, kind: str, weight: Optional[int] = 1) -> ObjectiveIR:
+        """Declare a builtin objective"""
+        objective = ObjectiveIR(kind, weight)
+        self.objectives.append(objective)
+        return objective
+
+    @classmethod
+    def from_problem(cls, problem: SchedulingProblem) -> "ProblemIR":
+        """Build the IR of an existing problem. Raise a ValueError if the
+        problem uses a feature the IR does not support, for example z3
+        assertions, first order logic constraints, custom indicators,
+        polynomial costs or workers of a cumulative worker used apart from
+        it."""
+        context = problem.context
+        problem_ir = cls(
+            problem.name,
+            problem.horizon_defined_value,
+            problem.delta_time,
+            problem.start_time,
+            problem.end_time,
+        )
+        # the only supported assertion is the horizon bound
+        for assertion in context.z3_assertions:
+            if problem.horizon_defined_value is None or not assertion.eq(
+                problem.horizon <= problem.horizon_defined_value
+            ):
+                raise ValueError(f"z3 assertion {assertion} is not supported")
+
+        for resource in context.resources:
+            # workers of cumulative workers are created along with them
+            if "_CumulativeWorker_" in resource.name:
+                continue
+            problem_ir.add_resource(
+                resource.name,
+                "Worker",
+                productivity=resource.productivity,
+                cost=_get_cost_value(resource.cost),
+            )
+        for resource in context.cumulative_workers:
+            problem_ir.add_resource(
+                resource.name,
+                "CumulativeWorker",
+                productivity=resource.productivity,
+                cost=_get_cost_value(resource.cost_defined_value),
+                size=resource.size,
+                encoding=resource.encoding,
+            )
+        for buffer in context.buffers:
+            problem_ir.add_buffer(
+                buffer.name,
+                initial_state=buffer.initial_state,
+                final_state=buffer.final_state,
+                lower_bound=buffer.lower_bound,
+                upper_bound=buffer.upper_bound,
+            )
+
+        for task in context.tasks:
+            task_ir = problem_ir.add_task(
+                task.name,
+                type(task).__name__,
+                optional=task.optional,
+                required_resources=_get_required_resources(task, context),
+            )
+            if isinstance(task, FixedDurationTask):
+                task_ir.duration = task.duration_defined_value
+            if isinstance(task, VariableDurationTask):
+                task_ir.min_duration = task.min_duration
+                task_ir.max_duration = task.max_duration
+                task_ir.allowed_durations = task.allowed_durations
+            if isinstance(task, (FixedDurationTask, VariableDurationTask)):
+                task_ir.work_amount = task.work_amount
+                task_ir.priority = task.priority
+
+        for constraint in context.constraints:
+            kind = type(constraint).__name__
+            if kind not in _CONSTRAINT_ARGUMENTS or constraint.created_from_assertion:
+                raise ValueError(f"constraint {constraint.name} is not supported")
+            arguments = {}
+            for argument in _CONSTRAINT_ARGUMENTS[kind]:
+                value = getattr(constraint, argument)
+                if argument in _TASK_LIST_ARGUMENTS:
+                    value = [task.name for task in value]
+                elif argument in _TASK_ARGUMENTS or argument in ["resource", "buffer"]:
+                    if argument == "resource" and _is_cumulative_worker_worker(
+                        value, context
+                    ):
+                        raise ValueError(
+                            f"constraint {constraint.name} is not supported"
+                        )
+                    value = value.name
+                arguments[argument] = value
+            problem_ir.add_constraint(kind, arguments, constraint.optional)
+
+        for indicator in context.indicators:
+            if f"{indicator.indicator_variable}" not in _OBJECTIVE_KINDS:
+                raise ValueError(f"indicator {indicator.name} is not supported")
+        for objective in context.objectives:
+            target_name = f"{objective.target}"
+            if target_name not in _OBJECTIVE_KINDS:
+                raise ValueError(f"objective {objective.name} is not supported")
+            problem_ir.add_objective(_OBJECTIVE_KINDS[target_name], objective.weight)
+
+        return problem_ir
+
+    def compile(self, private_z3_context: Optional[bool] = False) -> SchedulingProblem:
+        """Create the SchedulingProblem, by calling the constructors of its
+        tasks, resources, buffers, constraints and objectives"""
+        problem = SchedulingProblem(
+            self.name,
+            self.horizon,
+            self.delta_time,
+            self.start_time,
+            self.end_time,
+            private_z3_context=private_z3_context,
+        )
+        with problem:
+            resources = {}
+            for resource in self.resources:
+                cost = (
+                    None
+                    if resource.cost is None
+                    else ConstantCostPerPeriod(resource.cost)
+                )
+                if resource.kind == "Worker":
+                    resources[resource.name] = Worker(
+                        resource.name, resource.productivity, cost
+                    )
+                else:
+                    resources[resource.name] = CumulativeWorker(
+                        resource.name,
+                        resource.size,
+                        resource.productivity,
+                        cost,
+                        resource.encoding or "workers",
+                    )
+            buffers = {
+                buffer.name: NonConcurrentBuffer(
+                    buffer.name,
+                    initial_state=buffer.initial_state,
+                    final_state=buffer.final_state,
+                    lower_bound=buffer.lower_bound,
+                    upper_bound=buffer.upper_bound,
+                )
+                for buffer in self.buffers
+            }
+
+            tasks = {}
+            for task_ir in self.tasks:
+                if task_ir.kind == "FixedDurationTask":
+                    task = FixedDurationTask(
+                        task_ir.name,
+                        task_ir.duration,
+                        task_ir.work_amount,
+                        task_ir.priority,
+                        task_ir.optional,
+                    )
+                elif task_ir.kind == "VariableDurationTask":
+                    task = VariableDurationTask(
+                        task_ir.name,
+                        task_ir.min_duration,
+                        task_ir.max_duration,
+                        task_ir.allowed_durations,
+                        task_ir.work_amount,
+                        task_ir.priority,
+                        task_ir.optional,
+                    )
+                else:
+                    task = ZeroDurationTask(task_ir.name, task_ir.optional)
+                for required_resource in task_ir.required_resources:
+                    if required_resource[0] == "SelectWorkers":
+                        _, worker_names, nb_workers_to_select, kind = required_resource
+                        task.add_required_resource(
+                            SelectWorkers(
+                                [resources[name] for name in worker_names],
+                                nb_workers_to_select,
+                                kind,
+                            )
+                        )
+                    elif required_resource[0] == "CumulativeWorker":
+                        if len(required_resource) == 2:
+                            task.add_required_resource(resources[required_resource[1]])
+                            continue
+                        _, name, nb_workers_to_select, kind = required_resource
+                        task.add_required_resource(
+                            SelectWorkers(
+                                resources[name].cumulative_workers,
+                                nb_workers_to_select,
+                                kind,
+                            )
+                        )
+                    else:
+                        _, name, dynamic = required_resource
+                        task.add_required_resource(resources[name], dynamic)
+                tasks[task_ir.name] = task
+
+            for constraint in self.constraints:
+                arguments = {}
+                for argument, value in constraint.arguments.items():
+                    if argument in _TASK_LIST_ARGUMENTS:
+                        value = [tasks[name] for name in value]
+                    elif argument in _TASK_ARGUMENTS:
+                        value = tasks[value]
+                    elif argument == "resource":
+                        value = resources[value]
+                    elif argument == "buffer":
+                        value = buffers[value]
+                    arguments[argument] = value
+                if hasattr(task_constraint, constraint.kind):
+                    constraint_class = getattr(task_constraint, constraint.kind)
+                else:
+                    constraint_class = getattr(resource_constraint, constraint.kind)
+                constraint_class(**arguments, optional=constraint.optional)
+
+            for objective in self.objectives:
+                add_objective = getattr(problem, f"add_objective_{objective.kind}")
+                add_objective(weight=objective.weight)
+
+        return problem
+
+
+def _get_cost_value(cost) -> Optional[int]:
+    """The value of a constant cost per period, None if no cost"""
+    if cost is None:
+        return None
+    if not isinstance(cost, ConstantCostPerPeriod):
+        raise ValueError("only constant costs per period are supported")
+    return cost.value
+
+
+def _is_cumulative_worker_worker(resource, context) -> bool:
+    """True if resource is one of the workers a cumulative worker creates"""
+    return any(
+        resource in cumulative_worker.cumulative_workers
+        for cumulative_worker in context.cumulative_workers
+    )
+
+
+def _get_required_resources(task, context) -> List[Tuple]:
+    """The required resources of a task, in the order they were added"""
+    select_workers = {
+        select_workers.name: select_workers for select_workers in task.select_workers
+    }
+    required_resources = []
+    for name in task.required_resources_names:
+        if name in select_workers:
+            resource = select_workers[name]
+            # the workers of a cumulative worker are not part of the IR, they
+            # are created along with it
+            cumulative_worker = next(
+                (
+                    cumulative_worker
+                    for cumulative_worker in context.cumulative_workers
+                    if cumulative_worker.cumulative_workers
+                    and resource.list_of_workers == cumulative_worker.cumulative_workers
+                ),
+                None,
+            )
+            if cumulative_worker is not None:
+                required_resources.append(
+                    (
+                        "CumulativeWorker",
+                        cumulative_worker.name,
+                        resource.nb_workers_to_select,
+                        resource.kind,
+                    )
+                )
+                continue
+            if any(
+                _is_cumulative_worker_worker(worker, context)
+                for worker in resource.list_of_workers
+            ):
+                raise ValueError(
+                    f"the required resources of task {task.name} are not supported"
+                )
+            required_resources.append(
+                (
+                    "SelectWorkers",
+                    [worker.name for worker in resource.list_of_workers],
+                    resource.nb_workers_to_select,
+                    resource.kind,
+                )
+            )
+            continue
+        resource = context.get_resource_by_name(name)
+        if isinstance(resource, CumulativeWorker):
+            required_resources.append(("CumulativeWorker", name))
+        else:
+            required_resources.append(
+                ("Worker", name, resource not in task.synced_resources)
+            )
+    return required_resources
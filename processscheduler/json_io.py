@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+from collections.abc import Mapping
 from datetime import time, timedelta, datetime
 import json
 
@@ -25,6 +26,9 @@ class SolutionJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, (datetime, time, timedelta)):
             return "%s" % obj
+        # the views of a columnar solution
+        if isinstance(obj, Mapping):
+            return dict(obj)
         return obj.__dict__
 
 
@@ -130,7 +134,12 @@ def export_json_to_string(scheduling_problem, scheduling_solver) -> str:
     # CumulativeWorker
     cumulative_workers = {}
     for cw in scheduling_problem.context.cumulative_workers:  # Worker
-        new_cw = {"size": cw.size, "productivity": cw.productivity, "cost": cw.cost}
+        new_cw = {
+            "size": cw.size,
+            "productivity": cw.productivity,
+            "cost": cw.cost,
+            "encoding": cw.encoding,
+        }
         cumulative_workers[cw.name] = new_cw
     resources["CumulativeWorkers"] = cumulative_workers
     d["Resources"] = resources
@@ -0,0 +1,233 @@
+"""Selection of the SMT logics from the assertions of a problem."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Dict, List, Optional, Tuple
+
+from z3 import (
+    Z3_BOOL_SORT,
+    Z3_INT_SORT,
+    Z3_REAL_SORT,
+    Z3_OP_ADD,
+    Z3_OP_DISTINCT,
+    Z3_OP_DIV,
+    Z3_OP_EQ,
+    Z3_OP_GE,
+    Z3_OP_GT,
+    Z3_OP_IDIV,
+    Z3_OP_IS_INT,
+    Z3_OP_ITE,
+    Z3_OP_LE,
+    Z3_OP_LT,
+    Z3_OP_MOD,
+    Z3_OP_MUL,
+    Z3_OP_POWER,
+    Z3_OP_REM,
+    Z3_OP_SUB,
+    Z3_OP_TO_INT,
+    Z3_OP_TO_REAL,
+    Z3_OP_UMINUS,
+    Z3_OP_UNINTERPRETED,
+    ExprRef,
+    is_algebraic_value,
+    is_app,
+    is_arith,
+    is_int_value,
+    is_quantifier,
+    is_rational_value,
+)
+
+# the features of each logics: integers, reals, difference constraints only
+_LOGICS_FEATURES = {
+    "QF_IDL": (True, False, True),
+    "QF_RDL": (False, True, True),
+    "QF_LIA": (True, False, False),
+    "QF_LRA": (False, True, False),
+    "QF_LIRA": (True, True, False),
+}
+_COMPARISONS = {Z3_OP_LE, Z3_OP_LT, Z3_OP_GE, Z3_OP_GT, Z3_OP_EQ, Z3_OP_DISTINCT}
+
+
+def _get_linear_form(expression: ExprRef) -> Optional[Tuple[Dict[int, int], int]]:
+    """Return the coefficients of the variables and the constant of a linear
+    expression, None if it is not a linear combination of variables"""
+    if is_int_value(expression):
+        return {}, expression.as_long()
+    if is_rational_value(expression):
+        return {}, expression.as_fraction()
+    if not is_app(expression):
+        return None
+    kind = expression.decl().kind()
+    if kind == Z3_OP_UNINTERPRETED and expression.num_args() == 0:
+        return {expression.get_id(): 1}, 0
+    if kind == Z3_OP_TO_REAL:
+        return _get_linear_form(expression.arg(0))
+    if kind in [Z3_OP_ADD, Z3_OP_SUB, Z3_OP_UMINUS]:
+        forms = [_get_linear_form(argument) for argument in expression.children()]
+        if None in forms:
+            return None
+        if kind == Z3_OP_UMINUS:
+            signs = [-1]
+        elif kind == Z3_OP_SUB:
+            signs = [1] + [-1] * (len(forms) - 1)
+        else:
+            signs = [1] * len(forms)
+        coefficients = {}
+        constant = 0
+        for sign, (form_coefficients, form_constant) in zip(signs, forms):
+            for variable, coefficient in form_coefficients.items():
+                coefficients[variable] = (
+                    coefficients.get(variable, 0) + sign * coefficient
+                )
+            constant += sign * form_constant
+        return coefficients, constant
+    if kind == Z3_OP_MUL:
+        factor = 1
+        variable_form = None
+        for argument in expression.children():
+            if is_int_value(argument):
+                factor *= argument.as_long()
+            elif is_rational_value(argument):
+                factor *= argument.as_fraction()
+            elif variable_form is None:
+                variable_form = _get_linear_form(argument)
+                if variable_form is None:
+                    return None
+            else:
+                return None
+        if variable_form is None:
+            return {}, factor
+        form_coefficients, form_constant = variable_form
+        return (
+            {
+                variable: factor * coefficient
+                for variable, coefficient in form_coefficients.items()
+            },
+            factor * form_constant,
+        )
+    return None
+
+
+def _is_difference(left: ExprRef, right: ExprRef) -> bool:
+    """True if left - right is x - y + c, x + c or c"""
+    left_form = _get_linear_form(left)
+    right_form = _get_linear_form(right)
+    if left_form is None or right_form is None:
+        return False
+    coefficients = dict(left_form[0])
+    for variable, coefficient in right_form[0].items():
+        coefficients[variable] = coefficients.get(variable, 0) - coefficient
+    coefficients = sorted(
+        coefficient for coefficient in coefficients.values() if coefficient != 0
+    )
+    return coefficients in ([], [-1], [1], [-1, 1])
+
+
+def _get_features(assertions: List[ExprRef]) -> Optional[Tuple[bool, bool, bool]]:
+    """Return whether the assertions use integers, reals and difference
+    constraints only, None if they do not belong to any quantifier free
+    linear arithmetic logics"""
+    has_int = False
+    has_real = False
+    is_difference = True
+    visited = set()
+    to_visit = list(assertions)
+    while to_visit:
+        expression = to_visit.pop()
+        expression_id = expression.get_id()
+        if expression_id in visited:
+            continue
+        visited.add(expression_id)
+        if is_quantifier(expression) or not is_app(expression):
+            return None
+        sort_kind = expression.sort().kind()
+        if sort_kind == Z3_INT_SORT:
+            has_int = True
+        elif sort_kind == Z3_REAL_SORT:
+            has_real = True
+        elif sort_kind != Z3_BOOL_SORT:
+            return None
+        if is_algebraic_value(expression):
+            return None
+        kind = expression.decl().kind()
+        if kind == Z3_OP_UNINTERPRETED and expression.num_args() > 0:
+            return None
+        if kind == Z3_OP_POWER:
+            return None
+        if kind == Z3_OP_MUL:
+            non_constant_factors = [
+                argument
+                for argument in expression.children()
+                if not (is_int_value(argument) or is_rational_value(argument))
+            ]
+            if len(non_constant_factors) > 1:
+                return None
+        if kind in [Z3_OP_DIV, Z3_OP_IDIV, Z3_OP_MOD, Z3_OP_REM]:
+            divisor = expression.arg(1)
+            if not (is_int_value(divisor) or is_rational_value(divisor)):
+                return None
+            is_difference = False
+        if kind in [Z3_OP_TO_INT, Z3_OP_IS_INT]:
+            has_int = True
+            has_real = True
+        if kind == Z3_OP_ITE and is_arith(expression):
+            is_difference = False
+        if kind in _COMPARISONS and is_arith(expression.arg(0)) and is_difference:
+            arguments = expression.children()
+            for i, left in enumerate(arguments):
+                for right in arguments[i + 1 :]:
+                    if not _is_difference(left, right):
+                        is_difference = False
+        to_visit.extend(expression.children())
+    return has_int, has_real, is_difference
+
+
+def get_logics(assertions: List[ExprRef]) -> Optional[str]:
+    """Return the most specific logics the assertions belong to.
+
+    * QF_IDL (QF_RDL): integer (real) difference logic, each arithmetic atom
+      compares two variables, or a variable and a constant, e.g.
+      end - start == 3 or start >= 0, inside any boolean formula,
+    * QF_LIA (QF_LRA, QF_LIRA): linear arithmetic, e.g. sums of work amounts,
+    * None: the default solver, for non linear terms, arrays, quantifiers,
+      uninterpreted functions or other sorts.
+    """
+    features = _get_features(assertions)
+    if features is None:
+        return None
+    has_int, has_real, is_difference = features
+    if has_int and has_real:
+        return "QF_LIRA"
+    if has_real:
+        return "QF_RDL" if is_difference else "QF_LRA"
+    return "QF_IDL" if is_difference else "QF_LIA"
+
+
+def belong_to_logics(assertions: List[ExprRef], logics: Optional[str]) -> bool:
+    """True if the assertions belong to the logics, None being the default
+    solver that accepts any assertion"""
+    if logics is None:
+        return True
+    features = _get_features(assertions)
+    if features is None:
+        return False
+    has_int, has_real, is_difference = features
+    logics_has_int, logics_has_real, logics_is_difference = _LOGICS_FEATURES[logics]
+    if has_int and not logics_has_int:
+        return False
+    if has_real and not logics_has_real:
+        return False
+    return is_difference or not logics_is_difference
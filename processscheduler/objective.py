@@ -26,6 +26,10 @@ class Indicator(_NamedUIDObject):
     """an performance indicator, can be evaluated after the solver has finished solving,
     or being optimized (Max or Min) *before* calling the solver."""
 
+    # True for the indicators built by the SchedulingProblem methods, their
+    # value does not change if two identical tasks are swapped
+    task_symmetric = False
+
     def __init__(
         self,
         name: str,
@@ -40,7 +44,9 @@ class Indicator(_NamedUIDObject):
                 "the indicator expression must be either a BoolRef or ArithRef."
             )
         self.name = name
-        self.indicator_variable = Int(f"Indicator_{name}")
+        self.indicator_variable = Int(
+            f"Indicator_{name}", ps_context.get_main_context().z3_context
+        )
         # by default the scheduled value is set to None
         # set by the solver
         self.scheduled_value = None
@@ -53,7 +59,7 @@ class Indicator(_NamedUIDObject):
 
         self.append_z3_assertion(self.indicator_variable == expression)
 
-        ps_context.main_context.add_indicator(self)
+        ps_context.get_main_context().add_indicator(self)
 
 
 class Objective(_NamedUIDObject):
@@ -69,7 +75,7 @@ class Objective(_NamedUIDObject):
         else:
             self.target = target
             self.bounds = None
-        ps_context.main_context.add_objective(self)
+        ps_context.get_main_context().add_objective(self)
 
 
 class MaximizeObjective(Objective):
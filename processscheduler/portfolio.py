@@ -0,0 +1,319 @@
+"""Portfolio solving: run several differently configured solvers in parallel."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import multiprocessing
+import queue
+import time
+from typing import Dict, List, Optional
+
+from z3 import (
+    Bool,
+    Implies,
+    Int,
+    Not,
+    Optimize,
+    Solver,
+    SolverFor,
+    Tactic,
+    is_false,
+    is_int_value,
+    is_true,
+    parse_smt2_string,
+    sat,
+    unsat,
+)
+
+# name of the integer variable the objective is bound to in the exported model
+PORTFOLIO_OBJECTIVE_NAME = "PortfolioObjective"
+
+# the ways to create a solver, logics are those that fit the scheduling
+# models, see benchmark/benchmark_logics.py
+PORTFOLIO_STRATEGIES = [
+    {"logics": None},
+    {"logics": "QF_LIA"},
+    {"logics": "QF_IDL"},
+    {"tactic": "qflia"},
+    {"logics": "QF_UFIDL"},
+    {"logics": "QF_AUFLIA"},
+]
+
+
+def default_configurations(nb_workers: int) -> List[Dict]:
+    """Return nb_workers different configurations. Each configuration
+    combines a logics or a tactic with an optimizer, and has its own seed.
+    Tactics are always paired with the optimize optimizer."""
+    configurations = []
+    for i in range(nb_workers):
+        configuration = {
+            "seed": i,
+            "optimizer": "incremental" if i % 2 == 0 else "optimize",
+        }
+        configuration.update(PORTFOLIO_STRATEGIES[i % len(PORTFOLIO_STRATEGIES)])
+        if configuration.get("tactic") is not None:
+            configuration["optimizer"] = "optimize"
+        configurations.append(configuration)
+    return configurations
+
+
+def check_configuration(configuration: Dict) -> None:
+    """Raise a ValueError if the configuration cannot be used. Solvers built
+    from a tactic do not handle the assumptions the incremental optimizer
+    relies on, they only run with the optimize optimizer."""
+    optimizer = configuration.get("optimizer")
+    if optimizer not in [None, "incremental", "optimize"]:
+        raise ValueError("optimizer must be either 'incremental' or 'optimize'")
+    if configuration.get("tactic") is not None and optimizer == "incremental":
+        raise ValueError("a tactic can only be used with the 'optimize' optimizer")
+
+
+def _create_solver(configuration: Dict):
+    """create a z3 solver from a configuration dict"""
+    if configuration.get("tactic") is not None:
+        solver = Tactic(configuration["tactic"]).solver()
+    elif configuration.get("logics") is not None:
+        solver = SolverFor(configuration["logics"])
+    else:
+        solver = Solver()
+    seed = configuration.get("seed", 0)
+    solver.set("random_seed", seed)
+    # the QF_IDL solver is not the smt kernel, it rejects the smt parameters
+    prefix = "" if configuration.get("logics") == "QF_IDL" else "smt."
+    solver.set(f"{prefix}random_seed", seed)
+    solver.set(f"{prefix}arith.random_initial_value", seed > 0)
+    return solver
+
+
+def _model_to_dict(model) -> Dict:
+    """extract the values of all integer and boolean constants"""
+    values = {}
+    for decl in model.decls():
+        if decl.arity() > 0:
+            continue
+        value = model[decl]
+        if is_int_value(value):
+            values[decl.name()] = value.as_long()
+        elif is_true(value) or is_false(value):
+            values[decl.name()] = is_true(value)
+    return values
+
+
+def _remaining_milliseconds(deadline: Optional[float]) -> int:
+    if deadline is None:
+        return 4294967295  # z3 default, no timeout
+    return max(int((deadline - time.perf_counter()) * 1000), 1)
+
+
+def solve_smt2(
+    smt2: str,
+    configuration: Dict,
+    max_time: Optional[float] = None,
+    kind: Optional[str] = None,
+    report=None,
+) -> Dict:
+    """Solve the model described by an smt2 string.
+
+    kind: None for a satisfaction problem, 'min' or 'max' to optimize the
+    variable named PORTFOLIO_OBJECTIVE_NAME. Configurations with a tactic are
+    optimized by the optimize optimizer.
+    report: a callable called with each intermediate (non final) result.
+    Return a result dict with the keys status ('sat', 'unsat' or 'unknown'),
+    optimal (True if the status is proven), value, values and final.
+    """
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    assertions = parse_smt2_string(smt2)
+
+    result = {
+        "status": "unknown",
+        "optimal": False,
+        "value": None,
+        "values": None,
+        "final": True,
+    }
+
+    check_configuration(configuration)
+    if kind is not None and (
+        configuration.get("optimizer") == "optimize"
+        or configuration.get("tactic") is not None
+    ):
+        solver = Optimize()
+        solver.set("random_seed", configuration.get("seed", 0))
+        solver.set("timeout", _remaining_milliseconds(deadline))
+        solver.add(assertions)
+        objective = Int(PORTFOLIO_OBJECTIVE_NAME)
+        if kind == "min":
+            solver.minimize(objective)
+        else:
+            solver.maximize(objective)
+        sat_result = solver.check()
+        if sat_result == unsat:
+            result["status"] = "unsat"
+            result["optimal"] = True
+        else:
+            # on timeout, the Optimize solver still provides its best model
+            model = solver.model()
+            if model is not None and len(model) > 0:
+                values = _model_to_dict(model)
+                result["status"] = "sat"
+                result["optimal"] = sat_result == sat
+                result["values"] = values
+                result["value"] = values.get(PORTFOLIO_OBJECTIVE_NAME)
+        return result
+
+    solver = _create_solver(configuration)
+    solver.add(assertions)
+
+    if kind is None:
+        solver.set("timeout", _remaining_milliseconds(deadline))
+        sat_result = solver.check()
+        if sat_result == sat:
+            result["status"] = "sat"
+            result["values"] = _model_to_dict(solver.model())
+        elif sat_result == unsat:
+            result["status"] = "unsat"
+        result["optimal"] = sat_result in [sat, unsat]
+        return result
+
+    # incremental optimization, each bound is guarded by an assumption
+    objective = Int(PORTFOLIO_OBJECTIVE_NAME)
+    bound_guard = None
+    nb_guards = 0
+    while True:
+        solver.set("timeout", _remaining_milliseconds(deadline))
+        sat_result = solver.check(*([] if bound_guard is None else [bound_guard]))
+        if sat_result == unsat:
+            if result["status"] == "unknown":
+                result["status"] = "unsat"
+            result["optimal"] = True
+            break
+        if sat_result != sat:
+            break
+        values = _model_to_dict(solver.model())
+        result["status"] = "sat"
+        result["value"] = values[PORTFOLIO_OBJECTIVE_NAME]
+        result["values"] = values
+        if report is not None:
+            report(dict(result, final=False))
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if bound_guard is not None:
+            solver.add(Not(bound_guard))
+        nb_guards += 1
+        bound_guard = Bool(f"PortfolioGuard_{nb_guards}")
+        if kind == "min":
+            solver.add(Implies(bound_guard, objective < result["value"]))
+        else:
+            solver.add(Implies(bound_guard, objective > result["value"]))
+    return result
+
+
+def portfolio_worker(
+    worker_id: int,
+    smt2: str,
+    configuration: Dict,
+    max_time: Optional[float],
+    kind: Optional[str],
+    results_queue,
+) -> None:
+    """Process entry point: solve and put every result to the queue."""
+
+    def report(result):
+        result["worker"] = worker_id
+        results_queue.put(result)
+
+    try:
+        result = solve_smt2(smt2, configuration, max_time, kind, report)
+    except Exception as exc:  # a logic or tactic may not support the model
+        result = {
+            "status": "unknown",
+            "optimal": False,
+            "value": None,
+            "values": None,
+            "final": True,
+            "error": str(exc),
+        }
+    report(result)
+
+
+def _is_better(result: Dict, best: Optional[Dict], kind: Optional[str]) -> bool:
+    if result["status"] != "sat":
+        return False
+    if best is None:
+        return True
+    if kind == "min":
+        return result["value"] < best["value"]
+    if kind == "max":
+        return result["value"] > best["value"]
+    return False
+
+
+def run_portfolio(
+    smt2: str,
+    configurations: List[Dict],
+    max_time: Optional[float] = None,
+    kind: Optional[str] = None,
+) -> Optional[Dict]:
+    """Launch one process per configuration and return the first proven
+    result, or the best incumbent found before max_time. The returned dict
+    has an additional 'worker' key, the index of the configuration that
+    produced it. Return None if no worker could find anything."""
+    # spawn is the only start method available everywhere, and z3 is not
+    # safe to fork once its context is initialized
+    mp_context = multiprocessing.get_context("spawn")
+    results_queue = mp_context.Queue()
+    processes = [
+        mp_context.Process(
+            target=portfolio_worker,
+            args=(i, smt2, configuration, max_time, kind, results_queue),
+            daemon=True,
+        )
+        for i, configuration in enumerate(configurations)
+    ]
+    for process in processes:
+        process.start()
+
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    best = None
+    proven = None
+    nb_finished = 0
+    try:
+        while nb_finished < len(processes):
+            if deadline is None:
+                timeout = None
+            else:
+                # a small delay for the workers to report their last incumbent
+                timeout = max(deadline + 1 - time.perf_counter(), 0)
+            try:
+                result = results_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if result["final"]:
+                nb_finished += 1
+                if result["optimal"] and result["status"] in ["sat", "unsat"]:
+                    proven = result
+                    break
+            if _is_better(result, best, kind):
+                best = result
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        results_queue.close()
+
+    if proven is not None:
+        return proven
+    return best
@@ -15,11 +15,12 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import contextvars
 from datetime import timedelta, datetime
 import uuid
 from typing import List, Optional, Union
 
-from z3 import And, BoolRef, If, Int, Or, Sum, Implies, ArithRef
+from z3 import And, BoolRef, Context, If, Int, Or, Sum, Implies, ArithRef
 
 from processscheduler.base import _NamedUIDObject
 from processscheduler.util import is_strict_positive_integer
@@ -38,6 +39,14 @@ class SchedulingProblem(_NamedUIDObject):
     :param start_time: an optional datetime object
     :param end_time: an optional datetime object
     :param datetime_format: an optional string
+    :param private_z3_context: an optional boolean, if True the problem
+    variables are created in a z3 context of their own rather than in the
+    z3 default context. Problems with private contexts can be built and solved
+    concurrently in different threads. False by default.
+
+    The tasks, resources and constraints are added to the current problem, i.e.
+    the last problem created in the same thread or asyncio task. Use the
+    problem as a context manager to make it current in a with block.
 
     """
 
@@ -48,18 +57,26 @@ class SchedulingProblem(_NamedUIDObject):
         delta_time: Optional[timedelta] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
+        private_z3_context: Optional[bool] = False,
     ):
         super().__init__(name)
+        if not isinstance(private_z3_context, bool):
+            raise TypeError("private_z3_context must be a boolean")
         # the problem context, where all will be stored
         # at creation
-        self.context = ps_context.SchedulingContext()
-        # set this context as global
-        ps_context.main_context = self.context
+        self.context = ps_context.SchedulingContext(
+            Context() if private_z3_context else None
+        )
+        # set this context as the current one, for the current thread or
+        # asyncio task only
+        ps_context.set_main_context(self.context)
+        # the tokens to restore the previous contexts, see __exit__
+        self._context_tokens = []  # type: List[contextvars.Token]
 
         # store the horizon value to be exported to json
         self.horizon_defined_value = horizon
         # define the horizon variable
-        self.horizon = Int("horizon")
+        self.horizon = Int("horizon", self.context.z3_context)
         if is_strict_positive_integer(horizon):
             self.context.add_constraint(self.horizon <= horizon)
         elif horizon is not None:
@@ -77,6 +94,16 @@ class SchedulingProblem(_NamedUIDObject):
         self.start_time = start_time
         self.end_time = end_time
 
+    def __enter__(self) -> "SchedulingProblem":
+        """Make this problem the current one, the tasks, resources and
+        constraints created in the with block are added to this problem"""
+        self._context_tokens.append(ps_context.set_main_context(self.context))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Restore the problem that was current before the with block"""
+        ps_context.reset_main_context(self._context_tokens.pop())
+
     def add_constraint(self, constraint: BoolRef) -> None:
         self.context.add_constraint(constraint)
 
@@ -88,10 +115,12 @@ class SchedulingProblem(_NamedUIDObject):
         ]
 
         nb_tasks_assigned_indicator_variable = Sum(scheduled_tasks)
-        return Indicator(
+        nb_tasks_assigned_indicator = Indicator(
             f"Nb Tasks Assigned ({resource.name})",
             nb_tasks_assigned_indicator_variable,
         )
+        nb_tasks_assigned_indicator.task_symmetric = True
+        return nb_tasks_assigned_indicator
 
     def add_indicator_resource_cost(
         self, list_of_resources: List[Resource]
@@ -131,7 +160,7 @@ class SchedulingProblem(_NamedUIDObject):
 
         for resource in list_of_resources:
             if isinstance(resource, CumulativeWorker):
-                for res in resource.cumulative_workers:
+                for res in resource.get_workers():
                     loc_cst_cst, loc_var_cst = get_resource_cost(res)
                     constant_costs.extend(loc_cst_cst)
                     variable_costs.extend(loc_var_cst)
@@ -147,6 +176,7 @@ class SchedulingProblem(_NamedUIDObject):
         cost_indicator = Indicator(
             f"Total Cost ({resource_names})", cost_indicator_variable
         )
+        cost_indicator.task_symmetric = True
         return cost_indicator
 
     def add_indicator_resource_utilization(self, resource: Resource) -> Indicator:
@@ -162,7 +192,11 @@ class SchedulingProblem(_NamedUIDObject):
             utilization = Sum(durations) * int(100 / self.horizon_defined_value)
         else:
             utilization = (Sum(durations) * 100) / self.horizon  # in percentage
-        return Indicator(f"Utilization ({resource.name})", utilization, bounds=(0, 100))
+        utilization_indicator = Indicator(
+            f"Utilization ({resource.name})", utilization, bounds=(0, 100)
+        )
+        utilization_indicator.task_symmetric = True
+        return utilization_indicator
 
     def maximize_indicator(self, indicator: Indicator) -> MaximizeObjective:
         """Maximize indicator"""
@@ -209,14 +243,16 @@ class SchedulingProblem(_NamedUIDObject):
                 all_priorities.append(task.end * task.priority)
         priority_sum = Sum(all_priorities)
         priority_indicator = Indicator("PriorityTotal", priority_sum)
+        priority_indicator.task_symmetric = True
         MinimizeObjective("", priority_indicator, weight)
         return priority_indicator
 
     def add_objective_start_latest(self, weight=1) -> Union[ArithRef, Indicator]:
         """maximize the minimum start time, i.e. all the tasks
         are scheduled as late as possible"""
-        mini = Int("SmallestStartTime")
+        mini = Int("SmallestStartTime", self.context.z3_context)
         smallest_start_time = Indicator("SmallestStartTime", mini)
+        smallest_start_time.task_symmetric = True
         smallest_start_time.append_z3_assertion(
             Or([mini == task.start for task in self.context.tasks])
         )
@@ -228,8 +264,9 @@ class SchedulingProblem(_NamedUIDObject):
     def add_objective_start_earliest(self, weight=1) -> Union[ArithRef, Indicator]:
         """minimize the greatest start time, i.e. tasks are schedules
         as early as possible"""
-        maxi = Int("GreatestStartTime")
+        maxi = Int("GreatestStartTime", self.context.z3_context)
         greatest_start_time = Indicator("GreatestStartTime", maxi)
+        greatest_start_time.task_symmetric = True
         greatest_start_time.append_z3_assertion(
             Or([maxi == task.start for task in self.context.tasks])
         )
@@ -249,6 +286,7 @@ class SchedulingProblem(_NamedUIDObject):
                 task_ends.append(task.end)
         flow_time_expr = Sum(task_ends)
         flow_time = Indicator("FlowTime", flow_time_expr)
+        flow_time.task_symmetric = True
         MinimizeObjective("", flow_time, weight)
         return flow_time
 
@@ -266,13 +304,19 @@ class SchedulingProblem(_NamedUIDObject):
         uid = uuid.uuid4().hex
         # for this resource, we look for the minimal starting time of scheduled tasks
         # as well as the maximum
-        flowtime = Int(f"FlowtimeSingleResource{resource.name}_{uid}")
+        flowtime = Int(
+            f"FlowtimeSingleResource{resource.name}_{uid}", self.context.z3_context
+        )
 
         flowtime_single_resource_indicator = Indicator(
             f"FlowTime({resource.name}:{lower_bound}:{upper_bound})", flowtime
         )
+        flowtime_single_resource_indicator.task_symmetric = True
         # find the max end time in the time_interval
-        maxi = Int(f"GreatestTaskEndTimeInTimePeriodForResource{resource.name}_{uid}")
+        maxi = Int(
+            f"GreatestTaskEndTimeInTimePeriodForResource{resource.name}_{uid}",
+            self.context.z3_context,
+        )
 
         asst_max = [
             Implies(
@@ -291,7 +335,10 @@ class SchedulingProblem(_NamedUIDObject):
             )
 
         # and the mini
-        mini = Int(f"SmallestTaskEndTimeInTimePeriodForResource{resource.name}_{uid}")
+        mini = Int(
+            f"SmallestTaskEndTimeInTimePeriodForResource{resource.name}_{uid}",
+            self.context.z3_context,
+        )
 
         asst_min = [
             Implies(
@@ -83,11 +83,12 @@ class Worker(Resource):
 
         # only worker are add to the main context, not SelectWorkers
         # add this resource to the current context
-        if ps_context.main_context is None:
+        main_context = ps_context.get_main_context()
+        if main_context is None:
             raise AssertionError(
                 "No context available. First create a SchedulingProblem"
             )
-        ps_context.main_context.add_resource(self)
+        main_context.add_resource(self)
 
 
 class SelectWorkers(Resource):
@@ -124,6 +125,10 @@ class SelectWorkers(Resource):
         self.list_of_workers = []
         for worker in list_of_workers:
             if isinstance(worker, CumulativeWorker):
+                if worker.encoding == "native":
+                    raise ValueError(
+                        f"CumulativeWorker {worker.name} has a native encoding, it cannot be selected"
+                    )
                 self.list_of_workers.extend(worker.cumulative_workers)
             else:
                 self.list_of_workers.append(worker)
@@ -133,7 +138,10 @@ class SelectWorkers(Resource):
 
         # create as many booleans as resources in the list
         for worker in self.list_of_workers:
-            worker_is_selected = Bool(f"Selected_{worker.name}_{self.uid}")
+            worker_is_selected = Bool(
+                f"Selected_{worker.name}_{self.uid}",
+                ps_context.get_main_context().z3_context,
+            )
             self.selection_dict[worker] = worker_is_selected
 
         # create the assertion : exactly n boolean flags are allowed to be True,
@@ -144,11 +152,17 @@ class SelectWorkers(Resource):
         self.selection_assertion = problem_function[kind](
             [(selected, True) for selected in selection_list], nb_workers_to_select
         )
-        ps_context.main_context.add_resource_select_workers(self)
+        ps_context.get_main_context().add_resource_select_workers(self)
 
 
 class CumulativeWorker(Resource):
-    """A cumulative worker can process multiple tasks in parallel."""
+    """A cumulative worker can process multiple tasks in parallel.
+
+    With the workers encoding (default), the cumulative worker is made of size
+    individual workers, and each task selects at least one of them. With the
+    native encoding, the solver only checks that at most size tasks are
+    processed at the same time, and productivity and cost are those of each
+    task processed by the cumulative worker."""
 
     def __init__(
         self,
@@ -156,6 +170,7 @@ class CumulativeWorker(Resource):
         size: int,
         productivity: Optional[int] = 1,
         cost: Optional[int] = None,
+        encoding: Optional[str] = "workers",
     ) -> None:
         super().__init__(name)
 
@@ -163,6 +178,10 @@ class CumulativeWorker(Resource):
             raise ValueError("CumulativeWorker 'size' attribute must be >=2.")
         self.size = size
 
+        if encoding not in ["workers", "native"]:
+            raise ValueError("encoding must be either 'workers' or 'native'")
+        self.encoding = encoding
+
         if not is_positive_integer(productivity):
             raise TypeError("productivity must be an integer >= 0")
         self.productivity = productivity
@@ -172,8 +191,15 @@ class CumulativeWorker(Resource):
 
         elif not isinstance(cost, _Cost):
             raise TypeError("cost must be a _Cost instance")
+        self.cost = cost
         self.cost_defined_value = cost
 
+        if encoding == "native":
+            # the busy intervals of the tasks are stored by this resource
+            self.cumulative_workers = []
+            ps_context.get_main_context().add_resource_cumulative_worker(self)
+            return
+
         # productivity and cost_per_period are distributed over
         # individual workers
         # for example, a productivty of 7 for a size of 3 will be distributed
@@ -192,7 +218,15 @@ class CumulativeWorker(Resource):
             for i in range(size)
         ]
 
-        ps_context.main_context.add_resource_cumulative_worker(self)
+        ps_context.get_main_context().add_resource_cumulative_worker(self)
+
+    def get_workers(self) -> List[Resource]:
+        """Return the resources the busy intervals of the cumulative worker
+        are stored by: the individual workers, or the cumulative worker itself
+        with the native encoding."""
+        if self.encoding == "native":
+            return [self]
+        return self.cumulative_workers
 
     def get_select_workers(self):
         """Each time the cumulative resource is assigned to a task, a SelectWorker
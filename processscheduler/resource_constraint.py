@@ -22,7 +22,8 @@ from z3 import And, Implies, Int, Not, Or, Sum, Xor
 
 from processscheduler.resource import Worker, CumulativeWorker
 from processscheduler.constraint import ResourceConstraint
-from processscheduler.util import sort_no_duplicates
+from processscheduler.util import DEFAULT_SORT_METHOD, sort_no_duplicates
+import processscheduler.context as ps_context
 
 
 def assert_resource_is_worker_or_cumulative_worker(resource):
@@ -66,7 +67,7 @@ class WorkLoad(ResourceConstraint):
         if isinstance(resource, Worker):
             workers = [resource]
         elif isinstance(resource, CumulativeWorker):
-            workers = resource.cumulative_workers
+            workers = resource.get_workers()
 
         for time_interval in dict_time_intervals_and_bound:
             number_of_time_slots = dict_time_intervals_and_bound[time_interval]
@@ -82,7 +83,8 @@ class WorkLoad(ResourceConstraint):
                     # this variable allows to compute the occupation
                     # of the resource during the time interval
                     dur = Int(
-                        f"Overlap_{time_interval_lower_bound}_{time_interval_upper_bound}_{uuid.uuid4().hex[:8]}"
+                        f"Overlap_{time_interval_lower_bound}_{time_interval_upper_bound}_{uuid.uuid4().hex[:8]}",
+                        ps_context.get_main_context().z3_context,
                     )
                     # prevent solutions where duration would be negative
                     self.set_z3_assertions(dur >= 0)
@@ -168,7 +170,7 @@ class ResourceUnavailable(ResourceConstraint):
         if isinstance(resource, Worker):
             workers = [resource]
         elif isinstance(resource, CumulativeWorker):
-            workers = resource.cumulative_workers
+            workers = resource.get_workers()
 
         for interval_lower_bound, interval_upper_bound in list_of_time_intervals:
             # add constraints on each busy interval
@@ -184,7 +186,8 @@ class ResourceUnavailable(ResourceConstraint):
 
 class ResourceTasksDistance(ResourceConstraint):
     """Force a minimal/exact/maximal number time unitary periods between tasks for a single resource. This
-    distance constraint is restricted to a certain number of time intervals"""
+    distance constraint is restricted to a certain number of time intervals. sort_method is the
+    sort_no_duplicates method used to sort the busy intervals"""
 
     def __init__(
         self,
@@ -193,6 +196,7 @@ class ResourceTasksDistance(ResourceConstraint):
         list_of_time_intervals: Optional[list] = None,
         optional: Optional[bool] = False,
         mode: Optional[str] = "exact",
+        sort_method: Optional[str] = DEFAULT_SORT_METHOD,
     ):
         if mode not in {"min", "max", "exact"}:
             raise Exception("Mode should be min, max or exact")
@@ -205,6 +209,7 @@ class ResourceTasksDistance(ResourceConstraint):
         self.resource = resource
         self.distance = distance
         self.mode = mode
+        self.sort_method = sort_method
 
         starts = []
         ends = []
@@ -219,8 +224,8 @@ class ResourceTasksDistance(ResourceConstraint):
             )
 
         # sort both lists
-        sorted_starts, c1 = sort_no_duplicates(starts)
-        sorted_ends, c2 = sort_no_duplicates(ends)
+        sorted_starts, c1 = sort_no_duplicates(starts, sort_method)
+        sorted_ends, c2 = sort_no_duplicates(ends, sort_method)
         for c in c1 + c2:
             self.set_z3_assertions(c)
         # from now, starts and ends are sorted in asc order
@@ -0,0 +1,148 @@
+"""Time queries on the assignments of a solved schedule."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+
+class _MaxTree:
+    """A static segment tree of the maximum of a list of values"""
+
+    def __init__(self, values: List[int]) -> None:
+        self.nb_values = len(values)
+        self.size = 1
+        while self.size < self.nb_values:
+            self.size *= 2
+        self.tree = [float("-inf")] * (2 * self.size)
+        self.tree[self.size : self.size + self.nb_values] = values
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def find_greater(self, count: int, threshold: int) -> List[int]:
+        """The indices i < count such that values[i] > threshold, sorted"""
+        indices = []
+
+        def visit(node: int, lower: int, upper: int) -> None:
+            if lower >= count or self.tree[node] <= threshold:
+                return
+            if node >= self.size:
+                indices.append(lower)
+                return
+            middle = (lower + upper) // 2
+            visit(2 * node, lower, middle)
+            visit(2 * node + 1, middle, upper)
+
+        visit(1, 0, self.size)
+        return indices
+
+    def find_first_at_least(self, first: int, threshold: int) -> Optional[int]:
+        """The smallest index i >= first such that values[i] >= threshold,
+        None if there is no such index"""
+
+        def visit(node: int, lower: int, upper: int) -> Optional[int]:
+            if upper <= first or self.tree[node] < threshold:
+                return None
+            if node >= self.size:
+                return lower
+            middle = (lower + upper) // 2
+            index = visit(2 * node, lower, middle)
+            if index is None:
+                index = visit(2 * node + 1, middle, upper)
+            return index
+
+        return visit(1, 0, self.size)
+
+
+class ScheduleIndex:
+    """An index of assignments, i.e. (task name, start, end) tuples, for
+    point, range and free slot queries in logarithmic time.
+
+    Assignments are sorted by start, along with a segment tree of their
+    ends, so that the tasks that overlap a time interval are found without
+    scanning the tasks that end before it. Overlapping assignments, e.g.
+    those of a cumulative worker, are supported. Time intervals are half
+    open: a task from 2 to 5 is active at 2, 3 and 4.
+
+    unavailable_intervals: (lower, upper) time intervals where the resource
+    is not free, though it processes no task."""
+
+    def __init__(
+        self,
+        assignments: Iterable[Tuple[str, int, int]],
+        unavailable_intervals: Optional[Iterable[Tuple[int, int]]] = None,
+    ) -> None:
+        assignments = sorted(assignments, key=lambda item: (item[1], item[2]))
+        self.task_names = [task_name for task_name, _, _ in assignments]
+        self.starts = [start for _, start, _ in assignments]
+        self.ends = [end for _, _, end in assignments]
+        self._ends_tree = _MaxTree(self.ends)
+
+        # the busy time intervals, overlapping assignments and unavailable
+        # intervals being merged. Zero duration tasks do not make the
+        # resource busy
+        busy_intervals = list(zip(self.starts, self.ends))
+        if unavailable_intervals is not None:
+            busy_intervals = sorted(busy_intervals + list(unavailable_intervals))
+        self.busy_starts = []  # type: List[int]
+        self.busy_ends = []  # type: List[int]
+        for start, end in busy_intervals:
+            if end <= start:
+                continue
+            if self.busy_ends and start <= self.busy_ends[-1]:
+                self.busy_ends[-1] = max(self.busy_ends[-1], end)
+            else:
+                self.busy_starts.append(start)
+                self.busy_ends.append(end)
+        # the length of the free time interval before each busy interval
+        # but the first one
+        gaps = [-1] + [
+            start - end for start, end in zip(self.busy_starts[1:], self.busy_ends)
+        ]
+        self._gaps_tree = _MaxTree(gaps)
+
+    def __len__(self) -> int:
+        return len(self.task_names)
+
+    def get_tasks_at(self, time: int) -> List[str]:
+        """The names of the tasks active at time"""
+        return self.get_tasks_in_interval(time, time + 1)
+
+    def get_tasks_in_interval(self, lower_bound: int, upper_bound: int) -> List[str]:
+        """The names of the tasks active in the interval [lower_bound,
+        upper_bound), sorted by start"""
+        count = bisect_left(self.starts, upper_bound)
+        return [
+            self.task_names[i] for i in self._ends_tree.find_greater(count, lower_bound)
+        ]
+
+    def get_first_free_slot(self, duration: int, earliest: int = 0) -> int:
+        """The first time, from earliest on, where nothing is processed
+        and the resource is available during duration periods"""
+        nb_busy = len(self.busy_starts)
+        # the first busy interval that ends after earliest
+        j = bisect_right(self.busy_ends, earliest)
+        start = earliest
+        if j < nb_busy and self.busy_starts[j] <= earliest:
+            start = self.busy_ends[j]
+            j += 1
+        if j == nb_busy or start + duration <= self.busy_starts[j]:
+            return start
+        # the first free time interval long enough after the busy interval j
+        k = self._gaps_tree.find_first_at_least(j + 1, duration)
+        if k is None:
+            return self.busy_ends[-1]
+        return self.busy_ends[k - 1]
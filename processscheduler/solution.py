@@ -15,12 +15,15 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+from collections.abc import Mapping
 from pathlib import Path
 import random
 from typing import List, Optional, Tuple
 
 from processscheduler.json_io import solution_to_json_string
 from processscheduler.excel_io import export_solution_to_excel_file
+from processscheduler.resource_constraint import ResourceUnavailable
+from processscheduler.schedule_index import ScheduleIndex
 
 class TaskSolution:
     """Class to represent the solution for a scheduled Task."""
@@ -41,6 +44,18 @@ class TaskSolution:
         # the name of assigned resources
         self.assigned_resources = []  # type: List[str]
 
+    def set_times(self, delta_time, start_time) -> None:
+        """Compute start_time, end_time and duration_time from the problem
+        delta_time and start_time, if delta_time is defined"""
+        if delta_time is None:
+            return
+        self.duration_time = self.duration * delta_time
+        if start_time is not None:
+            self.start_time = start_time + self.start * delta_time
+        else:
+            self.start_time = self.start * delta_time
+        self.end_time = self.start_time + self.duration_time
+
 
 class ResourceSolution:
     """Class to represent the solution for the resource assignments."""
@@ -64,6 +79,165 @@ class BufferSolution:
         self.state = []  # type: List[int]
 
 
+class SolutionColumns:
+    """Columnar representation of the tasks and resource assignments of a
+    solution, for very large schedules. Task data are NumPy arrays, in the
+    order of the problem tasks. The resources assigned to the task i are the
+    resource_names[j] for j in task_resources[task_resources_indptr[i]:
+    task_resources_indptr[i + 1]], i.e. a CSR sparse matrix. Assignments of
+    the resource j are stored the same way, from assignments_indptr[j] to
+    assignments_indptr[j + 1] in the assignment_tasks, assignment_starts and
+    assignment_ends arrays."""
+
+    def __init__(
+        self,
+        task_names: List[str],
+        task_types: List[str],
+        starts: List[int],
+        ends: List[int],
+        durations: List[int],
+        optional: List[bool],
+        scheduled: List[bool],
+        task_resources: List[List[str]],
+        resource_names: List[str],
+        resource_types: List[str],
+        resource_assignments: List[List[Tuple[str, int, int]]],
+        delta_time=None,
+        start_time=None,
+    ) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:
+            raise ModuleNotFoundError("numpy is not installed.") from exc
+
+        self.task_names = list(task_names)
+        self.task_type_names = sorted(set(task_types))
+        type_indices = {name: i for i, name in enumerate(self.task_type_names)}
+        self.task_types = np.array(
+            [type_indices[name] for name in task_types], dtype=np.int32
+        )
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.durations = np.array(durations, dtype=np.int64)
+        self.optional = np.array(optional, dtype=bool)
+        self.scheduled = np.array(scheduled, dtype=bool)
+
+        self.resource_names = list(resource_names)
+        self.resource_types = list(resource_types)
+        resource_indices = {name: i for i, name in enumerate(self.resource_names)}
+        self.task_resources_indptr = np.cumsum(
+            [0] + [len(names) for names in task_resources], dtype=np.int64
+        )
+        self.task_resources = np.array(
+            [resource_indices[name] for names in task_resources for name in names],
+            dtype=np.int32,
+        )
+
+        task_indices = {name: i for i, name in enumerate(self.task_names)}
+        self.assignments_indptr = np.cumsum(
+            [0] + [len(assignments) for assignments in resource_assignments],
+            dtype=np.int64,
+        )
+        self.assignment_tasks = np.array(
+            [
+                task_indices[task_name]
+                for assignments in resource_assignments
+                for task_name, _, _ in assignments
+            ],
+            dtype=np.int32,
+        )
+        self.assignment_starts = np.array(
+            [
+                start
+                for assignments in resource_assignments
+                for _, start, _ in assignments
+            ],
+            dtype=np.int64,
+        )
+        self.assignment_ends = np.array(
+            [end for assignments in resource_assignments for _, _, end in assignments],
+            dtype=np.int64,
+        )
+
+        self.delta_time = delta_time
+        self.start_time = start_time
+        # the index of each task name, computed on first lookup
+        self._task_indices = None
+
+    def get_task_index(self, task_name: str) -> int:
+        if self._task_indices is None:
+            self._task_indices = {name: i for i, name in enumerate(self.task_names)}
+        return self._task_indices[task_name]
+
+    def get_task_solution(self, index: int) -> TaskSolution:
+        """Create the TaskSolution of the task index"""
+        task_solution = TaskSolution(self.task_names[index])
+        task_solution.type = self.task_type_names[self.task_types[index]]
+        task_solution.start = int(self.starts[index])
+        task_solution.end = int(self.ends[index])
+        task_solution.duration = int(self.durations[index])
+        task_solution.optional = bool(self.optional[index])
+        task_solution.scheduled = bool(self.scheduled[index])
+        task_solution.set_times(self.delta_time, self.start_time)
+        first = self.task_resources_indptr[index]
+        last = self.task_resources_indptr[index + 1]
+        task_solution.assigned_resources = [
+            self.resource_names[j] for j in self.task_resources[first:last]
+        ]
+        return task_solution
+
+    def get_resource_solution(self, index: int) -> ResourceSolution:
+        """Create the ResourceSolution of the resource index"""
+        resource_solution = ResourceSolution(self.resource_names[index])
+        resource_solution.type = self.resource_types[index]
+        first = self.assignments_indptr[index]
+        last = self.assignments_indptr[index + 1]
+        resource_solution.assignments = [
+            (self.task_names[task_index], int(start), int(end))
+            for task_index, start, end in zip(
+                self.assignment_tasks[first:last],
+                self.assignment_starts[first:last],
+                self.assignment_ends[first:last],
+            )
+        ]
+        return resource_solution
+
+
+class TaskSolutionsView(Mapping):
+    """Read only mapping of task names to TaskSolution instances, created
+    from the solution columns each time they are accessed."""
+
+    def __init__(self, columns: SolutionColumns) -> None:
+        self.columns = columns
+
+    def __getitem__(self, task_name: str) -> TaskSolution:
+        return self.columns.get_task_solution(self.columns.get_task_index(task_name))
+
+    def __iter__(self):
+        return iter(self.columns.task_names)
+
+    def __len__(self) -> int:
+        return len(self.columns.task_names)
+
+
+class ResourceSolutionsView(Mapping):
+    """Read only mapping of resource names to ResourceSolution instances,
+    created from the solution columns each time they are accessed."""
+
+    def __init__(self, columns: SolutionColumns) -> None:
+        self.columns = columns
+        self._indices = {name: i for i, name in enumerate(columns.resource_names)}
+
+    def __getitem__(self, resource_name: str) -> ResourceSolution:
+        return self.columns.get_resource_solution(self._indices[resource_name])
+
+    def __iter__(self):
+        return iter(self.columns.resource_names)
+
+    def __len__(self) -> int:
+        return len(self.columns.resource_names)
+
+
 class SchedulingSolution:
     """A class that represent the solution of a scheduling problem. Can be rendered
     to a matplotlib Gantt chart, or exported to json
@@ -78,6 +252,10 @@ class SchedulingSolution:
         self.resources = {}  # type: Dict[str, ResourceSolution]
         self.buffers = {}  # type: Dict[str, BufferSolution]
         self.indicators = {}  # type: Dict[str, int]
+        # the columnar representation of tasks and resources, if any
+        self.columns = None  # type: Optional[SolutionColumns]
+        # the schedule indices, built on first query
+        self._schedule_indices = {}  # type: Dict[Optional[str], ScheduleIndex]
 
     def __repr__(self):
         return self.to_json_string()
@@ -113,6 +291,66 @@ class SchedulingSolution:
     def add_buffer_solution(self, buffer_solution: BufferSolution) -> None:
         self.buffers[buffer_solution.name] = buffer_solution
 
+    def set_columns(self, columns: SolutionColumns) -> None:
+        """Use a columnar representation of tasks and resources. The tasks
+        and resources dicts are replaced with read only views over the
+        columns."""
+        self.columns = columns
+        self.tasks = TaskSolutionsView(columns)
+        self.resources = ResourceSolutionsView(columns)
+        self._schedule_indices = {}
+
+    def get_schedule_index(self, resource_name: Optional[str] = None) -> ScheduleIndex:
+        """Return the index of the assignments of the resource, or of all the
+        scheduled tasks if resource_name is None, for time queries such as
+        the tasks processed at a given time, or the first free slot. The
+        mandatory ResourceUnavailable intervals of the resource are not free.
+        The index is built on first use, and does not follow later changes to
+        the solution."""
+        if resource_name not in self._schedule_indices:
+            unavailable_intervals = None
+            if resource_name is not None:
+                assignments = self.resources[resource_name].assignments
+                unavailable_intervals = [
+                    interval
+                    for constraint in self.problem.context.get_constraints_by_type(
+                        ResourceUnavailable
+                    )
+                    if not constraint.optional
+                    and constraint.resource.name == resource_name
+                    for interval in constraint.list_of_time_intervals
+                ]
+            elif self.columns is not None:
+                columns = self.columns
+                assignments = [
+                    (task_name, start, end)
+                    for task_name, start, end, scheduled in zip(
+                        columns.task_names,
+                        columns.starts.tolist(),
+                        columns.ends.tolist(),
+                        columns.scheduled.tolist(),
+                    )
+                    if scheduled and "NotAvailable" not in task_name
+                ]
+            else:
+                assignments = [
+                    (task_name, task_solution.start, task_solution.end)
+                    for task_name, task_solution in self.get_scheduled_tasks().items()
+                ]
+            self._schedule_indices[resource_name] = ScheduleIndex(
+                assignments, unavailable_intervals
+            )
+        return self._schedule_indices[resource_name]
+
+    def validate(self, problem=None) -> List[str]:
+        """Check the solution against the problem without the solver, and
+        return the list of violations, empty if the solution is valid. The
+        problem defaults to the one the solution was built for. Requires
+        numpy."""
+        from processscheduler.validation import validate_solution
+
+        return validate_solution(self, problem)
+
     #
     # Gantt graphical rendering using plotly and matplotlib
     #
@@ -15,36 +15,68 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import concurrent.futures
+import json
+import multiprocessing
 import random
 import time
-from typing import Optional, Union
+from typing import List, Optional, Union
 import uuid
 import warnings
 
 from z3 import (
+    And,
     ArithRef,
     Array,
+    Bool,
+    BoolRef,
+    Distinct,
+    If,
+    Implies,
     Int,
     IntSort,
+    Not,
     Optimize,
     Or,
+    PbLe,
     Solver,
     SolverFor,
     Store,
     Sum,
+    Xor,
+    is_int_value,
+    sat,
     unsat,
     unknown,
     set_option,
 )
 
+from processscheduler.heuristic import GreedyScheduler
+from processscheduler.ir import ProblemIR
+from processscheduler.logics import belong_to_logics, get_logics
 from processscheduler.objective import MaximizeObjective, MinimizeObjective, Indicator
+from processscheduler.resource import CumulativeWorker
+from processscheduler.resource_constraint import ResourceUnavailable
+from processscheduler.task import FixedDurationTask
+from processscheduler.time_window import (
+    build_time_window_graph,
+    propagate_time_windows,
+)
+from processscheduler.symmetry import find_identical_tasks, find_identical_workers
 from processscheduler.solution import (
     SchedulingSolution,
+    SolutionColumns,
     TaskSolution,
     ResourceSolution,
     BufferSolution,
 )
-from processscheduler.util import calc_parabola_from_three_points, sort_no_duplicates
+from processscheduler.util import (
+    DEFAULT_SORT_METHOD,
+    calc_parabola_from_three_points,
+    get_model_values,
+    is_strict_positive_integer,
+    sort_no_duplicates,
+)
 
 #
 # Solver class definition
@@ -63,14 +95,43 @@ class SchedulingSolver:
         verbosity: Optional[int] = 0,
         optimizer: Optional[str] = "incremental",
         optimize_priority: Optional[str] = "pareto",
+        resource_encoding: Optional[str] = "pairwise",
+        buffer_encoding: Optional[str] = "events",
+        time_window_propagation: Optional[bool] = True,
+        heuristic: Optional[str] = None,
+        initial_solution: Optional[Union[SchedulingSolution, str]] = None,
+        symmetry_breaking: Optional[bool] = True,
+        columnar_solution: Optional[bool] = False,
+        sort_method: Optional[str] = DEFAULT_SORT_METHOD,
     ):
         """Scheduling Solver
 
+        problem: a SchedulingProblem, or a ProblemIR that is compiled first
         debug: True or False, False by default
         max_time: time in seconds, 10 by default, "inf" means infinity, no max_time
         parallel: True to enable mutlthreading, False by default
-        optimizer: incremental or optimize
+        logics: the SMT logics, e.g. QF_IDL, QF_LIA or ALL. None by default,
+        the most specific logics is then selected from the assertions
+        optimizer: incremental, bisect or optimize
+        resource_encoding: pairwise by default, the way busy intervals of a
+        resource are prevented from overlapping. time_indexed is experimental:
+        its size grows with the sum of the task durations
+        buffer_encoding: events or array, the way buffer levels are computed
+        time_window_propagation: True to bound task starts before solving, True
+        by default
+        heuristic: None, serial or parallel, the schedule generation scheme used
+        to build a first schedule before solving, None by default
+        initial_solution: a previous SchedulingSolution, a json string or the
+        name of a json file exported from a solution, used as initial values
+        symmetry_breaking: True to order identical tasks and workers, True by
+        default
+        columnar_solution: True to store the tasks and resources of solutions
+        in NumPy arrays, for very large schedules, False by default
+        sort_method: pairwise, network or permutation, the sort_no_duplicates
+        method of the array buffer encoding, network by default
         """
+        if isinstance(problem, ProblemIR):
+            problem = problem.compile()
         self.problem = problem
         self.problem_context = problem.context
         self.debug = debug
@@ -79,33 +140,93 @@ class SchedulingSolver:
         self.current_solution = None  # no solution until the problem is solved
         self.optimizer = optimizer
         self.optimize_priority = optimize_priority
-
-        if optimizer not in ["incremental", "optimize"]:
-            raise TypeError("optimizer must be either 'incremental' or 'optimize'")
+        self.resource_encoding = resource_encoding
+        self.buffer_encoding = buffer_encoding
+        self.sort_method = sort_method
+        self.random_values = random_values
+        self.parallel = parallel
+        # the logics of the solver, None for the standard solver
+        self.logics = logics
+        # True if the logics is selected from the assertions, the solver is
+        # then rebuilt if a new assertion does not belong to this logics
+        self._select_logics = False
+        # the number of guard literals created for assumptions
+        self._nb_guards = 0
+        # earliest and latest starts of tasks, computed before solving
+        self.time_windows = None
+        # True if time window propagation proved the problem is unsatisfiable
+        self.time_windows_infeasible = False
+        # the schedule built by the greedy heuristic, if any
+        self.heuristic_solution = None
+        # True if the last solution is proven optimal, or if it satisfies a
+        # problem without objective
+        self.optimality_proven = False
+        # the literal that guards the objective bound of the heuristic schedule
+        self._heuristic_bound_guard = None
+        # the literals that guard the symmetry breaking assertions, one per
+        # group of identical tasks or workers
+        self._symmetry_guards = []  # type: List[BoolRef]
+        # the tasks and constraints whose assertions are in the solver
+        self._solver_tasks = set(self.problem_context.tasks)
+        self._solver_constraints = set(
+            c for c in self.problem_context.constraints if not c.created_from_assertion
+        )
+        # the literals that guard the tasks, constraints and
+        # (task, resource) assignments added to the live solver
+        self._live_guards = {}
+        # the workers and SelectWorkers instances of each (task, resource)
+        # assignment added to the live solver
+        self._live_assignments = {}
+
+        if optimizer not in ["incremental", "bisect", "optimize"]:
+            raise TypeError(
+                "optimizer must be either 'incremental', 'bisect' or 'optimize'"
+            )
 
         if optimize_priority not in ["pareto", "lex", "box", "weight"]:
             raise TypeError(
                 "optimize priority must be either 'pareto', 'box', 'lex' or 'weight'"
             )
 
+        if resource_encoding not in ["pairwise", "time_indexed"]:
+            raise TypeError(
+                "resource_encoding must be either 'pairwise' or 'time_indexed'"
+            )
+        if resource_encoding == "time_indexed":
+            warnings.warn(
+                "the time_indexed resource encoding is experimental, its size "
+                "grows with the sum of the task durations"
+            )
+
+        if buffer_encoding not in ["events", "array"]:
+            raise TypeError("buffer_encoding must be either 'events' or 'array'")
+
+        if sort_method not in ["pairwise", "network", "permutation"]:
+            raise TypeError(
+                "sort_method must be either 'pairwise', 'network' or 'permutation'"
+            )
+
+        if not isinstance(time_window_propagation, bool):
+            raise TypeError("time_window_propagation must be a boolean")
+
+        if heuristic not in [None, "serial", "parallel"]:
+            raise TypeError("heuristic must be either None, 'serial' or 'parallel'")
+
+        if not isinstance(symmetry_breaking, bool):
+            raise TypeError("symmetry_breaking must be a boolean")
+
+        if not isinstance(columnar_solution, bool):
+            raise TypeError("columnar_solution must be a boolean")
+        self.columnar_solution = columnar_solution
+
+        # the verbosity is the only process wide option, all the other ones
+        # are set to the solver so that solvers do not interfere
         if debug:
             set_option("verbose", 2)
         else:
             set_option("verbose", verbosity)
 
-        if random_values:
-            set_option("sat.random_seed", random.randint(1, 1e3))
-            set_option("smt.random_seed", random.randint(1, 1e3))
-            set_option("smt.arith.random_initial_value", True)
-        else:
-            set_option("sat.random_seed", 0)
-            set_option("smt.random_seed", 0)
-            set_option("smt.arith.random_initial_value", False)
-
-        # set timeout
         self.max_time = max_time  # in seconds
-        if self.max_time != "inf":
-            set_option("timeout", int(self.max_time * 1000))  # in milliseconds
 
         # create the solver
         print("Solver type:\n===========")
@@ -116,22 +237,21 @@ class SchedulingSolver:
         self.is_multi_objective_optimization_problem = (
             len(self.problem_context.objectives) > 1
         )
+        # the z3 context the problem variables are created in
+        z3_context = self.problem_context.z3_context
         # use the z3 Optimize solver if requested
         if not self.is_not_optimization_problem and optimizer == "optimize":
-            self._solver = Optimize()
+            self._solver = Optimize(ctx=z3_context)
             self._solver.set(priority=optimize_priority)
             print("\t-> Builtin z3 Optimize solver")
         elif logics is None:
-            self._solver = Solver()
+            self._solver = Solver(ctx=z3_context)
             print("\t-> Standard SAT/SMT solver")
         else:
-            self._solver = SolverFor(logics)
+            self._solver = SolverFor(logics, ctx=z3_context)
             print("\t-> SMT solver using logics", logics)
-        if debug:
-            set_option(unsat_core=True)
 
-        if parallel:
-            set_option("parallel.enable", True)  # enable parallel computation
+        self.set_solver_parameters()
 
         # add all tasks z3 assertions to the solver
         for task in self.problem_context.tasks:
@@ -144,15 +264,13 @@ class SchedulingSolver:
 
         # process resource intervals
         for ress in self.problem_context.resources:
-            busy_intervals = ress.get_busy_intervals()
-            nb_intervals = len(busy_intervals)
-            for i in range(nb_intervals):
-                start_task_i, end_task_i = busy_intervals[i]
-                for k in range(i + 1, nb_intervals):
-                    start_task_k, end_task_k = busy_intervals[k]
-                    self.append_z3_assertion(
-                        Or(start_task_k >= end_task_i, start_task_i >= end_task_k)
-                    )
+            if self.resource_encoding == "pairwise":
+                self.add_pairwise_resource_assertions(ress)
+            else:
+                self.add_time_indexed_resource_assertions(ress)
+        for cumulative_worker in self.problem_context.cumulative_workers:
+            if cumulative_worker.encoding == "native":
+                self.add_cumulative_resource_assertions(cumulative_worker)
 
         # add z3 assertions for constraints
         # that are *NOT* defined from an assertion
@@ -162,6 +280,10 @@ class SchedulingSolver:
         for constraint in constraints_not_from_assertion:
             self.append_z3_assertion(constraint.get_z3_assertions())
 
+        # bound task starts with the time windows
+        if time_window_propagation:
+            self.add_time_window_assertions()
+
         # process indicators
         for indic in self.problem_context.indicators:
             self.append_z3_assertion(indic.get_z3_assertions())
@@ -184,76 +306,109 @@ class SchedulingSolver:
 
         # process buffers
         for buffer in self.problem_context.buffers:
-            # create an array that stores the mapping between start times and
-            # quantities. For example, if a task T1 starts at 2 and unloads
-            # 8, and T3 ends at 6 and loads 5 then the mapping array
-            # will look like : A[2]=-8 and A[6]=5
-            buffer_mapping = Array(
-                f"Buffer_{buffer.name}_mapping", IntSort(), IntSort()
-            )
-            for t in buffer.unloading_tasks:
-                self.append_z3_assertion(
-                    buffer_mapping
-                    == Store(buffer_mapping, t.start, -buffer.unloading_tasks[t])
-                )
-            for t in buffer.loading_tasks:
-                self.append_z3_assertion(
-                    buffer_mapping
-                    == Store(buffer_mapping, t.end, +buffer.loading_tasks[t])
-                )
-            # sort consume/feed times in asc order
-            tasks_start_unload = [t.start for t in buffer.unloading_tasks]
-            tasks_end_load = [t.end for t in buffer.loading_tasks]
-
-            sorted_times, sort_assertions = sort_no_duplicates(
-                tasks_start_unload + tasks_end_load
-            )
-            self.append_z3_assertion(sort_assertions)
-            # create as many buffer state changes as sorted_times
-            buffer.state_changes_time = [
-                Int(f"{buffer.name}_sc_time_{k}") for k in range(len(sorted_times))
-            ]
-
-            # add the constraints that give the buffer state change times
-            for st, bfst in zip(sorted_times, buffer.state_changes_time):
-                self.append_z3_assertion(st == bfst)
-
-            # compute the different buffer states according to state changes
-            buffer.buffer_states = [
-                Int(f"{buffer.name}_state_{k}")
-                for k in range(len(buffer.state_changes_time) + 1)
-            ]
-            # add constraints for buffer states
-            # the first buffer state is equal to the buffer initial level
-            if buffer.initial_state is not None:
-                self.append_z3_assertion(
-                    buffer.buffer_states[0] == buffer.initial_state
-                )
-            if buffer.final_state is not None:
-                self.append_z3_assertion(buffer.buffer_states[-1] == buffer.final_state)
-            if buffer.lower_bound is not None:
-                for st in buffer.buffer_states:
-                    self.append_z3_assertion(st >= buffer.lower_bound)
-            if buffer.upper_bound is not None:
-                for st in buffer.buffer_states:
-                    self.append_z3_assertion(st <= buffer.upper_bound)
-            # and, for the other, the buffer state i+1 is the buffer state i +/- the buffer change
-            for i in range(len(buffer.buffer_states) - 1):
-                self.append_z3_assertion(
-                    buffer.buffer_states[i + 1]
-                    == buffer.buffer_states[i]
-                    + buffer_mapping[buffer.state_changes_time[i]]
-                )
+            if self.buffer_encoding == "events":
+                self.add_buffer_events_assertions(buffer)
+            else:
+                self.add_buffer_array_assertions(buffer)
 
         # Finally add other assertions (FOL, user defined)
         for z3_assertion in self.problem_context.z3_assertions:
             self.append_z3_assertion(z3_assertion)
 
+        # order identical tasks and workers
+        if symmetry_breaking:
+            self.add_symmetry_breaking_assertions()
+
         # optimization
         if self.is_optimization_problem:
             self.create_objective()
 
-    def append_z3_assertion(self, asst) -> bool:
+        # the Optimize solver and the tracked assertions of the debug mode
+        # are not copied to another solver
+        if logics is None and not debug and not isinstance(self._solver, Optimize):
+            self.select_logics(
+                initial_values=heuristic is not None or initial_solution is not None
+            )
+
+        # seed the solver with a greedy schedule
+        if heuristic is not None and not self.time_windows_infeasible:
+            self.add_heuristic_solution(heuristic)
+
+        # warm start from a previous solution
+        if initial_solution is not None:
+            self.set_initial_solution(initial_solution)
+
+    def set_solver_parameters(self) -> None:
+        """Set the seeds, timeout, unsat core and threads parameters to the
+        solver"""
+        # the QF_IDL solver is not the smt kernel, it rejects the smt parameters
+        prefix = "" if self.logics == "QF_IDL" else "smt."
+        if self.random_values:
+            self._solver.set("random_seed", random.randint(1, 1e3))
+            self._solver.set(f"{prefix}random_seed", random.randint(1, 1e3))
+            self._solver.set(f"{prefix}arith.random_initial_value", True)
+        else:
+            self._solver.set("random_seed", 0)
+            self._solver.set(f"{prefix}random_seed", 0)
+            self._solver.set(f"{prefix}arith.random_initial_value", False)
+
+        # set timeout
+        if self.max_time != "inf":
+            self._solver.set("timeout", int(self.max_time * 1000))  # in milliseconds
+
+        # the Optimize solver does not accept the unsat_core parameter
+        if self.debug and not isinstance(self._solver, Optimize):
+            self._solver.set(unsat_core=True)
+
+        if self.parallel:
+            # enable parallel computation
+            self._solver.set("threads", multiprocessing.cpu_count())
+
+    def select_logics(self, initial_values: Optional[bool] = False) -> Optional[str]:
+        """Select the most specific logics the assertions belong to, see the
+        logics module, and move the assertions to a solver for this logics.
+        Difference logics solvers are much faster on scheduling problems
+        that only compare task starts and ends.
+        initial_values: True if initial values are given to the solver, the
+        QF_IDL solver does not accept them, QF_LIA is used instead
+        """
+        self._select_logics = True
+        self.logics = get_logics(self._solver.assertions())
+        if self.logics == "QF_IDL" and initial_values:
+            self.logics = "QF_LIA"
+        print("Logics selection:\n===========")
+        if self.logics is None:
+            print("\t-> Standard SAT/SMT solver")
+        else:
+            self._rebuild_solver()
+            print("\t-> SMT solver using logics", self.logics)
+        return self.logics
+
+    def _rebuild_solver(self) -> None:
+        """Create a solver for the current logics and add all the assertions"""
+        assertions = self._solver.assertions()
+        if self.logics is None:
+            self._solver = Solver(ctx=assertions.ctx)
+        else:
+            self._solver = SolverFor(self.logics, ctx=assertions.ctx)
+        self.set_solver_parameters()
+        self._solver.add(assertions)
+
+    def append_z3_assertion(self, asst) -> None:
+        # a new assertion may not belong to the selected logics, e.g. a
+        # sum of durations added to a difference logics problem
+        if self._select_logics and not belong_to_logics(
+            asst if isinstance(asst, list) else [asst], self.logics
+        ):
+            self._solver.add(asst)
+            self.logics = get_logics(self._solver.assertions())
+            self._rebuild_solver()
+            print("Logics selection:\n===========")
+            if self.logics is None:
+                print("\t-> Switched to the standard SAT/SMT solver")
+            else:
+                print("\t-> Switched to logics", self.logics)
+            return
         # set the method to use to add constraints
         # in debug mode this is assert_and_track, to be able to trace
         # unsat core, in regular mode this is the add function
@@ -266,10 +421,609 @@ class SchedulingSolver:
         else:
             self._solver.add(asst)
 
+    def add_pairwise_resource_assertions(self, resource) -> None:
+        """Prevent the busy intervals of a resource from overlapping: one
+        disjunction for each pair of intervals, i.e. n(n-1)/2 assertions."""
+        busy_intervals = resource.get_busy_intervals()
+        nb_intervals = len(busy_intervals)
+        for i in range(nb_intervals):
+            start_task_i, end_task_i = busy_intervals[i]
+            for k in range(i + 1, nb_intervals):
+                start_task_k, end_task_k = busy_intervals[k]
+                self.append_z3_assertion(
+                    Or(start_task_k >= end_task_i, start_task_i >= end_task_k)
+                )
+
+    def add_cumulative_resource_assertions(self, resource) -> None:
+        """Prevent more than resource.size busy intervals of a native
+        cumulative worker from overlapping.
+
+        If the problem horizon is defined and smaller than the number of busy
+        intervals, the busy intervals in progress are counted at each time
+        point 0, 1, ..., horizon-1. Otherwise they are counted at each busy
+        interval start, the only instants where their number increases: n
+        sums of n terms. The redundant energy bound, the busy time cannot
+        exceed size times the horizon, helps the solver to prove lower bounds
+        on the makespan.
+        """
+        busy_intervals = resource.get_busy_intervals()
+        if len(busy_intervals) <= resource.size:
+            return
+        self.append_z3_assertion(
+            Sum([end - start for start, end in busy_intervals])
+            <= resource.size * self.problem.horizon
+        )
+        horizon = self.problem.horizon_defined_value
+        if horizon is not None and horizon < len(busy_intervals):
+            time_points = range(horizon)
+        else:
+            time_points = [start for start, _ in busy_intervals]
+        for time_point in time_points:
+            in_progress = [
+                (And(start <= time_point, time_point < end), 1)
+                for start, end in busy_intervals
+            ]
+            self.append_z3_assertion(PbLe(in_progress, resource.size))
+
+    def add_time_indexed_resource_assertions(self, resource) -> None:
+        """Prevent the busy intervals of a resource from overlapping using a
+        time-indexed formulation.
+
+        A busy interval synced with a mandatory FixedDurationTask occupies the
+        unit time slots start, start+1, ..., start+duration-1. All these slots
+        must be distinct, which is expressed by one single Distinct assertion
+        with one term per slot: its size grows with the sum of the durations,
+        not with the number of tasks. It is an alternative to the pairwise
+        encoding for short tasks, not a scalable encoding. The remaining busy
+        intervals (dynamic resources, selected workers, variable or zero
+        duration tasks) fall back to the pairwise encoding.
+        """
+        time_slots = []
+        synced_intervals = []
+        other_intervals = []
+        for task, busy_interval in resource.busy_intervals.items():
+            if (
+                isinstance(task, FixedDurationTask)
+                and not task.optional
+                and resource in task.synced_resources
+            ):
+                start = busy_interval[0]
+                time_slots.extend(
+                    start + k if k > 0 else start
+                    for k in range(task.duration_defined_value)
+                )
+                synced_intervals.append(busy_interval)
+            else:
+                other_intervals.append(busy_interval)
+        if len(time_slots) > 1:
+            self.append_z3_assertion(Distinct(time_slots))
+        # intervals that can't be time indexed must not overlap with any other
+        for i, (start_task_i, end_task_i) in enumerate(other_intervals):
+            for start_task_k, end_task_k in other_intervals[i + 1 :] + synced_intervals:
+                self.append_z3_assertion(
+                    Or(start_task_k >= end_task_i, start_task_i >= end_task_k)
+                )
+
+    def add_time_window_assertions(self) -> None:
+        """Compute the earliest and latest start of each mandatory task from
+        precedences, start/end constraints, durations and horizon. Bounds that
+        are tighter than the ones directly stated are added to the solver."""
+        init_time = time.perf_counter()
+        graph = build_time_window_graph(
+            self.problem_context.tasks,
+            self.problem_context.constraints,
+            self.problem.horizon_defined_value,
+        )
+        self.time_windows = propagate_time_windows(graph)
+        propagation_time = time.perf_counter() - init_time
+        if self.time_windows is None:
+            self.time_windows_infeasible = True
+            print(
+                f"\tTime window propagation: positive cycle found in {propagation_time:.2f}s"
+            )
+            return
+        for task, (earliest_start, latest_start) in self.time_windows.items():
+            direct_lower_bound, direct_upper_bound = graph.direct_bounds[
+                graph.nodes[task]
+            ]
+            if earliest_start is not None and (
+                direct_lower_bound is None or earliest_start > direct_lower_bound
+            ):
+                self.append_z3_assertion(task.start >= earliest_start)
+            if latest_start is not None and (
+                direct_upper_bound is None or latest_start < direct_upper_bound
+            ):
+                self.append_z3_assertion(task.start <= latest_start)
+
+    def _add_buffer_bounds_assertions(self, buffer) -> None:
+        """Bound the buffer states"""
+        # the first buffer state is equal to the buffer initial level
+        if buffer.initial_state is not None:
+            self.append_z3_assertion(buffer.buffer_states[0] == buffer.initial_state)
+        if buffer.lower_bound is not None:
+            for st in buffer.buffer_states:
+                self.append_z3_assertion(st >= buffer.lower_bound)
+        if buffer.upper_bound is not None:
+            for st in buffer.buffer_states:
+                self.append_z3_assertion(st <= buffer.upper_bound)
+
+    def add_buffer_events_assertions(self, buffer) -> None:
+        """Compute the buffer state after each event, i.e. each time a task
+        loads or unloads the buffer: it is the initial state plus the
+        quantities of all the events that occur before. Events do not need
+        to be sorted, and only linear integer arithmetic is used."""
+        z3_context = self.problem_context.z3_context
+        # a task that unloads the buffer changes its state at the task start,
+        # a task that loads the buffer changes its state at the task end
+        event_times = [t.start for t in buffer.unloading_tasks] + [
+            t.end for t in buffer.loading_tasks
+        ]
+        quantities = [-q for q in buffer.unloading_tasks.values()] + list(
+            buffer.loading_tasks.values()
+        )
+        # the buffer cannot be accessed by two tasks at the same time
+        if len(event_times) > 1:
+            self.append_z3_assertion(Distinct(event_times))
+        buffer.state_changes_time = event_times
+        # the initial state, then the state after each event
+        buffer.buffer_states = [
+            Int(f"{buffer.name}_state_{k}", z3_context)
+            for k in range(len(event_times) + 1)
+        ]
+        for j, event_time in enumerate(event_times):
+            self.append_z3_assertion(
+                buffer.buffer_states[j + 1]
+                == buffer.buffer_states[0]
+                + Sum(
+                    [
+                        If(other_event_time <= event_time, quantity, 0)
+                        for other_event_time, quantity in zip(event_times, quantities)
+                    ]
+                )
+            )
+        self._add_buffer_bounds_assertions(buffer)
+        if buffer.final_state is not None:
+            self.append_z3_assertion(
+                buffer.buffer_states[0] + sum(quantities) == buffer.final_state
+            )
+
+    def add_buffer_array_assertions(self, buffer) -> None:
+        """Compute the buffer states from the sorted event times, using an
+        array that maps event times to quantities"""
+        z3_context = self.problem_context.z3_context
+        # create an array that stores the mapping between start times and
+        # quantities. For example, if a task T1 starts at 2 and unloads
+        # 8, and T3 ends at 6 and loads 5 then the mapping array
+        # will look like : A[2]=-8 and A[6]=5
+        buffer_mapping = Array(
+            f"Buffer_{buffer.name}_mapping",
+            IntSort(z3_context),
+            IntSort(z3_context),
+        )
+        for t in buffer.unloading_tasks:
+            self.append_z3_assertion(
+                buffer_mapping
+                == Store(buffer_mapping, t.start, -buffer.unloading_tasks[t])
+            )
+        for t in buffer.loading_tasks:
+            self.append_z3_assertion(
+                buffer_mapping == Store(buffer_mapping, t.end, +buffer.loading_tasks[t])
+            )
+        # sort consume/feed times in asc order
+        tasks_start_unload = [t.start for t in buffer.unloading_tasks]
+        tasks_end_load = [t.end for t in buffer.loading_tasks]
+
+        sorted_times, sort_assertions = sort_no_duplicates(
+            tasks_start_unload + tasks_end_load, self.sort_method
+        )
+        self.append_z3_assertion(sort_assertions)
+        # create as many buffer state changes as sorted_times
+        buffer.state_changes_time = [
+            Int(f"{buffer.name}_sc_time_{k}", z3_context)
+            for k in range(len(sorted_times))
+        ]
+
+        # add the constraints that give the buffer state change times
+        for st, bfst in zip(sorted_times, buffer.state_changes_time):
+            self.append_z3_assertion(st == bfst)
+
+        # compute the different buffer states according to state changes
+        buffer.buffer_states = [
+            Int(f"{buffer.name}_state_{k}", z3_context)
+            for k in range(len(buffer.state_changes_time) + 1)
+        ]
+        self._add_buffer_bounds_assertions(buffer)
+        if buffer.final_state is not None:
+            self.append_z3_assertion(buffer.buffer_states[-1] == buffer.final_state)
+        # and, for the other, the buffer state i+1 is the buffer state i +/- the buffer change
+        for i in range(len(buffer.buffer_states) - 1):
+            self.append_z3_assertion(
+                buffer.buffer_states[i + 1]
+                == buffer.buffer_states[i]
+                + buffer_mapping[buffer.state_changes_time[i]]
+            )
+
+    def add_symmetry_breaking_assertions(self) -> None:
+        """Remove the symmetric schedules, that only differ by a permutation
+        of identical tasks or identical workers, see the symmetry module.
+
+        Identical tasks start in the order they were created, one after the
+        other if they are processed by the same worker. Identical workers are
+        first selected in their order: a worker can only be selected by a task
+        if the previous one is selected by the same task or by a task created
+        before. The assertions of each group are guarded by their own literal,
+        so that independent groups do not share any variable, and retracted as
+        soon as the problem is modified."""
+        groups_assertions = []
+        task_groups = find_identical_tasks(self.problem_context)
+        for tasks in task_groups:
+            # identical tasks synced with a worker cannot overlap
+            if tasks[0].synced_resources:
+                groups_assertions.append(
+                    [tasks[i].end <= tasks[i + 1].start for i in range(len(tasks) - 1)]
+                )
+            else:
+                groups_assertions.append(
+                    [
+                        tasks[i].start <= tasks[i + 1].start
+                        for i in range(len(tasks) - 1)
+                    ]
+                )
+        worker_groups = find_identical_workers(self.problem_context)
+        for group_number, (workers, group_select_workers) in enumerate(worker_groups):
+            assertions = []
+            # one row per SelectWorkers instance, in the task order
+            rows = [
+                select_workers.selection_dict for select_workers in group_select_workers
+            ]
+            for j in range(len(workers) - 1):
+                # selected_before is True if the worker j is selected by
+                # the row or by a previous row
+                selected_before = None
+                for i, selection_dict in enumerate(rows):
+                    selected = selection_dict[workers[j]]
+                    if selected_before is None:
+                        selected_before = selected
+                    else:
+                        previous_selected_before = selected_before
+                        selected_before = Bool(
+                            f"SymmetrySelected_{group_number}_{j}_{i}", self._solver.ctx
+                        )
+                        assertions.append(
+                            selected_before == Or(previous_selected_before, selected)
+                        )
+                    assertions.append(
+                        Implies(selection_dict[workers[j + 1]], selected_before)
+                    )
+            groups_assertions.append(assertions)
+        print("Symmetry breaking:\n===========")
+        print(
+            f"\t{len(task_groups)} groups of identical tasks, {len(worker_groups)} groups of identical workers"
+        )
+        self._symmetry_guards = [
+            self.add_guarded_assertion(And(assertions))
+            for assertions in groups_assertions
+            if assertions
+        ]
+
+    def add_heuristic_solution(self, scheme: str) -> None:
+        """Build a schedule with a greedy schedule generation scheme, see the
+        heuristic module. The schedule is checked by the solver under an
+        assumption. Its objective value is then asserted as a bound, so that
+        the solver only looks for schedules at least as good, and task starts
+        are given to the solver as initial values."""
+        init_time = time.perf_counter()
+        greedy_scheduler = GreedyScheduler(self.problem)
+        schedule = greedy_scheduler.schedule(scheme)
+        heuristic_time = time.perf_counter() - init_time
+        print(f"Greedy heuristic ({scheme}):\n===========")
+        if schedule is None:
+            print(f"\tNo schedule found in {heuristic_time:.2f}s")
+            return
+
+        fixed_values = []
+        makespan = 0
+        for task, (start, workers) in schedule.items():
+            end = start + greedy_scheduler.durations[task]
+            makespan = max(makespan, end)
+            fixed_values.extend([task.start == start, task.end == end])
+            for select_workers in task.select_workers:
+                for worker, selected in select_workers.selection_dict.items():
+                    fixed_values.append(selected == (worker in workers))
+        fixed_values.append(self.problem.horizon == makespan)
+
+        # the greedy schedule may not be the symmetric one the solver expects,
+        # its objective value is the same
+        symmetry_guard_ids = {id(guard) for guard in self._symmetry_guards}
+        active_guards = [
+            guard
+            for guard in self.get_active_guards()
+            if id(guard) not in symmetry_guard_ids
+        ]
+        replay_guard = self.add_guarded_assertion(And(fixed_values))
+        sat_result = self._solver.check(replay_guard, *active_guards)
+        if sat_result != sat:
+            self.retract_guarded_assertion(replay_guard)
+            print(f"\tSchedule rejected by the solver: {sat_result}")
+            return
+        model = self._solver.model()
+        self.retract_guarded_assertion(replay_guard)
+        self.heuristic_solution = self.build_solution(model)
+        print(f"\tSchedule found in {heuristic_time:.2f}s, horizon {makespan}")
+
+        # the bound is retracted as soon as the problem is modified
+        if self.objective is not None:
+            value = model.eval(self.objective.target).as_long()
+            if isinstance(self.objective, MinimizeObjective):
+                bound = self.objective.target <= value
+            else:
+                bound = self.objective.target >= value
+            self._heuristic_bound_guard = self.add_guarded_assertion(bound)
+            print(f"\tObjective bound: {value}")
+
+        # phase hints, not available in older z3 versions
+        if self._accepts_initial_values():
+            for task, (start, _) in schedule.items():
+                self._solver.set_initial_value(task.start, start)
+
+    def set_initial_solution(
+        self, initial_solution: Union[SchedulingSolution, str]
+    ) -> int:
+        """Give the task starts, durations and worker selections of a previous
+        solution to the solver as initial values, so that it first looks for
+        solutions close to this one. Tasks and workers are matched by name,
+        those missing from the previous solution are ignored.
+        initial_solution: a SchedulingSolution, a json string or the name of
+        a json file exported from a solution.
+        If the QF_IDL logics was selected from the assertions, the solver is
+        rebuilt for QF_LIA, which accepts initial values.
+        Return the number of initial values.
+        """
+        if isinstance(initial_solution, SchedulingSolution):
+            horizon = initial_solution.horizon
+            tasks_solutions = {
+                name: vars(task_solution)
+                for name, task_solution in initial_solution.tasks.items()
+            }
+        elif isinstance(initial_solution, str):
+            if not initial_solution.lstrip().startswith("{"):
+                with open(initial_solution, "r", encoding="utf-8") as json_file:
+                    initial_solution = json_file.read()
+            solution_dict = json.loads(initial_solution)
+            horizon = solution_dict["horizon"]
+            tasks_solutions = solution_dict["tasks"]
+        else:
+            raise TypeError(
+                "initial_solution must be a SchedulingSolution, a json string or a json filename"
+            )
+
+        # the QF_IDL solver does not accept initial values, fall back to
+        # QF_LIA if it was selected from the assertions
+        if self._select_logics and self.logics == "QF_IDL":
+            self.logics = "QF_LIA"
+            self._rebuild_solver()
+            print("Logics selection:\n===========")
+            print("\t-> Switched to logics QF_LIA for initial values")
+
+        if not self._accepts_initial_values():
+            warnings.warn("this solver does not support initial values")
+            return 0
+
+        initial_values = [(self.problem.horizon, horizon)]
+        for task in self.problem_context.tasks:
+            if task.name not in tasks_solutions:
+                continue
+            task_solution = tasks_solutions[task.name]
+            initial_values.extend(
+                [
+                    (task.start, task_solution["start"]),
+                    (task.end, task_solution["end"]),
+                ]
+            )
+            # the duration of mandatory fixed duration tasks is a constant
+            if not is_int_value(task.duration):
+                initial_values.append((task.duration, task_solution["duration"]))
+            if task.optional:
+                initial_values.append((task.scheduled, task_solution["scheduled"]))
+            assigned_resources = task_solution["assigned_resources"]
+            for select_workers in task.select_workers:
+                for worker, selected in select_workers.selection_dict.items():
+                    # workers of a cumulative worker are not named in solutions
+                    if "_CumulativeWorker_" in worker.name:
+                        continue
+                    initial_values.append((selected, worker.name in assigned_resources))
+
+        for variable, value in initial_values:
+            self._solver.set_initial_value(variable, value)
+        print(f"\tWarm start: {len(initial_values)} initial values")
+        return len(initial_values)
+
+    def _accepts_initial_values(self) -> bool:
+        """Initial values are only supported by the smt kernel of recent z3
+        versions, not by the QF_IDL solver"""
+        return hasattr(self._solver, "set_initial_value") and self.logics != "QF_IDL"
+
+    def add_guarded_assertion(self, asst: BoolRef) -> BoolRef:
+        """Add an assertion that only applies when the returned literal is
+        passed to check_sat as an assumption. Unlike push/pop scopes, the solver
+        keeps the clauses it learnt. The assertion is retracted for good by
+        calling retract_guarded_assertion with the literal."""
+        self._nb_guards += 1
+        guard = Bool(f"Guard_{self._nb_guards}", self._solver.ctx)
+        self.append_z3_assertion(Implies(guard, asst))
+        return guard
+
+    def retract_guarded_assertion(self, guard: BoolRef) -> None:
+        """Definitely disable a guarded assertion. The related clause is then
+        satisfied and removed by the solver simplifier."""
+        self.append_z3_assertion(Not(guard))
+
+    def get_active_guards(self) -> List[BoolRef]:
+        """Return the guard literals that must hold for each check, i.e. the
+        ones of the tasks, constraints and resource assignments added to the
+        live solver, the one of the heuristic objective bound and the ones of
+        the symmetry breaking assertions."""
+        active_guards = list(self._live_guards.values())
+        if self._heuristic_bound_guard is not None:
+            active_guards.append(self._heuristic_bound_guard)
+        active_guards.extend(self._symmetry_guards)
+        return active_guards
+
+    #
+    # Live modifications
+    #
+    def _retract_problem_guards(self) -> None:
+        """The heuristic bound and the symmetries may not hold for the
+        modified problem"""
+        if self._heuristic_bound_guard is not None:
+            self.retract_guarded_assertion(self._heuristic_bound_guard)
+            self._heuristic_bound_guard = None
+        for symmetry_guard in self._symmetry_guards:
+            self.retract_guarded_assertion(symmetry_guard)
+        self._symmetry_guards = []
+
+    def _add_live_guard(self, key, assertions: List[BoolRef]) -> None:
+        """Add the assertions under a single guard, stored in the live guards"""
+        self._retract_problem_guards()
+        self._live_guards[key] = self.add_guarded_assertion(And(assertions))
+
+    def _retract_live_guard(self, key) -> None:
+        self._retract_problem_guards()
+        self.retract_guarded_assertion(self._live_guards.pop(key))
+
+    def _get_busy_interval_assertions(self, task, workers) -> List[BoolRef]:
+        """Return the assertions that prevent the busy intervals of a task from
+        overlapping the other busy intervals and the unavailabilities of the
+        workers"""
+        assertions = []
+        for worker in workers:
+            if isinstance(worker, CumulativeWorker):
+                raise ValueError(
+                    f"CumulativeWorker {worker.name} has a native encoding, it is not supported by live modifications"
+                )
+            start_task_i, end_task_i = worker.busy_intervals[task]
+            for other_task, busy_interval in worker.busy_intervals.items():
+                if other_task is task or other_task not in self._solver_tasks:
+                    continue
+                start_task_k, end_task_k = busy_interval
+                assertions.append(
+                    Or(start_task_k >= end_task_i, start_task_i >= end_task_k)
+                )
+            for constraint in self.problem_context.get_constraints_by_type(
+                ResourceUnavailable
+            ):
+                if constraint not in self._solver_constraints:
+                    continue
+                if isinstance(constraint.resource, CumulativeWorker):
+                    unavailable_workers = constraint.resource.get_workers()
+                else:
+                    unavailable_workers = [constraint.resource]
+                if worker not in unavailable_workers:
+                    continue
+                for lower_bound, upper_bound in constraint.list_of_time_intervals:
+                    assertion = Xor(
+                        start_task_i >= upper_bound, end_task_i <= lower_bound
+                    )
+                    # removed along with the constraint
+                    if constraint in self._live_guards:
+                        assertion = Implies(self._live_guards[constraint], assertion)
+                    assertions.append(assertion)
+        return assertions
+
+    def add_task(self, task) -> None:
+        """Add a task to the live solver, without rebuilding it. The task, its
+        required resources and its busy intervals only apply until the task is
+        removed by the remove_task method. Note that indicators and objectives
+        are not updated."""
+        if task in self._solver_tasks:
+            raise ValueError(f"task {task.name} already added to the solver")
+        if self.problem_context.get_task_by_name(task.name) is not task:
+            self.problem_context.add_task(task)
+        self._solver_tasks.add(task)
+        assertions = task.get_z3_assertions() + [task.end <= self.problem.horizon]
+        assertions.extend(
+            self._get_busy_interval_assertions(task, task.required_resources)
+        )
+        self._add_live_guard(task, assertions)
+
+    def remove_task(self, task) -> None:
+        """Remove a task added by the add_task method"""
+        if task not in self._live_guards:
+            raise ValueError(f"task {task.name} was not added by add_task")
+        for assignment in list(self._live_assignments):
+            if assignment[0] is task:
+                self.remove_required_resource(task, assignment[1])
+        self._retract_live_guard(task)
+        self._solver_tasks.remove(task)
+        self.problem_context.remove_task(task)
+        for worker in task.required_resources:
+            worker.busy_intervals.pop(task, None)
+
+    def add_constraint(self, constraint) -> None:
+        """Add a constraint to the live solver, without rebuilding it. The
+        constraint applies until it is removed by the remove_constraint
+        method."""
+        if constraint in self._solver_constraints:
+            raise ValueError(
+                f"constraint {constraint.name} already added to the solver"
+            )
+        if not self.problem_context.has_constraint(constraint):
+            self.problem_context.add_constraint(constraint)
+        self._solver_constraints.add(constraint)
+        self._add_live_guard(constraint, constraint.get_z3_assertions())
+
+    def remove_constraint(self, constraint) -> None:
+        """Remove a constraint added by the add_constraint method"""
+        if constraint not in self._live_guards:
+            raise ValueError(
+                f"constraint {constraint.name} was not added by add_constraint"
+            )
+        self._retract_live_guard(constraint)
+        self._solver_constraints.remove(constraint)
+        self.problem_context.remove_constraint(constraint)
+
+    def add_required_resource(self, task, resource, dynamic=False) -> None:
+        """Add a required resource to a task of the live solver, see
+        Task.add_required_resource. The assignment applies until it is removed
+        by the remove_required_resource method."""
+        if task not in self._solver_tasks:
+            raise ValueError(f"task {task.name} is not part of the solver")
+        if isinstance(resource, CumulativeWorker) and resource.encoding == "native":
+            raise ValueError(
+                f"CumulativeWorker {resource.name} has a native encoding, it is not supported by live modifications"
+            )
+        nb_assertions = len(task.get_z3_assertions())
+        nb_required_resources = len(task.required_resources)
+        nb_select_workers = len(task.select_workers)
+        task.add_required_resource(resource, dynamic)
+        workers = task.required_resources[nb_required_resources:]
+        select_workers = task.select_workers[nb_select_workers:]
+        assertions = task.get_z3_assertions()[nb_assertions:]
+        assertions.extend(self._get_busy_interval_assertions(task, workers))
+        self._live_assignments[(task, resource)] = (workers, select_workers)
+        self._add_live_guard((task, resource), assertions)
+
+    def remove_required_resource(self, task, resource) -> None:
+        """Remove a resource added by the add_required_resource method"""
+        if (task, resource) not in self._live_guards:
+            raise ValueError(
+                f"resource {resource.name} was not added to task {task.name} by add_required_resource"
+            )
+        self._retract_live_guard((task, resource))
+        task.required_resources_names.remove(resource.name)
+        workers, select_workers = self._live_assignments.pop((task, resource))
+        for worker in workers:
+            worker.busy_intervals.pop(task, None)
+            task.required_resources.remove(worker)
+            if worker in task.synced_resources:
+                task.synced_resources.remove(worker)
+        for removed_select_workers in select_workers:
+            task.select_workers.remove(removed_select_workers)
+
     def build_equivalent_weighted_objective(self) -> bool:
         # Replace objectives O_i, O_j, O_k with
         # O = WiOi+WjOj+WkOk etc.
-        equivalent_single_objective = Int("EquivalentSingleObjective")
+        equivalent_single_objective = Int("EquivalentSingleObjective", self._solver.ctx)
         weighted_objectives = []
         for obj in self.problem_context.objectives:
             variable_to_optimize = obj.target
@@ -296,7 +1050,7 @@ class SchedulingSolver:
         """create optimization objectives"""
         # in case of a single value to optimize
         if self.is_multi_objective_optimization_problem:
-            if self.optimizer == "incremental" or self.optimize_priority == "weight":
+            if self.optimizer != "optimize" or self.optimize_priority == "weight":
                 eq_obj, _ = self.build_equivalent_weighted_objective()
                 if self.optimizer == "optimize":
                     self._solver.minimize(eq_obj.target)
@@ -316,16 +1070,23 @@ class SchedulingSolver:
                 else:
                     self._solver.minimize(variable_to_optimize)
 
-    def check_sat(self, find_better_value: Optional[bool] = False):
+    def check_sat(
+        self,
+        find_better_value: Optional[bool] = False,
+        assumptions: Optional[List[BoolRef]] = None,
+    ):
         """check satisfiability.
         find_beter_value: the check_sat method is called from the incremental solver. Then we
         should not prompt that no solution can be found, but that no better solution can be found.
+        assumptions: a list of boolean literals assumed to be True for this check only.
         Return
         * result as True (sat) or False (unsat, unknown).
         * the computation time.
         """
+        if assumptions is None:
+            assumptions = []
         init_time = time.perf_counter()
-        sat_result = self._solver.check()
+        sat_result = self._solver.check(*assumptions, *self.get_active_guards())
         check_sat_time = time.perf_counter() - init_time
 
         if sat_result == unsat:
@@ -350,93 +1111,126 @@ class SchedulingSolver:
         """create and return a SchedulingSolution instance"""
         solution = SchedulingSolution(self.problem)
 
+        native_cumulative_workers = [
+            cumulative_worker
+            for cumulative_worker in self.problem.context.cumulative_workers
+            if cumulative_worker.encoding == "native"
+        ]
+        resources = self.problem.context.resources + native_cumulative_workers
+
+        # read the values of all the variables at once, in the order they are
+        # processed below
+        variables = [self.problem.horizon]
+        for task in self.problem.context.tasks:
+            variables.extend([task.start, task.end, task.duration])
+            if task.optional:
+                variables.append(task.scheduled)
+            variables.extend(
+                req_res.busy_intervals[task][0] for req_res in task.required_resources
+            )
+        for resource in resources:
+            for busy_interval in resource.busy_intervals.values():
+                variables.extend(busy_interval)
+        for buffer in self.problem.context.buffers:
+            variables.extend(buffer.state_changes_time)
+            variables.extend(buffer.buffer_states)
+        for indicator in self.problem.context.indicators:
+            variables.append(indicator.indicator_variable)
+        values = iter(get_model_values(z3_sol, variables))
+
         # set the horizon solution
-        solution.horizon = z3_sol[self.problem.horizon].as_long()
+        solution.horizon = next(values)
 
         # process tasks
+        task_names, task_types, starts, ends, durations = [], [], [], [], []
+        optional, scheduled, task_resources = [], [], []
         for task in self.problem.context.tasks:
-            # for each task, create a TaskSolution instance
-            new_task_solution = TaskSolution(task.name)
-            new_task_solution.type = type(task).__name__
-            new_task_solution.start = z3_sol[task.start].as_long()
-            new_task_solution.end = z3_sol[task.end].as_long()
-            new_task_solution.duration = z3_sol[task.duration].as_long()
-            new_task_solution.optional = task.optional
-
-            # times, if ever delta_time and start_time are defined
-            if self.problem.delta_time is not None:
-                new_task_solution.duration_time = (
-                    new_task_solution.duration * self.problem.delta_time
-                )
-                if self.problem.start_time is not None:
-                    new_task_solution.start_time = (
-                        self.problem.start_time
-                        + new_task_solution.start * self.problem.delta_time
-                    )
-                else:
-                    new_task_solution.start_time = (
-                        new_task_solution.start * self.problem.delta_time
-                    )
-                new_task_solution.end_time = (
-                    new_task_solution.start_time + new_task_solution.duration_time
-                )
-            if task.optional:
-                # ugly hack, necessary because there's no as_bool()
-                # method for Bool objects
-                new_task_solution.scheduled = f"{z3_sol[task.scheduled]}" == "True"
-            else:
-                new_task_solution.scheduled = True
+            task_names.append(task.name)
+            task_types.append(type(task).__name__)
+            starts.append(next(values))
+            ends.append(next(values))
+            durations.append(next(values))
+            optional.append(task.optional)
+            scheduled.append(next(values) if task.optional else True)
 
             # process resource assignments
+            assigned_resources = []
             for req_res in task.required_resources:
                 # among those workers, some of them
                 # are busy "in the past", that is to say they
                 # should not be assigned to the related task
                 # for each interval
-                lower_bound, _ = req_res.busy_intervals[task]
-                resource_is_assigned = z3_sol[lower_bound].as_long() >= 0
+                resource_is_assigned = next(values) >= 0
                 # add this resource to assigned resources, anytime
-                if resource_is_assigned and (
-                    req_res.name not in new_task_solution.assigned_resources
-                ):
+                if resource_is_assigned:
                     # if it is a cumulative resource, then we transform the resource name
                     resource_name = req_res.name.split("_CumulativeWorker_")[0]
-                    if resource_name not in new_task_solution.assigned_resources:
-                        new_task_solution.assigned_resources.append(resource_name)
-
-            solution.add_task_solution(new_task_solution)
+                    if resource_name not in assigned_resources:
+                        assigned_resources.append(resource_name)
+            task_resources.append(assigned_resources)
 
         # process resources
-        for resource in self.problem.context.resources:
-            # for each task, create a TaskSolution instance
+        # the assignments of each resource, along with the set of assignments
+        # used to remove duplicates
+        resource_types = {}
+        resource_assignments = {}
+        for resource in resources:
             # for cumulative workers, we append the current work
-            if "_CumulativeWorker_" in resource.name:
-                cumulative_worker_name = resource.name.split("_CumulativeWorker_")[0]
-                if cumulative_worker_name not in solution.resources:
-                    new_resource_solution = ResourceSolution(cumulative_worker_name)
-                else:
-                    new_resource_solution = solution.resources[cumulative_worker_name]
-            else:
-                new_resource_solution = ResourceSolution(resource.name)
-            new_resource_solution.type = type(resource).__name__
+            resource_name = resource.name.split("_CumulativeWorker_")[0]
+            if resource_name not in resource_assignments:
+                resource_types[resource_name] = type(resource).__name__
+                resource_assignments[resource_name] = ([], set())
+            assignments, assignments_set = resource_assignments[resource_name]
             # check for task processed by this resource
-            for task in resource.busy_intervals.keys():
-                task_name = task.name
-                st_var, end_var = resource.busy_intervals[task]
-                start = z3_sol[st_var].as_long()
-                end = z3_sol[end_var].as_long()
+            for task in resource.busy_intervals:
+                start = next(values)
+                end = next(values)
                 if (
                     start >= 0
                     and end >= 0
-                    and (task_name, start, end) not in new_resource_solution.assignments
+                    and (task.name, start, end) not in assignments_set
                 ):
-                    new_resource_solution.assignments.append((task_name, start, end))
-
-            if "_CumulativeWorker_" in resource.name:
-                cumulative_worker_name = resource.name.split("_CumulativeWorker_")[0]
-                if cumulative_worker_name not in solution.resources:
-                    solution.add_resource_solution(new_resource_solution)
-            else:
+                    assignments_set.add((task.name, start, end))
+                    assignments.append((task.name, start, end))
+
+        if self.columnar_solution:
+            solution.set_columns(
+                SolutionColumns(
+                    task_names,
+                    task_types,
+                    starts,
+                    ends,
+                    durations,
+                    optional,
+                    scheduled,
+                    task_resources,
+                    list(resource_assignments),
+                    list(resource_types.values()),
+                    [assignments for assignments, _ in resource_assignments.values()],
+                    self.problem.delta_time,
+                    self.problem.start_time,
+                )
+            )
+        else:
+            for i, task_name in enumerate(task_names):
+                # for each task, create a TaskSolution instance
+                new_task_solution = TaskSolution(task_name)
+                new_task_solution.type = task_types[i]
+                new_task_solution.start = starts[i]
+                new_task_solution.end = ends[i]
+                new_task_solution.duration = durations[i]
+                new_task_solution.optional = optional[i]
+                new_task_solution.scheduled = scheduled[i]
+                new_task_solution.assigned_resources = task_resources[i]
+                # times, if ever delta_time and start_time are defined
+                new_task_solution.set_times(
+                    self.problem.delta_time, self.problem.start_time
+                )
+                solution.add_task_solution(new_task_solution)
+            for resource_name, (assignments, _) in resource_assignments.items():
+                new_resource_solution = ResourceSolution(resource_name)
+                new_resource_solution.type = resource_types[resource_name]
+                new_resource_solution.assignments = assignments
                 solution.add_resource_solution(new_resource_solution)
 
         # process buffers
@@ -444,36 +1238,48 @@ class SchedulingSolver:
             buffer_name = buffer.name
             new_buffer_solution = BufferSolution(buffer_name)
             # change_state_times
-            cst_lst = [
-                z3_sol[sct_z3_var].as_long() for sct_z3_var in buffer.state_changes_time
-            ]
-
-            new_buffer_solution.state_change_times = cst_lst
+            cst_lst = [next(values) for _ in buffer.state_changes_time]
             # state values
-            sv_lst = [z3_sol[sv_z3_var].as_long() for sv_z3_var in buffer.buffer_states]
-            new_buffer_solution.state = sv_lst
+            sv_lst = [next(values) for _ in buffer.buffer_states]
+            # with the events encoding, times and states are not sorted
+            sorted_changes = sorted(zip(cst_lst, sv_lst[1:]))
+            new_buffer_solution.state_change_times = [
+                change_time for change_time, _ in sorted_changes
+            ]
+            new_buffer_solution.state = sv_lst[:1] + [
+                state for _, state in sorted_changes
+            ]
 
             solution.add_buffer_solution(new_buffer_solution)
         # process indicators
         for indicator in self.problem.context.indicators:
-            indicator_name = indicator.name
-            indicator_value = z3_sol[indicator.indicator_variable].as_long()
-            solution.add_indicator_solution(indicator_name, indicator_value)
+            solution.add_indicator_solution(indicator.name, next(values))
 
         return solution
 
     def solve(self) -> Union[bool, SchedulingSolution]:
         """call the solver and returns the solution, if ever"""
+        self.optimality_proven = False
         # for all cases
         if self.debug:
             self.print_assertions()
 
-        if self.is_optimization_problem and self.optimizer == "incremental":
+        if self.time_windows_infeasible:
+            print(
+                f"\tNo solution can be found for problem {self.problem.name}.\n\tReason: Unsatisfiable problem: time windows are inconsistent"
+            )
+            return False
+
+        if self.is_optimization_problem and self.optimizer != "optimize":
             if self.is_multi_objective_optimization_problem:
                 print("\tObjectives:\n\t======")
                 for obj in self.problem.context.objectives:
                     print(f"\t{obj}")
-            solution = self.solve_optimize_incremental(
+            if self.optimizer == "incremental":
+                optimize_function = self.solve_optimize_incremental
+            else:
+                optimize_function = self.solve_optimize_bisect
+            solution = optimize_function(
                 self.objective.target,
                 kind="min" if isinstance(self.objective, MinimizeObjective) else "max",
             )
@@ -501,8 +1307,10 @@ class SchedulingSolver:
             if sat_result == unknown:
                 return False
 
-            # then get the solution
+            # then get the solution, the Optimize solver only returns sat for
+            # an optimum
             solution = self._solver.model()
+            self.optimality_proven = True
 
             # print objectives values if optimizer
             if self.optimizer == "optimize":
@@ -542,6 +1350,12 @@ class SchedulingSolver:
                 self.objective.bounds[0] if kind == "min" else self.objective.bounds[1]
             )
 
+        # the literal that guards the bounds, None until a first solution is
+        # found. Bounds only get tighter, so that the same literal guards all
+        # of them: the last one supersedes the previous ones
+        bound_guard = None
+        init_time = time.perf_counter()
+
         while True:  # infinite loop, break if unsat or max_depth
             depth += 1
             if max_recursion_depth is not None and depth > max_recursion_depth:
@@ -553,12 +1367,14 @@ class SchedulingSolver:
             incremantal_solver_is_computing_a_better_value = (
                 current_variable_value is not None
             )
-            is_sat, sat_computation_time = self.check_sat(
-                incremantal_solver_is_computing_a_better_value
+            is_sat, _ = self.check_sat(
+                incremantal_solver_is_computing_a_better_value,
+                [] if bound_guard is None else [bound_guard],
             )
 
             if is_sat == unsat and current_variable_value is not None:
                 print(f"\tFound optimum {current_variable_value}. Stopping iteration.")
+                self.optimality_proven = True
                 break
             if is_sat == unsat:
                 print("\tNo solution found. Stopping iteration.")
@@ -569,7 +1385,8 @@ class SchedulingSolver:
             solution = self._solver.model()
 
             current_variable_value = solution[variable].as_long()
-            total_time += sat_computation_time
+            # the whole iteration time, model extraction included
+            total_time = time.perf_counter() - init_time
             print(
                 f"\tFound value: {current_variable_value} elapsed time:{total_time:.3f}s"
             )
@@ -579,6 +1396,7 @@ class SchedulingSolver:
 
             if bound is not None and current_variable_value == bound:
                 print(f"\tFound optimum {current_variable_value}. Stopping iteration.")
+                self.optimality_proven = True
                 break
 
             # prevent the solver to start a new round if we expect it to be
@@ -596,13 +1414,19 @@ class SchedulingSolver:
                 if self.max_time != "inf" and expected_next_time > self.max_time:
                     warnings.warn("time may exceed max time. Stopping iteration.")
                     break
-            self._solver.push()
             if kind == "min":
-                self.append_z3_assertion(variable < current_variable_value)
+                better_value = variable < current_variable_value
                 print(f"\tChecking better value < {current_variable_value}")
             else:
-                self.append_z3_assertion(variable > current_variable_value)
+                better_value = variable > current_variable_value
                 print(f"\tChecking better value > {current_variable_value}")
+            if bound_guard is None:
+                bound_guard = self.add_guarded_assertion(better_value)
+            else:
+                self.append_z3_assertion(Implies(bound_guard, better_value))
+
+        if bound_guard is not None:
+            self.retract_guarded_assertion(bound_guard)
 
         print(f"\ttotal number of iterations: {depth}")
         if current_variable_value is not None:
@@ -611,6 +1435,326 @@ class SchedulingSolver:
 
         return solution
 
+    def solve_optimize_bisect(
+        self,
+        variable: ArithRef,
+        max_recursion_depth: Optional[int] = None,
+        kind: Optional[str] = "min",
+    ) -> int:
+        """target a min or max for a variable, without the Optimize solver.
+        The search maintains a proven bound and the best value found so far,
+        and probes, under an assumption, the middle of this interval until both are equal. As long as
+        no bound is proven, the distance to the probed value doubles after each
+        improvement (galloping search)."""
+        if kind not in ["min", "max"]:
+            raise ValueError("choose either 'min' or 'max'")
+        # maximizing the variable is minimizing its opposite, bounds below
+        # are related to the minimized value
+        sign = 1 if kind == "min" else -1
+        to_minimize = variable if kind == "min" else -variable
+        comparison = "<=" if kind == "min" else ">="
+        print("Bisection optimizer:\n====================")
+
+        lower_bound = None
+        if self.objective.bounds is not None:
+            bound = (
+                self.objective.bounds[0] if kind == "min" else self.objective.bounds[1]
+            )
+            if bound is not None:
+                lower_bound = sign * bound
+
+        depth = 1
+        is_sat, total_time = self.check_sat()
+        if is_sat != sat:
+            print("\tNo solution found. Stopping iteration.")
+            return False
+        solution = self._solver.model()
+        upper_bound = sign * solution[variable].as_long()
+        print(f"\tFound value: {sign * upper_bound} elapsed time:{total_time:.3f}s")
+
+        step = 1
+        while lower_bound is None or lower_bound < upper_bound:
+            depth += 1
+            if max_recursion_depth is not None and depth > max_recursion_depth:
+                warnings.warn(
+                    "maximum recursion depth exceeded, stop computation but there might be a better solution."
+                )
+                break
+            if self.max_time != "inf" and total_time > self.max_time:
+                warnings.warn("max time exceeded")
+                break
+
+            if lower_bound is None:
+                probed_value = upper_bound - step
+            else:
+                probed_value = (lower_bound + upper_bound - 1) // 2
+            print(f"\tChecking value {comparison} {sign * probed_value}")
+            bound_guard = self.add_guarded_assertion(to_minimize <= probed_value)
+            is_sat, sat_computation_time = self.check_sat(True, [bound_guard])
+            total_time += sat_computation_time
+            if is_sat == sat:
+                solution = self._solver.model()
+                upper_bound = sign * solution[variable].as_long()
+                step *= 2
+            self.retract_guarded_assertion(bound_guard)
+            if is_sat == unsat:
+                lower_bound = probed_value + 1
+            elif is_sat == unknown:
+                break
+
+            if lower_bound is None:
+                print(
+                    f"\tFound value: {sign * upper_bound} elapsed time:{total_time:.3f}s"
+                )
+            else:
+                print(
+                    f"\tFound value: {sign * upper_bound} bound: {sign * lower_bound}"
+                    f" gap: {upper_bound - lower_bound} elapsed time:{total_time:.3f}s"
+                )
+
+        if lower_bound is not None and lower_bound >= upper_bound:
+            print(f"\tFound optimum {sign * upper_bound}. Stopping iteration.")
+            self.optimality_proven = True
+        print(f"\ttotal number of iterations: {depth}")
+        print(f"\tvalue: {sign * upper_bound}")
+        print(f"\t{self.problem.name} satisfiability checked in {total_time:.2f}s")
+
+        return solution
+
+    def solve_portfolio(
+        self,
+        nb_workers: Optional[int] = None,
+        configurations: Optional[List[dict]] = None,
+    ) -> Union[bool, SchedulingSolution]:
+        """solve the problem with a portfolio of solvers running in parallel
+        processes, each one with a different seed, logics, tactic or optimizer.
+        Return the first proven solution, or the best one found before max_time.
+
+        nb_workers: the number of processes, the number of cpus by default
+        configurations: a list of dicts with the optional keys 'seed', 'logics',
+        'tactic' and 'optimizer' ('incremental' or 'optimize'). A tactic can
+        only be used with the 'optimize' optimizer, which is the default
+        for tactics. If nb_workers exceeds the number of configurations,
+        configurations are cycled with a different seed.
+        """
+        from processscheduler.portfolio import (
+            PORTFOLIO_OBJECTIVE_NAME,
+            check_configuration,
+            default_configurations,
+            run_portfolio,
+        )
+
+        if nb_workers is None:
+            nb_workers = (
+                len(configurations)
+                if configurations is not None
+                else multiprocessing.cpu_count()
+            )
+        if not is_strict_positive_integer(nb_workers):
+            raise TypeError("nb_workers must be a strict positive integer")
+        if configurations is None:
+            configurations = default_configurations(nb_workers)
+        elif not configurations:
+            raise ValueError("configurations must not be empty")
+        else:
+            for configuration in configurations:
+                check_configuration(configuration)
+            configurations = [
+                dict(
+                    configurations[i % len(configurations)],
+                    seed=configurations[i % len(configurations)].get("seed", 0)
+                    + i // len(configurations),
+                )
+                for i in range(nb_workers)
+            ]
+
+        # export the model, the objective is bound to a variable with a known name
+        exported_solver = Solver(ctx=self._solver.ctx)
+        exported_solver.add(self._solver.assertions())
+        exported_solver.add(self.get_active_guards())
+        kind = None
+        if self.is_optimization_problem:
+            if self.objective is None:  # z3 Optimize with several objectives
+                self.build_equivalent_weighted_objective()
+            kind = "min" if isinstance(self.objective, MinimizeObjective) else "max"
+            exported_solver.add(
+                Int(PORTFOLIO_OBJECTIVE_NAME, self._solver.ctx) == self.objective.target
+            )
+        smt2 = exported_solver.to_smt2()
+
+        print(f"Portfolio solver:\n=================\n\t{nb_workers} workers")
+        init_time = time.perf_counter()
+        result = run_portfolio(
+            smt2,
+            configurations,
+            None if self.max_time == "inf" else self.max_time,
+            kind,
+        )
+        total_time = time.perf_counter() - init_time
+
+        if result is None or result["status"] != "sat":
+            if result is not None and result["status"] == "unsat":
+                reason = "Unsatisfiable problem: no solution exists"
+            else:
+                reason = "no worker found a solution"
+            print(
+                f"\tNo solution can be found for problem {self.problem.name}.\n\tReason: {reason}"
+            )
+            return False
+
+        print(f"\tWorker {result['worker']}: {configurations[result['worker']]}")
+        if kind is not None:
+            status = "optimum" if result["optimal"] else "value"
+            print(f"\tFound {status}: {result['value']}")
+        print(f"\t{self.problem.name} solved in {total_time:.2f}s")
+
+        result["values"].pop(PORTFOLIO_OBJECTIVE_NAME, None)
+        return self.build_solution_from_values(result["values"])
+
+    def build_solution_from_values(
+        self, values: dict
+    ) -> Union[bool, SchedulingSolution]:
+        """build the solution from the variable values computed elsewhere, for
+        example by another process. Values are replayed on this solver under an
+        assumption, variables missing from values are computed by the solver.
+        Indicator values are not replayed but computed again: they may depend on
+        a horizon that differs from the one of the values, e.g. the horizon of a
+        sub problem."""
+        indicator_names = set(
+            indicator.indicator_variable.decl().name()
+            for indicator in self.problem_context.indicators
+        )
+        fixed_values = []
+        for name, value in values.items():
+            # fresh variables do not exist in this solver
+            if "!" in name or name in indicator_names:
+                continue
+            if isinstance(value, bool):
+                fixed_values.append(Bool(name, self._solver.ctx) == value)
+            else:
+                fixed_values.append(Int(name, self._solver.ctx) == value)
+        replay_guard = self.add_guarded_assertion(And(fixed_values))
+        is_sat, _ = self.check_sat(assumptions=[replay_guard])
+        if is_sat != sat:
+            self.retract_guarded_assertion(replay_guard)
+            return False
+        solution = self._solver.model()
+        self.retract_guarded_assertion(replay_guard)
+
+        self.current_solution = solution
+        return self.build_solution(solution)
+
+    def solve_decomposed(
+        self, nb_workers: Optional[int] = None
+    ) -> Union[bool, SchedulingSolution]:
+        """split the problem into independent sub problems, solve them in
+        parallel processes and merge the solutions.
+
+        Two tasks belong to the same sub problem if they are linked by a
+        resource, a buffer, a constraint, an indicator or any assertion. The
+        horizon is shared: each sub problem gets its own copy, the horizon of
+        the merged solution is the greatest one. For the same reason, the
+        makespan is the only objective that can be decomposed, the solve method
+        is called for any other objective, or if the solutions of the sub
+        problems do not hold under the merged horizon.
+
+        nb_workers: the number of processes, the number of cpus by default
+        """
+        from processscheduler.decomposition import get_connected_components
+        from processscheduler.portfolio import PORTFOLIO_OBJECTIVE_NAME, solve_smt2
+
+        if nb_workers is None:
+            nb_workers = multiprocessing.cpu_count()
+        if not is_strict_positive_integer(nb_workers):
+            raise TypeError("nb_workers must be a strict positive integer")
+
+        horizon_name = self.problem.horizon.decl().name()
+        kind = None
+        if self.is_optimization_problem:
+            if self.is_multi_objective_optimization_problem or not (
+                isinstance(self.objective, MinimizeObjective)
+                and self.objective.target.eq(self.problem.horizon)
+            ):
+                warnings.warn(
+                    "only the makespan objective can be decomposed, solve the whole problem."
+                )
+                return self.solve()
+            kind = "min"
+
+        components = get_connected_components(
+            list(self._solver.assertions()) + self.get_active_guards(), [horizon_name]
+        )
+        print(
+            f"Decomposition:\n==============\n\t{len(components)} independent sub problem(s)"
+        )
+        if len(components) == 1:
+            return self.solve()
+
+        smt2_strings = []
+        for component_assertions, _ in components:
+            exported_solver = Solver(ctx=self._solver.ctx)
+            exported_solver.add(component_assertions)
+            if kind is not None:
+                exported_solver.add(
+                    Int(PORTFOLIO_OBJECTIVE_NAME, self._solver.ctx)
+                    == self.problem.horizon
+                )
+            smt2_strings.append(exported_solver.to_smt2())
+
+        init_time = time.perf_counter()
+        max_time = None if self.max_time == "inf" else self.max_time
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(nb_workers, len(components)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            results = list(
+                executor.map(
+                    solve_smt2,
+                    smt2_strings,
+                    [{}] * len(components),
+                    [max_time] * len(components),
+                    [kind] * len(components),
+                )
+            )
+        total_time = time.perf_counter() - init_time
+
+        values = {}
+        horizon_value = None
+        for i, result in enumerate(results):
+            if result["status"] != "sat":
+                print(
+                    f"\tNo solution can be found for sub problem {i} of problem {self.problem.name}."
+                )
+                return False
+            print(
+                f"\tSub problem {i}: {len(components[i][1])} variables, "
+                f"horizon {result['values'].get(horizon_name)}"
+            )
+            if kind is not None and not result["optimal"]:
+                warnings.warn(
+                    f"max time exceeded, sub problem {i} might have a better solution."
+                )
+            for name, value in result["values"].items():
+                if name == horizon_name:
+                    horizon_value = (
+                        value if horizon_value is None else max(horizon_value, value)
+                    )
+                elif name != PORTFOLIO_OBJECTIVE_NAME:
+                    values[name] = value
+        if horizon_value is not None:
+            values[horizon_name] = horizon_value
+        print(f"\t{self.problem.name} solved in {total_time:.2f}s")
+
+        solution = self.build_solution_from_values(values)
+        if not solution:
+            # the values of the sub problems may not hold under the merged
+            # horizon, if any other assertion depends on the horizon
+            warnings.warn(
+                "the sub problem solutions can't be merged, solve the whole problem."
+            )
+            return self.solve()
+        return solution
+
     def print_assertions(self):
         """A utility method to display solver assertions"""
         print("Assertions:\n===========")
@@ -642,5 +1786,14 @@ class SchedulingSolver:
 
     def export_to_smt2(self, smt_filename: str):
         """export the model to a smt file to be processed by another SMT solver"""
+        active_guards = self.get_active_guards()
+        if active_guards:
+            # the guarded assertions only apply if guards hold
+            exported_solver = Solver(ctx=self._solver.ctx)
+            exported_solver.add(self._solver.assertions())
+            exported_solver.add(active_guards)
+            smt2 = exported_solver.to_smt2()
+        else:
+            smt2 = self._solver.to_smt2()
         with open(smt_filename, "w", encoding="utf-8") as outfile:
-            outfile.write(self._solver.to_smt2())
+            outfile.write(smt2)
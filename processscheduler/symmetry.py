@@ -0,0 +1,221 @@
+"""Detection of identical tasks and workers, used to break symmetries."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from typing import List, Set, Tuple
+
+from z3 import Z3_OP_UNINTERPRETED, ExprRef, is_const
+
+from processscheduler.constraint import ResourceConstraint
+from processscheduler.cost import ConstantCostPerPeriod
+from processscheduler.resource import SelectWorkers, Worker
+from processscheduler.resource_constraint import (
+    ResourceTasksDistance,
+    ResourceUnavailable,
+    WorkLoad,
+)
+from processscheduler.task import FixedDurationTask, Task
+
+# resource constraints that apply the same way to all the busy intervals of
+# a resource, whatever the task
+_TASK_SYMMETRIC_CONSTRAINTS = (WorkLoad, ResourceUnavailable, ResourceTasksDistance)
+
+
+def _get_variable_ids(expressions: List[ExprRef]) -> Set[int]:
+    """Return the ids of the z3 variables the expressions depend on"""
+    variable_ids = set()
+    visited = set()
+    to_visit = list(expressions)
+    while to_visit:
+        expression = to_visit.pop()
+        expression_id = expression.get_id()
+        if expression_id in visited:
+            continue
+        visited.add(expression_id)
+        if is_const(expression):
+            if expression.decl().kind() == Z3_OP_UNINTERPRETED:
+                variable_ids.add(expression_id)
+        else:
+            to_visit.extend(expression.children())
+    return variable_ids
+
+
+def _get_objective_expressions(context) -> List[ExprRef]:
+    return [
+        objective.target
+        for objective in context.objectives
+        if isinstance(objective.target, ExprRef)
+    ]
+
+
+def _get_task_variables(task: Task) -> List[ExprRef]:
+    """The variables of a task, its worker selections and busy intervals"""
+    variables = [task.start, task.end]
+    for worker in task.required_resources:
+        variables.extend(worker.busy_intervals.get(task, ()))
+    for select_workers in task.select_workers:
+        variables.extend(select_workers.selection_dict.values())
+    return variables
+
+
+def _get_task_resources_key(task: Task) -> Tuple:
+    """The resources of a task, in a form that does not depend on the task"""
+    pool_workers = set()
+    select_workers_keys = []
+    for select_workers in task.select_workers:
+        pool_workers.update(select_workers.list_of_workers)
+        select_workers_keys.append(
+            (
+                tuple(id(worker) for worker in select_workers.list_of_workers),
+                select_workers.nb_workers_to_select,
+                select_workers.kind,
+            )
+        )
+    # the other workers are either synced with the task or dynamic
+    workers_keys = [
+        (id(worker), worker in task.synced_resources)
+        for worker in task.required_resources
+        if worker not in pool_workers
+    ]
+    return tuple(sorted(workers_keys)), tuple(sorted(select_workers_keys))
+
+
+def find_identical_tasks(context) -> List[List[Task]]:
+    """Return the groups of at least two identical tasks, in the order they
+    were created.
+
+    Identical tasks are mandatory FixedDurationTasks that have the same
+    duration, priority, work amount and required resources, and that can be
+    swapped in any schedule: no constraint, buffer, user assertion, custom
+    indicator or objective refers to them. Indicators built by the SchedulingProblem
+    methods apply the same way to all the tasks, they do not prevent tasks
+    from being swapped.
+    """
+    expressions = list(context.z3_assertions)
+    for constraint in context.constraints:
+        if not isinstance(constraint, _TASK_SYMMETRIC_CONSTRAINTS):
+            expressions.extend(constraint.get_z3_assertions())
+    for indicator in context.indicators:
+        if not indicator.task_symmetric:
+            expressions.extend(indicator.get_z3_assertions())
+    expressions.extend(_get_objective_expressions(context))
+    pinned_variable_ids = _get_variable_ids(expressions)
+    # the buffer states are computed by the solver from the task times
+    pinned_tasks = set()
+    for buffer in context.buffers:
+        pinned_tasks.update(buffer.loading_tasks)
+        pinned_tasks.update(buffer.unloading_tasks)
+
+    groups = {}
+    for task in context.tasks:
+        if type(task) is not FixedDurationTask or task.optional:
+            continue
+        if task in pinned_tasks:
+            continue
+        # constraints that refer to the task without any assertion
+        if any(
+            not isinstance(constraint, _TASK_SYMMETRIC_CONSTRAINTS)
+            for constraint in context.get_constraints_of_task(task)
+        ):
+            continue
+        task_variable_ids = {
+            variable.get_id() for variable in _get_task_variables(task)
+        }
+        if task_variable_ids & pinned_variable_ids:
+            continue
+        key = (
+            task.duration_defined_value,
+            task.priority,
+            task.work_amount,
+            _get_task_resources_key(task),
+        )
+        groups.setdefault(key, []).append(task)
+    return [
+        sorted(tasks, key=lambda task: task.task_number)
+        for tasks in groups.values()
+        if len(tasks) > 1
+    ]
+
+
+def _get_cost_key(cost) -> Tuple:
+    if cost is None:
+        return (None,)
+    if isinstance(cost, ConstantCostPerPeriod):
+        return (ConstantCostPerPeriod, cost.value)
+    # polynomial costs are compared by identity
+    return (id(cost),)
+
+
+def find_identical_workers(context) -> List[Tuple[List[Worker], List[SelectWorkers]]]:
+    """Return the groups of at least two identical workers, along with the
+    SelectWorkers instances they belong to.
+
+    Identical workers have the same productivity and cost, belong to the same
+    SelectWorkers instances, and can be swapped in any schedule: they are not
+    statically assigned to any task, and no resource constraint, user
+    assertion, indicator or objective refers to them. This includes the
+    individual workers of a CumulativeWorker.
+    """
+    # the SelectWorkers instances and tasks each worker may be selected by
+    select_workers_of_worker = {}
+    pool_tasks_of_worker = {}
+    for task in context.tasks:
+        for select_workers in task.select_workers:
+            for worker in select_workers.list_of_workers:
+                select_workers_of_worker.setdefault(worker, []).append(select_workers)
+                pool_tasks_of_worker.setdefault(worker, set()).add(task)
+
+    expressions = list(context.z3_assertions)
+    pinned_workers = set()
+    for constraint in context.constraints:
+        if isinstance(constraint, ResourceConstraint):
+            # constraints on a cumulative worker apply to all its workers
+            if isinstance(getattr(constraint, "resource", None), Worker):
+                pinned_workers.add(constraint.resource)
+        else:
+            expressions.extend(constraint.get_z3_assertions())
+    for indicator in context.indicators:
+        expressions.extend(indicator.get_z3_assertions())
+    expressions.extend(_get_objective_expressions(context))
+    pinned_variable_ids = _get_variable_ids(expressions)
+
+    groups = {}
+    for worker, worker_select_workers in select_workers_of_worker.items():
+        if worker in pinned_workers:
+            continue
+        # statically assigned to a task
+        pool_tasks = pool_tasks_of_worker[worker]
+        if any(task not in pool_tasks for task in worker.busy_intervals):
+            continue
+        variables = [
+            select_workers.selection_dict[worker]
+            for select_workers in worker_select_workers
+        ]
+        for busy_interval in worker.busy_intervals.values():
+            variables.extend(busy_interval)
+        if {variable.get_id() for variable in variables} & pinned_variable_ids:
+            continue
+        key = (
+            worker.productivity,
+            _get_cost_key(worker.cost),
+            tuple(id(select_workers) for select_workers in worker_select_workers),
+        )
+        groups.setdefault(key, []).append(worker)
+    return [
+        (workers, select_workers_of_worker[workers[0]])
+        for workers in groups.values()
+        if len(workers) > 1
+    ]
@@ -17,7 +17,7 @@
 
 from typing import List, Optional
 
-from z3 import And, ArithRef, Bool, BoolRef, If, Int, Or
+from z3 import And, ArithRef, Bool, BoolRef, If, Int, IntVal, Or
 
 from processscheduler.base import _NamedUIDObject
 from processscheduler.util import (
@@ -43,11 +43,23 @@ class Task(_NamedUIDObject):
         # it stores the parameter passed to the add_required_resource
         # method
         self.required_resources_names = []  # type: List[str]
+        # workers whose busy interval is synced with the task start and end,
+        # i.e. static workers, not dynamic or selected ones
+        self.synced_resources = []  # type: List[Worker]
+        # the SelectWorkers instances workers are selected from
+        self.select_workers = []  # type: List[SelectWorkers]
+
+        main_context = ps_context.get_main_context()
+        if main_context is None:
+            raise AssertionError(
+                "No context available. First create a SchedulingProblem"
+            )
 
-        # z3 Int variables
-        self.start = Int(f"{name}_start")  # type: ArithRef
-        self.end = Int(f"{name}_end")  # type: ArithRef
-        self.duration = Int(f"{name}_duration")  # type: ArithRef
+        # z3 Int variables, created in the z3 context of the problem
+        z3_context = main_context.z3_context
+        self.start = Int(f"{name}_start", z3_context)  # type: ArithRef
+        self.end = Int(f"{name}_end", z3_context)  # type: ArithRef
+        self.duration = Int(f"{name}_duration", z3_context)  # type: ArithRef
 
         # by default, the task is mandatory
         self.scheduled = True  # type: Union[bool, BoolRef]
@@ -57,13 +69,9 @@ class Task(_NamedUIDObject):
         self.optional = optional  # type: bool
 
         # add this task to the current context
-        if ps_context.main_context is None:
-            raise AssertionError(
-                "No context available. First create a SchedulingProblem"
-            )
         # the task_number is an integer that is incremented each time
         # a task is created. The first task has number 1, the second number 2 etc.
-        self.task_number = ps_context.main_context.add_task(self)  # type: int
+        self.task_number = main_context.add_task(self)  # type: int
 
         # the counter used for negative integers
         # negative integers are used to schedule optional tasks
@@ -97,6 +105,11 @@ class Task(_NamedUIDObject):
         self.required_resources_names.append(resource.name)
 
         if isinstance(resource, CumulativeWorker):
+            if resource.encoding == "native":
+                # the solver checks the capacity of the cumulative worker
+                resource.add_busy_interval(self, (self.start, self.end))
+                self.required_resources.append(resource)
+                return
             # in the case for a CumulativeWorker, select at least one worker
             resource = resource.get_select_workers()
 
@@ -104,10 +117,10 @@ class Task(_NamedUIDObject):
             # loop over each resource
             for worker in resource.list_of_workers:
                 resource_maybe_busy_start = Int(
-                    f"{worker.name}_maybe_busy_{self.name}_start"
+                    f"{worker.name}_maybe_busy_{self.name}_start", self.start.ctx
                 )
                 resource_maybe_busy_end = Int(
-                    f"{worker.name}_maybe_busy_{self.name}_end"
+                    f"{worker.name}_maybe_busy_{self.name}_end", self.start.ctx
                 )
                 # create the busy interval for the resource
                 worker.add_busy_interval(
@@ -138,19 +151,26 @@ class Task(_NamedUIDObject):
                 self.required_resources.append(worker)
             # also, don't forget to add the AlternativeWorker assertion
             self.append_z3_assertion(resource.selection_assertion)
+            self.select_workers.append(resource)
         elif isinstance(resource, Worker):
-            resource_busy_start = Int(f"{resource.name}_busy_{self.name}_start")
-            resource_busy_end = Int(f"{resource.name}_busy_{self.name}_end")
-            # create the busy interval for the resource
-            resource.add_busy_interval(self, (resource_busy_start, resource_busy_end))
-            # set the busy resource to keep synced with the task
             if dynamic:
+                resource_busy_start = Int(
+                    f"{resource.name}_busy_{self.name}_start", self.start.ctx
+                )
+                resource_busy_end = Int(
+                    f"{resource.name}_busy_{self.name}_end", self.start.ctx
+                )
+                # the resource can join the task any time between its start and end
                 self.append_z3_assertion(resource_busy_end <= self.end)
                 self.append_z3_assertion(resource_busy_start >= self.start)
+                resource.add_busy_interval(
+                    self, (resource_busy_start, resource_busy_end)
+                )
             else:
-                # self.append_z3_assertion(resource_busy_start + self.duration == resource_busy_end)
-                self.append_z3_assertion(resource_busy_end == self.end)
-                self.append_z3_assertion(resource_busy_start == self.start)
+                # the busy interval is the task interval itself, no need for
+                # new variables synced with the task start and end
+                resource.add_busy_interval(self, (self.start, self.end))
+                self.synced_resources.append(resource)
             # finally, store this resource into the resource list
             self.required_resources.append(resource)
 
@@ -173,7 +193,7 @@ class Task(_NamedUIDObject):
         """Take a list of constraint to satisfy. Create two cases: if the task is scheduled,
         nothing is done; if the task is optional, move task to the past"""
         if self.optional:  # in this case the previous assertions maybe skipped
-            self.scheduled = Bool(f"{self.name}_scheduled")
+            self.scheduled = Bool(f"{self.name}_scheduled", self.start.ctx)
             # the first task is moved to -1, the second to -2
             # etc.
             point_in_past = -self.task_number
@@ -200,8 +220,9 @@ class ZeroDurationTask(Task):
 
     def __init__(self, name: str, optional: Optional[bool] = False) -> None:
         super().__init__(name, optional)
+        self.duration = IntVal(0, self.start.ctx)
         # add an assertion: end = start because the duration is zero
-        assertions = [self.start == self.end, self.duration == 0]
+        assertions = [self.start == self.end]
 
         self.set_assertions(assertions)
 
@@ -238,11 +259,13 @@ class FixedDurationTask(Task):
             raise TypeError("work_amount me be a positive integer")
         self.priority = priority
 
-        assertions = [
-            self.start + self.duration == self.end,
-            self.duration == duration,
-            self.start >= 0,
-        ]
+        if optional:
+            # the duration is 0 if the task is not scheduled
+            assertions = [self.duration == duration]
+        else:
+            self.duration = IntVal(duration, self.start.ctx)
+            assertions = []
+        assertions.extend([self.start + self.duration == self.end, self.start >= 0])
 
         self.set_assertions(assertions)
 
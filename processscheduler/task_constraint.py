@@ -21,7 +21,8 @@ from typing import Optional
 from z3 import And, Bool, BoolRef, If, Implies, Int, Not, Or, PbEq, PbGe, PbLe, Xor
 
 from processscheduler.constraint import TaskConstraint
-from processscheduler.util import sort_no_duplicates
+from processscheduler.util import DEFAULT_SORT_METHOD, sort_no_duplicates
+import processscheduler.context as ps_context
 
 #
 # Tasks constraints for two or more classes
@@ -52,6 +53,8 @@ class TaskPrecedence(TaskConstraint):
         if not isinstance(offset, int) or offset < 0:
             raise ValueError("offset must be a positive integer")
 
+        self.task_before = task_before
+        self.task_after = task_after
         self.offset = offset
         self.kind = kind
 
@@ -82,6 +85,8 @@ class TasksStartSynced(TaskConstraint):
 
     def __init__(self, task_1, task_2, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task_1 = task_1
+        self.task_2 = task_2
 
         scheduled_assertion = task_1.start == task_2.start
 
@@ -99,6 +104,8 @@ class TasksEndSynced(TaskConstraint):
 
     def __init__(self, task_1, task_2, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task_1 = task_1
+        self.task_2 = task_2
 
         scheduled_assertion = task_1.end == task_2.end
 
@@ -117,6 +124,8 @@ class TasksDontOverlap(TaskConstraint):
 
     def __init__(self, task_1, task_2, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task_1 = task_1
+        self.task_2 = task_2
 
         scheduled_assertion = Xor(
             task_2.start >= task_1.end, task_1.start >= task_2.end
@@ -132,16 +141,24 @@ class TasksDontOverlap(TaskConstraint):
 
 
 class TasksContiguous(TaskConstraint):
-    """A list of tasks are scheduled contiguously."""
+    """A list of tasks are scheduled contiguously. sort_method is the
+    sort_no_duplicates method used to sort task starts and ends."""
 
-    def __init__(self, list_of_tasks, optional: Optional[bool] = False) -> None:
+    def __init__(
+        self,
+        list_of_tasks,
+        optional: Optional[bool] = False,
+        sort_method: Optional[str] = DEFAULT_SORT_METHOD,
+    ) -> None:
         super().__init__(optional)
+        self.list_of_tasks = list_of_tasks
+        self.sort_method = sort_method
 
         starts = [t.start for t in list_of_tasks]
         ends = [t.end for t in list_of_tasks]
         # sort both lists
-        sorted_starts, constraints_start = sort_no_duplicates(starts)
-        sorted_ends, constraints_end = sort_no_duplicates(ends)
+        sorted_starts, constraints_start = sort_no_duplicates(starts, sort_method)
+        sorted_ends, constraints_end = sort_no_duplicates(ends, sort_method)
         for all_constraints in constraints_start + constraints_end:
             self.set_z3_assertions(all_constraints)
         # from now, starts and ends are sorted in asc order
@@ -166,6 +183,7 @@ class TaskStartAt(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.start == value
@@ -181,6 +199,7 @@ class TaskStartAfterStrict(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.start > value
@@ -196,6 +215,7 @@ class TaskStartAfterLax(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.start >= value
@@ -211,6 +231,7 @@ class TaskEndAt(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.end == value
@@ -226,6 +247,7 @@ class TaskEndBeforeStrict(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.end < value
@@ -241,6 +263,7 @@ class TaskEndBeforeLax(TaskConstraint):
 
     def __init__(self, task, value: int, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task = task
         self.value = value
 
         scheduled_assertion = task.end <= value
@@ -261,6 +284,7 @@ class OptionalTaskConditionSchedule(TaskConstraint):
         self, task, condition: BoolRef, optional: Optional[bool] = False
     ) -> None:
         super().__init__(optional)
+        self.task = task
 
         if not task.optional:
             raise TypeError(f"Task {task.name} must be optional.")
@@ -275,6 +299,8 @@ class OptionalTasksDependency(TaskConstraint):
 
     def __init__(self, task_1, task_2, optional: Optional[bool] = False) -> None:
         super().__init__(optional)
+        self.task_1 = task_1
+        self.task_2 = task_2
 
         if not task_2.optional:
             raise TypeError(f"Task {task_2.name} must be optional.")
@@ -294,6 +320,9 @@ class ForceScheduleNOptionalTasks(TaskConstraint):
         optional: Optional[bool] = False,
     ) -> None:
         super().__init__(optional)
+        self.list_of_optional_tasks = list_of_optional_tasks
+        self.nb_tasks_to_schedule = nb_tasks_to_schedule
+        self.kind = kind
 
         problem_function = {"min": PbGe, "max": PbLe, "exact": PbEq}
 
@@ -314,7 +343,7 @@ class ForceScheduleNOptionalTasks(TaskConstraint):
 
 class ScheduleNTasksInTimeIntervals(TaskConstraint):
     """Given a set of m different tasks, and a list of time intervals, schedule N tasks among m
-    in this time interval"""
+    in this time interval. The other tasks do not overlap the time interval"""
 
     def __init__(
         self,
@@ -325,6 +354,7 @@ class ScheduleNTasksInTimeIntervals(TaskConstraint):
         optional: Optional[bool] = False,
     ) -> None:
         super().__init__(optional)
+        self.list_of_tasks = list_of_tasks
 
         problem_function = {"min": PbGe, "max": PbLe, "exact": PbEq}
 
@@ -344,7 +374,8 @@ class ScheduleNTasksInTimeIntervals(TaskConstraint):
             bools_for_this_task = []
             for time_interval in list_of_time_intervals:
                 task_in_time_interval = Bool(
-                    "InTimeIntervalTask_%s_%i" % (task.name, uuid.uuid4().int)
+                    "InTimeIntervalTask_%s_%i" % (task.name, uuid.uuid4().int),
+                    task.start.ctx,
                 )
                 lower_bound, upper_bound = time_interval
                 cstrs = [
@@ -360,6 +391,12 @@ class ScheduleNTasksInTimeIntervals(TaskConstraint):
                 ]  # full overlap
                 asst = Implies(task_in_time_interval, And(cstrs))
                 self.set_z3_assertions(asst)
+                # a task that is not counted does not overlap the time interval
+                asst_not_in = Implies(
+                    Not(task_in_time_interval),
+                    Or(task.end <= lower_bound, task.start >= upper_bound),
+                )
+                self.set_z3_assertions(asst_not_in)
                 bools_for_this_task.append(task_in_time_interval)
             # only one maximum bool to True from the previous possibilities
             asst_tsk = PbLe([(scheduled, True) for scheduled in bools_for_this_task], 1)
@@ -388,6 +425,7 @@ class UnorderedTaskGroup(TaskConstraint):
         optional: Optional[bool] = False,
     ) -> None:
         super().__init__(optional)
+        self.list_of_tasks = list_of_tasks
 
         # first check that all tasks from the list_of_optional_tasks are
         # actually optional
@@ -395,8 +433,9 @@ class UnorderedTaskGroup(TaskConstraint):
             raise TypeError("list_of_task must be a list")
 
         u_id = uuid.uuid4().int
-        self.start = Int(f"task_group_start_{u_id}")
-        self.end = Int(f"task_group_end_{u_id}")
+        z3_context = ps_context.get_main_context().z3_context
+        self.start = Int(f"task_group_start_{u_id}", z3_context)
+        self.end = Int(f"task_group_end_{u_id}", z3_context)
 
         if time_interval is not None:
             scheduled_assertion = [
@@ -427,6 +466,7 @@ class OrderedTaskGroup(TaskConstraint):
         optional: Optional[bool] = False,
     ) -> None:
         super().__init__(optional)
+        self.list_of_tasks = list_of_tasks
 
         # first check that all tasks from the list_of_optional_tasks are
         # actually optional
@@ -437,8 +477,9 @@ class OrderedTaskGroup(TaskConstraint):
             raise ValueError("kind must either be 'lax', 'strict' or 'tight'")
 
         u_id = uuid.uuid4().int
-        self.start = Int(f"task_group_start_{u_id}")
-        self.end = Int(f"task_group_end_{u_id}")
+        z3_context = ps_context.get_main_context().z3_context
+        self.start = Int(f"task_group_start_{u_id}", z3_context)
+        self.end = Int(f"task_group_end_{u_id}", z3_context)
 
         if time_interval is not None:
             scheduled_assertion = [
@@ -0,0 +1,242 @@
+"""Static propagation of task time windows, before solving."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from processscheduler.task import (
+    Task,
+    FixedDurationTask,
+    VariableDurationTask,
+    ZeroDurationTask,
+)
+from processscheduler.task_constraint import (
+    TaskPrecedence,
+    TaskStartAt,
+    TaskStartAfterStrict,
+    TaskStartAfterLax,
+    TaskEndAt,
+    TaskEndBeforeStrict,
+    TaskEndBeforeLax,
+)
+
+# the node that stands for the time origin in the difference constraints graph
+ORIGIN = 0
+
+
+def get_duration_bounds(task: Task) -> Tuple[int, Optional[int]]:
+    """Return the min and max durations of a task, max is None if unbounded"""
+    if isinstance(task, FixedDurationTask):
+        return task.duration_defined_value, task.duration_defined_value
+    if isinstance(task, VariableDurationTask):
+        if task.allowed_durations:
+            return min(task.allowed_durations), max(task.allowed_durations)
+        return task.min_duration, task.max_duration
+    return 0, 0  # ZeroDurationTask
+
+
+class TimeWindowGraph:
+    """A difference constraints graph over task starts.
+
+    Nodes are integers, node 0 is the time origin and the other ones are
+    tasks. An edge (i, j, w) stands for start_j - start_i >= w, so that
+    start_j >= v is the edge (ORIGIN, j, v) and start_j <= v is the edge
+    (j, ORIGIN, -v).
+    """
+
+    def __init__(self):
+        self.tasks = [None]  # type: List[Task]
+        self.nodes = {}  # type: Dict[Task, int]
+        self.successors = [[]]  # type: List[List[Tuple[int, int]]]
+        self.predecessors = [[]]  # type: List[List[Tuple[int, int]]]
+        # the bounds of each task that are directly stated, without propagation
+        self.direct_bounds = [None]  # type: List[List[Optional[int]]]
+
+    def add_node(self, task: Task) -> None:
+        if task not in self.nodes:
+            self.nodes[task] = len(self.tasks)
+            self.tasks.append(task)
+            self.successors.append([])
+            self.predecessors.append([])
+            self.direct_bounds.append([None, None])
+
+    def add_edge(self, task_from: Task, task_to: Task, weight: int) -> None:
+        node_from = self.nodes[task_from]
+        node_to = self.nodes[task_to]
+        self.successors[node_from].append((node_to, weight))
+        self.predecessors[node_to].append((node_from, weight))
+
+    def add_lower_bound(self, task: Task, value: int) -> None:
+        node = self.nodes[task]
+        self.successors[ORIGIN].append((node, value))
+        self.predecessors[node].append((ORIGIN, value))
+        lower_bound = self.direct_bounds[node][0]
+        if lower_bound is None or value > lower_bound:
+            self.direct_bounds[node][0] = value
+
+    def add_upper_bound(self, task: Task, value: int) -> None:
+        node = self.nodes[task]
+        self.successors[node].append((ORIGIN, -value))
+        self.predecessors[ORIGIN].append((node, -value))
+        upper_bound = self.direct_bounds[node][1]
+        if upper_bound is None or value < upper_bound:
+            self.direct_bounds[node][1] = value
+
+
+def build_time_window_graph(
+    tasks: List[Task], constraints: List, horizon: Optional[int]
+) -> TimeWindowGraph:
+    """Collect the difference constraints that always apply, i.e. the ones
+    on mandatory tasks that are neither optional nor part of a first order
+    logic expression."""
+    graph = TimeWindowGraph()
+    mandatory_tasks = [task for task in tasks if not task.optional]
+    for task in mandatory_tasks:
+        graph.add_node(task)
+        min_duration, _ = get_duration_bounds(task)
+        if not isinstance(task, ZeroDurationTask):
+            graph.add_lower_bound(task, 0)
+        if horizon is not None:
+            graph.add_upper_bound(task, horizon - min_duration)
+
+    for constraint in constraints:
+        if constraint.optional or constraint.created_from_assertion:
+            continue
+        if isinstance(constraint, TaskPrecedence):
+            task_before = constraint.task_before
+            task_after = constraint.task_after
+            # task groups are not supported
+            if not isinstance(task_before, Task) or not isinstance(task_after, Task):
+                continue
+            if task_before.optional or task_after.optional:
+                continue
+            min_duration, max_duration = get_duration_bounds(task_before)
+            delay = min_duration + constraint.offset
+            if constraint.kind == "strict":
+                delay += 1
+            graph.add_edge(task_before, task_after, delay)
+            if constraint.kind == "tight" and max_duration is not None:
+                graph.add_edge(
+                    task_after, task_before, -(max_duration + constraint.offset)
+                )
+        elif isinstance(
+            constraint,
+            (
+                TaskStartAt,
+                TaskStartAfterStrict,
+                TaskStartAfterLax,
+                TaskEndAt,
+                TaskEndBeforeStrict,
+                TaskEndBeforeLax,
+            ),
+        ):
+            task = constraint.task
+            if not isinstance(task, Task) or task.optional:
+                continue
+            min_duration, max_duration = get_duration_bounds(task)
+            value = constraint.value
+            if isinstance(constraint, TaskStartAt):
+                graph.add_lower_bound(task, value)
+                graph.add_upper_bound(task, value)
+            elif isinstance(constraint, TaskStartAfterStrict):
+                graph.add_lower_bound(task, value + 1)
+            elif isinstance(constraint, TaskStartAfterLax):
+                graph.add_lower_bound(task, value)
+            elif isinstance(constraint, TaskEndAt):
+                graph.add_upper_bound(task, value - min_duration)
+                if max_duration is not None:
+                    graph.add_lower_bound(task, value - max_duration)
+            elif isinstance(constraint, TaskEndBeforeStrict):
+                graph.add_upper_bound(task, value - 1 - min_duration)
+            else:  # TaskEndBeforeLax
+                graph.add_upper_bound(task, value - min_duration)
+    return graph
+
+
+def _longest_paths(adjacency: List[List[Tuple[int, int]]]) -> Optional[List]:
+    """Longest paths from ORIGIN, using the queue based Bellman-Ford algorithm.
+    adjacency lists the (node, weight) successors of each node. The distance
+    of an unreachable node is None. Return None if there is a positive cycle."""
+    nb_nodes = len(adjacency)
+    distances = [None] * nb_nodes
+    distances[ORIGIN] = 0
+    nb_updates = [0] * nb_nodes
+    in_queue = [False] * nb_nodes
+    queue = deque([ORIGIN])
+    in_queue[ORIGIN] = True
+    while queue:
+        node = queue.popleft()
+        in_queue[node] = False
+        for next_node, weight in adjacency[node]:
+            new_distance = distances[node] + weight
+            if distances[next_node] is None or new_distance > distances[next_node]:
+                # a path from the origin to itself with a positive length,
+                # typically a lower bound greater than an upper bound
+                if next_node == ORIGIN:
+                    return None
+                distances[next_node] = new_distance
+                # a node can't be updated more than nb_nodes times
+                # unless there is a positive cycle
+                nb_updates[next_node] += 1
+                if nb_updates[next_node] > nb_nodes:
+                    return None
+                if not in_queue[next_node]:
+                    queue.append(next_node)
+                    in_queue[next_node] = True
+    return distances
+
+
+def propagate_time_windows(
+    graph: TimeWindowGraph,
+) -> Optional[Dict[Task, Tuple[Optional[int], Optional[int]]]]:
+    """Compute, for each task of the graph, the earliest and latest start
+    times. One of both bounds is None if unknown.
+
+    Return None if the graph contains a positive cycle, i.e. if the
+    problem is unsatisfiable.
+    """
+    # earliest starts are the longest paths from the origin
+    earliest_starts = _longest_paths(graph.successors)
+    if earliest_starts is None:
+        return None
+    # latest starts are the opposites of the longest paths to the origin
+    latest_starts = _longest_paths(graph.predecessors)
+    if latest_starts is None:
+        return None
+
+    time_windows = {}
+    for node in range(1, len(graph.tasks)):
+        earliest_start = earliest_starts[node]
+        latest_start = latest_starts[node]
+        if latest_start is not None:
+            latest_start = -latest_start
+        if (
+            earliest_start is not None
+            and latest_start is not None
+            and earliest_start > latest_start
+        ):
+            return None
+        time_windows[graph.tasks[node]] = (earliest_start, latest_start)
+    return time_windows
+
+
+def compute_time_windows(
+    tasks: List[Task], constraints: List, horizon: Optional[int] = None
+) -> Optional[Dict[Task, Tuple[Optional[int], Optional[int]]]]:
+    """Compute the earliest and latest start times of mandatory tasks, see
+    propagate_time_windows."""
+    return propagate_time_windows(build_time_window_graph(tasks, constraints, horizon))
@@ -15,9 +15,23 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
-from typing import List
-
-from z3 import And, FreshInt, If, Or
+import ctypes
+from typing import List, Optional, Tuple, Union
+
+from z3 import (
+    And,
+    BoolVal,
+    ExprRef,
+    FreshBool,
+    FreshInt,
+    If,
+    Implies,
+    Or,
+    PbEq,
+    is_int_value,
+    is_true,
+    z3core,
+)
 
 #
 # Functions over python types (ints, strings, etc.)
@@ -62,11 +76,62 @@ def calc_parabola_from_three_points(vector_x, vector_y):
     return a, b, c
 
 
+def _get_z3_context(z3_int_list):
+    """Return the z3 context of the first z3 expression of the list, None
+    (i.e. the z3 default context) if there is no such expression"""
+    for item in z3_int_list:
+        if isinstance(item, ExprRef):
+            return item.ctx
+    return None
+
+
+def get_model_values(model, expressions: List[ExprRef]) -> List[Union[int, bool]]:
+    """Return the values of a list of integer or boolean expressions in a
+    model, in one pass. The values of constants and numerals are read with
+    the z3 C API, without creating the python objects model[expression].as_long()
+    creates, which is several times faster on large models. Other expressions
+    and big integers are evaluated."""
+    ctx_ref = model.ctx.ref()
+    model_ref = model.model
+    int64_value = ctypes.c_int64()
+
+    def get_value(expression: ExprRef) -> Union[int, bool]:
+        ast = expression.as_ast()
+        # e.g. the duration of a fixed duration task
+        if z3core.Z3_is_numeral_ast(ctx_ref, ast) and z3core.Z3_get_numeral_int64(
+            ctx_ref, ast, int64_value
+        ):
+            return int64_value.value
+        interpretation = z3core.Z3_model_get_const_interp(
+            ctx_ref, model_ref, z3core.Z3_get_app_decl(ctx_ref, ast)
+        )
+        if interpretation:
+            if z3core.Z3_get_numeral_int64(ctx_ref, interpretation, int64_value):
+                return int64_value.value
+            bool_value = z3core.Z3_get_bool_value(ctx_ref, interpretation)
+            if bool_value != 0:  # Z3_L_UNDEF for non boolean values
+                return bool_value == 1
+        value = model.eval(expression, model_completion=True)
+        return value.as_long() if is_int_value(value) else is_true(value)
+
+    # the values of the python objects already read, e.g. the start and end
+    # of a task that are also the busy interval of a worker
+    known_values = {}
+    values = []
+    for expression in expressions:
+        key = id(expression)
+        if key not in known_values:
+            known_values[key] = get_value(expression)
+        values.append(known_values[key])
+    return values
+
+
 def sort_bubble(z3_int_list):
     """Take a list of int variables, return the list of new variables
     sorting using the bubble recursive sort"""
     sorted_list = z3_int_list.copy()
     glob_asst = []
+    ctx = _get_z3_context(z3_int_list)
 
     def bubble_up(ar):
         arr = ar.copy()
@@ -75,7 +140,7 @@ def sort_bubble(z3_int_list):
             x = arr[i]
             y = arr[i + 1]
             # compare and swap x and y
-            x1, y1 = FreshInt(), FreshInt()
+            x1, y1 = FreshInt(ctx=ctx), FreshInt(ctx=ctx)
             c = If(x <= y, And(x1 == x, y1 == y), And(x1 == y, y1 == x))
             # store values
             arr[i] = x1
@@ -90,11 +155,75 @@ def sort_bubble(z3_int_list):
     return sorted_list, glob_asst
 
 
-def sort_no_duplicates(z3_int_list):
-    """Sort a list of integers that have distinct values"""
+def _get_odd_even_merge_sort_comparators(n: int) -> List[Tuple[int, int]]:
+    """Return the (i, j), i < j, compare and swap pairs of the Batcher odd-even
+    merge sorting network of size n, for any n. There are O(n log2(n)**2)
+    comparators."""
+    comparators = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        comparators.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return comparators
+
+
+# the sort_no_duplicates method used by constraints and solvers, unless
+# another one is given
+DEFAULT_SORT_METHOD = "network"
+
+
+def sort_no_duplicates(z3_int_list, method: Optional[str] = DEFAULT_SORT_METHOD):
+    """Sort a list of integers that have distinct values.
+
+    Return the list of sorted variables and the list of assertions. The
+    encoding depends on the method:
+    - pairwise: each sorted variable is equal to one of the integers, O(n**2)
+    - network: Batcher odd-even merge sorting network, O(n log2(n)**2), the
+    default
+    - permutation: a boolean permutation matrix, O(n**2) boolean variables
+    with pseudo boolean constraints
+    """
+    if method not in ["pairwise", "network", "permutation"]:
+        raise ValueError("method must be 'pairwise', 'network' or 'permutation'")
     n = len(z3_int_list)
-    a = [FreshInt() for i in range(n)]
-    constraints = [Or([a[i] == z3_int_list[j] for j in range(n)]) for i in range(n)]
-    constraints.append(And([a[i] < a[i + 1] for i in range(n - 1)]))
+    ctx = _get_z3_context(z3_int_list)
+    if method == "network":
+        a = list(z3_int_list)
+        constraints = []
+        for i, j in _get_odd_even_merge_sort_comparators(n):
+            lower, upper = FreshInt(ctx=ctx), FreshInt(ctx=ctx)
+            constraints.append(
+                If(
+                    a[i] <= a[j],
+                    And(lower == a[i], upper == a[j]),
+                    And(lower == a[j], upper == a[i]),
+                )
+            )
+            a[i], a[j] = lower, upper
+    else:
+        a = [FreshInt(ctx=ctx) for i in range(n)]
+        if method == "pairwise":
+            constraints = [
+                Or([a[i] == z3_int_list[j] for j in range(n)]) for i in range(n)
+            ]
+        else:
+            # permutation[i][j] is True if the sorted variable i is the integer j
+            permutation = [[FreshBool(ctx=ctx) for j in range(n)] for i in range(n)]
+            constraints = [
+                Implies(permutation[i][j], a[i] == z3_int_list[j])
+                for i in range(n)
+                for j in range(n)
+            ]
+            for i in range(n):
+                constraints.append(PbEq([(p, 1) for p in permutation[i]], 1))
+                constraints.append(PbEq([(p[i], 1) for p in permutation], 1))
+    increasing = [a[i] < a[i + 1] for i in range(n - 1)]
+    constraints.append(And(increasing) if increasing else BoolVal(True, ctx))
 
     return a, constraints
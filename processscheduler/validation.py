@@ -0,0 +1,398 @@
+"""Check a solution against the problem, without the solver."""
+
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from itertools import filterfalse, repeat
+from operator import attrgetter
+from typing import List, Optional, Union
+
+from processscheduler.analytics import SolutionAnalytics
+from processscheduler.ir import ProblemIR
+from processscheduler.problem import SchedulingProblem
+from processscheduler.resource import CumulativeWorker, Worker
+from processscheduler.resource_constraint import ResourceUnavailable, WorkLoad
+from processscheduler.solution import SchedulingSolution
+from processscheduler.task import VariableDurationTask, ZeroDurationTask
+from processscheduler.task_constraint import (
+    TaskEndAt,
+    TaskEndBeforeLax,
+    TaskEndBeforeStrict,
+    TaskPrecedence,
+    TaskStartAfterLax,
+    TaskStartAfterStrict,
+    TaskStartAt,
+)
+
+# the time window constraints: the task attribute they bound, the comparison
+# that must hold and its description
+_TIME_WINDOWS = {
+    TaskStartAt: ("start", lambda times, values: times == values, "!="),
+    TaskStartAfterStrict: ("start", lambda times, values: times > values, "<="),
+    TaskStartAfterLax: ("start", lambda times, values: times >= values, "<"),
+    TaskEndAt: ("end", lambda times, values: times == values, "!="),
+    TaskEndBeforeStrict: ("end", lambda times, values: times < values, ">="),
+    TaskEndBeforeLax: ("end", lambda times, values: times <= values, ">"),
+}
+
+
+class _SolutionValidator:
+    """Check each kind of constraint with vectorized operations over the
+    solution arrays, and collect the violations"""
+
+    def __init__(self, solution: SchedulingSolution, problem: SchedulingProblem):
+        self.analytics = SolutionAnalytics(solution, problem)
+        # numpy is available, the analytics checked it
+        import numpy as np
+
+        self.np = np
+        self.problem = problem
+        self.solution = solution
+        self.violations = []  # type: List[str]
+        # the index in the solution of each problem task, by task id
+        tasks = problem.context.tasks
+        task_names = list(map(attrgetter("name"), tasks))
+        if task_names == self.analytics.task_names:
+            indices = range(len(tasks))
+        else:
+            solution_indices = self.analytics.get_task_indices()
+            indices = [solution_indices.get(name, -1) for name in task_names]
+        self._task_indices = dict(zip(map(id, tasks), indices))
+
+    def validate(self) -> List[str]:
+        self.check_tasks()
+        for constraint_type in _TIME_WINDOWS:
+            self.check_time_windows(
+                constraint_type, self._get_constraints(constraint_type)
+            )
+        self.check_precedences(self._get_constraints(TaskPrecedence))
+        self.check_resource_capacities()
+        for constraint in self._get_constraints(ResourceUnavailable):
+            self.check_unavailability(constraint)
+        for constraint in self._get_constraints(WorkLoad):
+            self.check_workload(constraint)
+        for buffer in self.problem.context.buffers:
+            self.check_buffer(buffer)
+        return self.violations
+
+    def _get_constraints(self, constraint_type: type) -> List:
+        """The constraints of a type, except the optional ones the solver
+        decides whether they apply"""
+        return list(
+            filterfalse(
+                attrgetter("optional"),
+                self.problem.context.get_constraints_by_type(constraint_type),
+            )
+        )
+
+    def _get_indices(self, tasks, nb_tasks: int):
+        """The indices of the tasks in the solution, -1 for missing tasks"""
+        return self.np.fromiter(
+            map(self._task_indices.get, map(id, tasks), repeat(-1)), int, nb_tasks
+        )
+
+    def check_tasks(self) -> None:
+        """Scheduled tasks are inside the horizon and last their duration"""
+        np = self.np
+        analytics = self.analytics
+        tasks = self.problem.context.tasks
+        indices = self._get_indices(tasks, len(tasks))
+        for i in np.flatnonzero(indices < 0):
+            self.violations.append(f"Task: {tasks[i].name} is not in the solution")
+        starts = analytics.starts
+        ends = analytics.ends
+        durations = analytics.durations
+        scheduled = analytics.scheduled
+        outside_horizon = scheduled & ((starts < 0) | (ends > analytics.horizon))
+        for i in np.flatnonzero(outside_horizon):
+            self.violations.append(
+                f"Task: {analytics.task_names[i]} from {starts[i]} to {ends[i]} is "
+                f"outside the horizon {analytics.horizon}"
+            )
+        wrong_duration = scheduled & (ends - starts != durations)
+        for i in np.flatnonzero(wrong_duration):
+            self.violations.append(
+                f"Task: {analytics.task_names[i]} from {starts[i]} to {ends[i]} does "
+                f"not last its duration {durations[i]}"
+            )
+        # the durations allowed by the problem, -1 if not fixed
+        fixed_durations = np.fromiter(
+            map(getattr, tasks, repeat("duration_defined_value"), repeat(-1)),
+            int,
+            len(tasks),
+        )
+        is_scheduled = (indices >= 0) & scheduled[np.maximum(indices, 0)]
+        task_durations = durations[np.maximum(indices, 0)]
+        is_fixed = fixed_durations >= 0
+        for i in np.flatnonzero(
+            is_scheduled & is_fixed & (task_durations != fixed_durations)
+        ):
+            self.violations.append(
+                f"Task: the duration {task_durations[i]} of {tasks[i].name} is not "
+                "allowed"
+            )
+        for i in np.flatnonzero(is_scheduled & ~is_fixed):
+            task = tasks[i]
+            duration = int(task_durations[i])
+            if isinstance(task, ZeroDurationTask):
+                is_allowed = duration == 0
+            elif isinstance(task, VariableDurationTask):
+                is_allowed = duration >= task.min_duration and (
+                    task.max_duration is None or duration <= task.max_duration
+                )
+                if task.allowed_durations:
+                    is_allowed = is_allowed and duration in task.allowed_durations
+            else:
+                is_allowed = True
+            if not is_allowed:
+                self.violations.append(
+                    f"Task: the duration {duration} of {task.name} is not allowed"
+                )
+
+    def check_time_windows(self, constraint_type, constraints) -> None:
+        if not constraints:
+            return
+        np = self.np
+        analytics = self.analytics
+        attribute, is_satisfied, description = _TIME_WINDOWS[constraint_type]
+        indices = self._get_indices(
+            map(attrgetter("task"), constraints), len(constraints)
+        )
+        values = np.fromiter(
+            map(attrgetter("value"), constraints), int, len(constraints)
+        )
+        known = indices >= 0
+        indices = indices[known]
+        values = values[known]
+        times = getattr(analytics, f"{attribute}s")[indices]
+        violated = analytics.scheduled[indices] & ~is_satisfied(times, values)
+        for i in np.flatnonzero(violated):
+            self.violations.append(
+                f"{constraint_type.__name__}: {analytics.task_names[indices[i]]} "
+                f"{attribute} {times[i]} {description} {values[i]}"
+            )
+
+    def check_precedences(self, constraints) -> None:
+        if not constraints:
+            return
+        np = self.np
+        analytics = self.analytics
+        befores = self._get_indices(
+            map(attrgetter("task_before"), constraints), len(constraints)
+        )
+        afters = self._get_indices(
+            map(attrgetter("task_after"), constraints), len(constraints)
+        )
+        offsets = np.fromiter(
+            map(attrgetter("offset"), constraints), int, len(constraints)
+        )
+        kinds = np.array(list(map(attrgetter("kind"), constraints)))
+        known = (befores >= 0) & (afters >= 0)
+        befores, afters = befores[known], afters[known]
+        offsets, kinds = offsets[known], kinds[known]
+        lowers = analytics.ends[befores] + offsets
+        uppers = analytics.starts[afters]
+        is_satisfied = np.where(
+            kinds == "lax",
+            lowers <= uppers,
+            np.where(kinds == "strict", lowers < uppers, lowers == uppers),
+        )
+        # the precedence applies if both tasks are scheduled
+        violated = (
+            analytics.scheduled[befores] & analytics.scheduled[afters] & ~is_satisfied
+        )
+        for i in np.flatnonzero(violated):
+            self.violations.append(
+                f"TaskPrecedence ({kinds[i]}): {analytics.task_names[afters[i]]} "
+                f"starts at {uppers[i]}, {analytics.task_names[befores[i]]} ends at "
+                f"{analytics.ends[befores[i]]} with an offset {offsets[i]}"
+            )
+
+    def check_resource_capacities(self) -> None:
+        """A sweep over the sorted start and end events of the assignments:
+        a worker processes one task at a time, a cumulative worker at most
+        size tasks"""
+        np = self.np
+        analytics = self.analytics
+        capacities = np.full(len(analytics.resource_names), np.iinfo(np.int64).max)
+        for i, resource_name in enumerate(analytics.resource_names):
+            resource = self.problem.context.get_resource_by_name(resource_name)
+            if isinstance(resource, CumulativeWorker):
+                capacities[i] = resource.size
+            elif isinstance(resource, Worker):
+                capacities[i] = 1
+        starts = analytics.assignment_starts
+        ends = analytics.assignment_ends
+        resources = analytics.assignment_resources
+        # zero duration assignments do not use the resource
+        is_busy = ends > starts
+        starts, ends, resources = starts[is_busy], ends[is_busy], resources[is_busy]
+        times = np.concatenate((starts, ends))
+        deltas = np.concatenate(
+            (np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64))
+        )
+        event_resources = np.concatenate((resources, resources))
+        # at the same time, tasks end before the next ones start
+        order = np.lexsort((deltas, times, event_resources))
+        times = times[order]
+        event_resources = event_resources[order]
+        # the events of each resource sum up to 0, a single cumulative sum
+        # gives the number of tasks of each resource after each event
+        loads = np.cumsum(deltas[order])
+        overloaded = loads > capacities[event_resources]
+        overloaded_resources, first_events = np.unique(
+            event_resources[overloaded], return_index=True
+        )
+        overloaded_events = np.flatnonzero(overloaded)[first_events]
+        for resource_index, event in zip(overloaded_resources, overloaded_events):
+            self.violations.append(
+                f"Resource: {analytics.resource_names[resource_index]} processes "
+                f"{loads[event]} tasks at time {times[event]}, more than "
+                f"{capacities[resource_index]}"
+            )
+
+    def check_unavailability(self, constraint: ResourceUnavailable) -> None:
+        """No assignment overlaps the unavailable time intervals"""
+        np = self.np
+        resource_name = constraint.resource.name
+        if resource_name not in self.analytics.resource_names:
+            return
+        if not constraint.list_of_time_intervals:
+            return
+        starts, ends = self.analytics.get_assignments(resource_name)
+        intervals = np.array(constraint.list_of_time_intervals, dtype=np.int64)
+        intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+        # the greatest upper bound of the intervals that start before each end
+        upper_bounds = np.maximum.accumulate(intervals[:, 1])
+        nb_intervals = np.searchsorted(intervals[:, 0], ends, side="left")
+        overlaps = (nb_intervals > 0) & (
+            upper_bounds[np.maximum(nb_intervals - 1, 0)] > starts
+        )
+        for i in np.flatnonzero(overlaps):
+            self.violations.append(
+                f"ResourceUnavailable: {resource_name} is busy from {starts[i]} to "
+                f"{ends[i]}, during an unavailability"
+            )
+
+    def check_workload(self, constraint: WorkLoad) -> None:
+        """The busy time inside each time interval is bounded"""
+        np = self.np
+        resource_name = constraint.resource.name
+        if resource_name in self.analytics.resource_names:
+            starts, ends = self.analytics.get_assignments(resource_name)
+        else:
+            starts = ends = np.zeros(0, dtype=np.int64)
+        for (
+            lower_bound,
+            upper_bound,
+        ), bound in constraint.dict_time_intervals_and_bound.items():
+            workload = int(
+                np.clip(
+                    np.minimum(ends, upper_bound) - np.maximum(starts, lower_bound),
+                    0,
+                    None,
+                ).sum()
+            )
+            if constraint.kind == "exact":
+                is_satisfied = workload == bound
+            elif constraint.kind == "max":
+                is_satisfied = workload <= bound
+            else:
+                is_satisfied = workload >= bound
+            if not is_satisfied:
+                self.violations.append(
+                    f"WorkLoad ({constraint.kind}): {resource_name} is busy "
+                    f"{workload} from {lower_bound} to {upper_bound}, the bound "
+                    f"is {bound}"
+                )
+
+    def check_buffer(self, buffer) -> None:
+        """The levels computed from the scheduled tasks stay inside the
+        bounds, and the buffer is not accessed by two tasks at the same time"""
+        np = self.np
+        analytics = self.analytics
+        buffer_solution = self.solution.buffers.get(buffer.name)
+        if buffer.initial_state is not None:
+            initial_state = buffer.initial_state
+        elif buffer_solution is not None and buffer_solution.state:
+            initial_state = buffer_solution.state[0]
+        else:
+            self.violations.append(f"Buffer: {buffer.name} is not in the solution")
+            return
+        unloading_tasks = list(buffer.unloading_tasks)
+        loading_tasks = list(buffer.loading_tasks)
+        unloading_indices = self._get_indices(unloading_tasks, len(unloading_tasks))
+        loading_indices = self._get_indices(loading_tasks, len(loading_tasks))
+        quantities = np.array(
+            [-buffer.unloading_tasks[task] for task in unloading_tasks]
+            + [buffer.loading_tasks[task] for task in loading_tasks],
+            dtype=np.int64,
+        )
+        indices = np.concatenate((unloading_indices, loading_indices))
+        known = indices >= 0
+        is_unloading = np.arange(len(indices)) < len(unloading_tasks)
+        indices, quantities = indices[known], quantities[known]
+        is_unloading = is_unloading[known]
+        # tasks unload at their start, and load at their end
+        times = np.where(
+            is_unloading, analytics.starts[indices], analytics.ends[indices]
+        )
+        is_scheduled = analytics.scheduled[indices]
+        times, quantities = times[is_scheduled], quantities[is_scheduled]
+        order = np.argsort(times, kind="stable")
+        times, quantities = times[order], quantities[order]
+        concurrent = np.flatnonzero(times[1:] == times[:-1])
+        for i in concurrent:
+            self.violations.append(
+                f"Buffer: {buffer.name} is accessed by several tasks at time "
+                f"{times[i]}"
+            )
+        levels = initial_state + np.cumsum(quantities)
+        if buffer.lower_bound is not None:
+            for i in np.flatnonzero(levels < buffer.lower_bound):
+                self.violations.append(
+                    f"Buffer: {buffer.name} level {levels[i]} at time {times[i]} is "
+                    f"lower than {buffer.lower_bound}"
+                )
+        if buffer.upper_bound is not None:
+            for i in np.flatnonzero(levels > buffer.upper_bound):
+                self.violations.append(
+                    f"Buffer: {buffer.name} level {levels[i]} at time {times[i]} is "
+                    f"greater than {buffer.upper_bound}"
+                )
+        final_state = int(levels[-1]) if len(levels) else initial_state
+        if buffer.final_state is not None and final_state != buffer.final_state:
+            self.violations.append(
+                f"Buffer: {buffer.name} final level {final_state} is not "
+                f"{buffer.final_state}"
+            )
+
+
+def validate_solution(
+    solution: SchedulingSolution,
+    problem: Optional[Union[SchedulingProblem, ProblemIR]] = None,
+) -> List[str]:
+    """Check the solution against the problem, without z3: durations and
+    horizon, time windows, precedences, resource overlaps and cumulative
+    capacities, unavailabilities, workloads and buffer levels. Optional
+    constraints and other kinds of constraints are not checked.
+
+    Return the list of violations, empty if the solution is valid. The
+    problem defaults to the problem of the solution."""
+    if problem is None:
+        problem = solution.problem
+    if isinstance(problem, ProblemIR):
+        problem = problem.compile()
+    return _SolutionValidator(solution, problem).validate()
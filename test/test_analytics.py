@@ -0,0 +1,135 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import processscheduler as ps
+
+
+def build_problem():
+    problem = ps.SchedulingProblem("Analytics")
+    worker_1 = ps.Worker("Worker1", cost=ps.ConstantCostPerPeriod(5))
+    worker_2 = ps.Worker("Worker2", cost=ps.PolynomialCostFunction(lambda t: t + 2))
+    machine = ps.CumulativeWorker("Machine", size=2)
+    task_1 = ps.FixedDurationTask("Task1", duration=3, priority=2)
+    task_2 = ps.FixedDurationTask("Task2", duration=2)
+    task_3 = ps.FixedDurationTask("Task3", duration=4)
+    task_4 = ps.FixedDurationTask("Task4", duration=2, optional=True)
+    task_1.add_required_resource(worker_1)
+    task_2.add_required_resources([worker_2, machine])
+    task_3.add_required_resources([worker_1, machine])
+    task_4.add_required_resource(worker_2)
+    ps.TaskStartAt(task_2, 2)
+    ps.TaskPrecedence(task_1, task_3)
+    problem.add_constraint(task_4.scheduled == False)
+    buffer = ps.NonConcurrentBuffer("Buffer", initial_state=10)
+    ps.TaskUnloadBuffer(task_1, buffer, quantity=3)
+    ps.TaskLoadBuffer(task_3, buffer, quantity=2)
+    problem.add_indicator_resource_utilization(worker_1)
+    problem.add_indicator_resource_cost([worker_1, worker_2])
+    problem.add_indicator_number_tasks_assigned(worker_2)
+    problem.add_objective_makespan()
+    problem.add_objective_flowtime()
+    return problem
+
+
+class TestAnalytics(unittest.TestCase):
+    def test_analytics_wrong_type(self) -> None:
+        with self.assertRaises(TypeError):
+            ps.SolutionAnalytics("solution")
+
+    def test_analytics(self) -> None:
+        problem = build_problem()
+        solution = ps.SchedulingSolver(problem).solve()
+        self.assertTrue(solution)
+        analytics = ps.SolutionAnalytics(solution, problem)
+        starts = {name: task.start for name, task in solution.tasks.items()}
+        ends = {name: task.end for name, task in solution.tasks.items()}
+        self.assertEqual(analytics.get_makespan(), solution.horizon)
+        self.assertEqual(
+            analytics.get_flowtime(), ends["Task1"] + ends["Task2"] + ends["Task3"]
+        )
+        self.assertEqual(
+            analytics.get_busy_times(), {"Worker1": 7, "Worker2": 2, "Machine": 6}
+        )
+        self.assertEqual(
+            analytics.get_nb_tasks_assigned(),
+            {"Worker1": 2, "Worker2": 1, "Machine": 2},
+        )
+        self.assertEqual(
+            analytics.get_utilizations()["Worker1"], 700 / solution.horizon
+        )
+        # the idle gaps of worker 1 and the costs
+        gaps = analytics.get_idle_gaps()
+        self.assertEqual(
+            sum(end - start for start, end in gaps["Worker1"]), solution.horizon - 7
+        )
+        self.assertEqual(gaps["Worker2"][0].tolist(), [0, 2])
+        self.assertEqual(analytics.get_idle_times()["Worker2"], solution.horizon - 2)
+        self.assertEqual(
+            analytics.get_costs(), {"Worker1": 35, "Worker2": (4 + 6) * 2 / 2}
+        )
+        # tardiness, unscheduled tasks are never late
+        tardiness = analytics.get_tardiness({"Task1": 0, "Task3": 100, "Task4": 0})
+        self.assertEqual(tardiness.tolist(), [ends["Task1"], 0, 0, 0])
+        tardiness = analytics.get_tardiness([0, 100, 100, 0])
+        self.assertEqual(tardiness.tolist(), [ends["Task1"], 0, 0, 0])
+        with self.assertRaises(ValueError):
+            analytics.get_tardiness([0, 100])
+        # the buffer profile
+        profile = analytics.get_buffer_profiles()["Buffer"]
+        self.assertEqual(len(profile), solution.horizon + 1)
+        self.assertEqual(profile[starts["Task1"]], 7)
+        self.assertEqual(profile[-1], 9)
+        # the solver indicators are consistent
+        self.assertIn("Total Cost (Worker1,Worker2)", solution.indicators)
+        self.assertEqual(analytics.check_indicators(), {})
+        solution.indicators["FlowTime"] += 1
+        self.assertEqual(
+            analytics.check_indicators(),
+            {"FlowTime": (analytics.get_flowtime() + 1, analytics.get_flowtime())},
+        )
+
+    def test_analytics_columnar_solution(self) -> None:
+        problem = build_problem()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve()
+        solver.columnar_solution = True
+        columnar_solution = solver.build_solution(solver.current_solution)
+        analytics = ps.SolutionAnalytics(solution, problem)
+        columnar_analytics = ps.SolutionAnalytics(columnar_solution, problem)
+        self.assertEqual(analytics.task_names, columnar_analytics.task_names)
+        self.assertEqual(analytics.get_flowtime(), columnar_analytics.get_flowtime())
+        gaps = analytics.get_idle_gaps()
+        columnar_gaps = columnar_analytics.get_idle_gaps()
+        self.assertEqual(list(gaps), list(columnar_gaps))
+        for resource_name, resource_gaps in gaps.items():
+            self.assertEqual(
+                resource_gaps.tolist(), columnar_gaps[resource_name].tolist()
+            )
+        self.assertEqual(analytics.get_costs(), columnar_analytics.get_costs())
+        self.assertEqual(columnar_analytics.check_indicators(), {})
+
+    def test_analytics_requires_problem(self) -> None:
+        problem = build_problem()
+        analytics = ps.SolutionAnalytics(ps.SchedulingSolver(problem).solve())
+        with self.assertRaises(ValueError):
+            analytics.get_costs()
+        with self.assertRaises(ValueError):
+            analytics.check_indicators()
+
+
+if __name__ == "__main__":
+    unittest.main()
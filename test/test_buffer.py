@@ -157,6 +157,45 @@ class TestBuffer(unittest.TestCase):
         self.assertTrue(solution)
         self.assertEqual(solution.horizon, 9)
 
+    def test_buffer_encodings(self) -> None:
+        for buffer_encoding in ["events", "array"]:
+            pb = ps.SchedulingProblem(f"BufferEncoding{buffer_encoding}", horizon=8)
+            buffer = ps.NonConcurrentBuffer("Buffer1", initial_state=2, lower_bound=0)
+            for i in range(4):
+                unloading_task = ps.FixedDurationTask(f"UnloadTask_{i}", duration=2)
+                loading_task = ps.FixedDurationTask(f"LoadTask_{i}", duration=i + 1)
+                ps.TaskUnloadBuffer(unloading_task, buffer, quantity=2)
+                ps.TaskLoadBuffer(loading_task, buffer, quantity=2)
+            solver = ps.SchedulingSolver(pb, buffer_encoding=buffer_encoding)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            # states are sorted by time and match the task schedules
+            events = sorted(
+                [(solution.tasks[f"UnloadTask_{i}"].start, -2) for i in range(4)]
+                + [(solution.tasks[f"LoadTask_{i}"].end, 2) for i in range(4)]
+            )
+            buffer_solution = solution.buffers["Buffer1"]
+            self.assertEqual(
+                buffer_solution.state_change_times, [time for time, _ in events]
+            )
+            expected_states = [2]
+            for _, quantity in events:
+                expected_states.append(expected_states[-1] + quantity)
+            self.assertEqual(buffer_solution.state, expected_states)
+            self.assertGreaterEqual(min(buffer_solution.state), 0)
+            # the events encoding does not need any array
+            self.assertEqual(
+                "Array" in solver._solver.sexpr(), buffer_encoding == "array"
+            )
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(pb, buffer_encoding="time_indexed")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(pb, buffer_encoding="array", sort_method="bubble")
+        solver = ps.SchedulingSolver(
+            pb, buffer_encoding="array", sort_method="permutation"
+        )
+        self.assertTrue(solver.solve())
+
 
 if __name__ == "__main__":
     unittest.main()
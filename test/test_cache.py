@@ -0,0 +1,150 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import os
+import tempfile
+import unittest
+
+import processscheduler as ps
+
+
+def build_line_problem(durations, name="Line") -> ps.SchedulingProblem:
+    problem = ps.SchedulingProblem(name, horizon=40)
+    worker = ps.Worker("Worker")
+    tasks = []
+    for i, duration in enumerate(durations):
+        task = ps.FixedDurationTask(f"task{i}", duration=duration)
+        task.add_required_resource(worker)
+        tasks.append(task)
+    ps.TaskPrecedence(tasks[0], tasks[1])
+    problem.add_objective_makespan()
+    return problem
+
+
+class TestCache(unittest.TestCase):
+    def test_fingerprint(self) -> None:
+        fingerprint = ps.get_problem_fingerprint(build_line_problem([1, 2, 3]))
+        # uuids differ, fingerprints do not
+        self.assertEqual(
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 3])), fingerprint
+        )
+        self.assertNotEqual(
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 4])), fingerprint
+        )
+        self.assertEqual(
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 4]), structural=True),
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 3]), structural=True),
+        )
+        self.assertNotEqual(
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 3, 4]), True),
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 3]), True),
+        )
+        # same fingerprint for the IR
+        self.assertEqual(
+            ps.get_problem_fingerprint(
+                ps.ProblemIR.from_problem(build_line_problem([1, 2, 3]))
+            ),
+            fingerprint,
+        )
+        # the name of the problem is ignored
+        self.assertEqual(
+            ps.get_problem_fingerprint(build_line_problem([1, 2, 3], "Line2")),
+            fingerprint,
+        )
+        with self.assertRaises(TypeError):
+            ps.get_problem_fingerprint("Line")
+
+    def test_solution_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = ps.SolutionCache(cache_directory)
+            solution = cache.solve(build_line_problem([1, 2, 3]))
+            self.assertEqual(solution.horizon, 6)
+            self.assertEqual(len(cache), 2)
+            # identical problem, the solution is read from the cache
+            problem_ir = ps.ProblemIR.from_problem(build_line_problem([1, 2, 3]))
+            cached_solution = cache.solve(problem_ir)
+            self.assertEqual(cached_solution.horizon, 6)
+            self.assertEqual(
+                cached_solution.tasks["task2"].start, solution.tasks["task2"].start
+            )
+            self.assertIn("task0", cached_solution.to_json_string())
+            # structurally identical problem, warm started
+            self.assertIsNotNone(
+                cache.get_initial_solution(build_line_problem([2, 2, 3]))
+            )
+            self.assertIsNone(cache.get_solution(build_line_problem([2, 2, 3])))
+            self.assertEqual(cache.solve(build_line_problem([2, 2, 3])).horizon, 7)
+            self.assertEqual(len(cache), 3)
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_solution_cache_concurrent_put(self) -> None:
+        problem = build_line_problem([1, 2, 3])
+        solution = ps.SchedulingSolver(problem).solve()
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = ps.SolutionCache(cache_directory)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                for future in [
+                    executor.submit(cache.put, problem, solution) for _ in range(32)
+                ]:
+                    future.result()
+            # no temporary file is left, and each entry can be read
+            self.assertEqual(len(os.listdir(cache_directory)), 2)
+            cached_solution = cache.get_solution(build_line_problem([1, 2, 3]))
+            self.assertEqual(cached_solution.horizon, solution.horizon)
+
+    def test_solution_cache_not_proven(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = ps.SolutionCache(cache_directory)
+            problem = build_line_problem([1, 2, 3])
+            solver = ps.SchedulingSolver(problem)
+            solution = solver.solve()
+            self.assertTrue(solver.optimality_proven)
+            # a solution that may not be optimal is only used to warm start
+            cache.put(problem, solution, proven=False)
+            self.assertEqual(len(cache), 1)
+            self.assertIsNone(cache.get_solution(build_line_problem([1, 2, 3])))
+            self.assertIsNotNone(
+                cache.get_initial_solution(build_line_problem([1, 2, 3]))
+            )
+            self.assertEqual(cache.solve(build_line_problem([1, 2, 3])).horizon, 6)
+            self.assertIsNotNone(cache.get_solution(build_line_problem([1, 2, 3])))
+
+    def test_solution_cache_unsupported_problem(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = ps.SolutionCache(cache_directory)
+            problem = build_line_problem([1, 2, 3])
+            problem.add_constraint(problem.horizon >= 8)
+            with self.assertWarns(UserWarning):
+                solution = cache.solve(problem)
+            self.assertEqual(solution.horizon, 8)
+            self.assertEqual(len(cache), 0)
+
+    def test_solution_cache_eviction(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = ps.SolutionCache(cache_directory, max_entries=3)
+            cache.solve(build_line_problem([1, 2, 3]))
+            cache.solve(build_line_problem([1, 2, 3, 4]))
+            self.assertEqual(len(cache), 3)
+            # the first solution was evicted
+            self.assertIsNone(cache.get_solution(build_line_problem([1, 2, 3])))
+            self.assertIsNotNone(cache.get_solution(build_line_problem([1, 2, 3, 4])))
+            with self.assertRaises(TypeError):
+                ps.SolutionCache(cache_directory, max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
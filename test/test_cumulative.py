@@ -147,6 +147,88 @@ class TestCumulative(unittest.TestCase):
         self.assertTrue(solution)
         self.assertEqual(solution.horizon, 4)
 
+    #
+    # Native encoding
+    #
+    def test_create_native_cumulative(self):
+        ps.SchedulingProblem("CreateNativeCumulative", horizon=10)
+        cumulative_worker = ps.CumulativeWorker("MachineA", size=4, encoding="native")
+        self.assertEqual(cumulative_worker.cumulative_workers, [])
+        self.assertEqual(cumulative_worker.get_workers(), [cumulative_worker])
+        with self.assertRaises(ValueError):
+            ps.CumulativeWorker("MachineB", size=4, encoding="clones")
+        with self.assertRaises(ValueError):
+            ps.SelectWorkers([cumulative_worker, ps.Worker("Worker")])
+
+    def test_native_cumulative_hosp(self):
+        n = 16
+        capa = 4
+        for horizon, expected_result in [(n // capa, True), (n // capa - 1, False)]:
+            problem = ps.SchedulingProblem("NativeHospital", horizon=horizon)
+            room = ps.CumulativeWorker("Room", size=capa, encoding="native")
+            for i in range(n):
+                task = ps.FixedDurationTask("T%i" % (i + 1), duration=1)
+                task.add_required_resource(room)
+            solution = ps.SchedulingSolver(problem).solve()
+            self.assertEqual(bool(solution), expected_result)
+        # one capacity assertion per time point, instead of one per task
+        solver = ps.SchedulingSolver(problem, symmetry_breaking=False)
+        self.assertEqual(len(solver._solver.assertions()), 37)
+
+    def test_native_cumulative_solution(self):
+        problem = ps.SchedulingProblem("NativeCumulativeSolution")
+        machine = ps.CumulativeWorker(
+            "Machine", size=2, cost=ps.ConstantCostPerPeriod(3), encoding="native"
+        )
+        tasks = [ps.FixedDurationTask(f"T{i}", duration=i + 1) for i in range(4)]
+        for task in tasks:
+            task.add_required_resource(machine)
+        optional_task = ps.FixedDurationTask("T_optional", duration=2, optional=True)
+        optional_task.add_required_resource(machine)
+        ps.ResourceUnavailable(machine, [(0, 1)])
+        cost = problem.add_indicator_resource_cost([machine])
+        problem.add_objective_makespan()
+        solution = ps.SchedulingSolver(problem).solve()
+        self.assertTrue(solution)
+        # T0 and T3 in parallel, then T1 and T2 in parallel
+        self.assertEqual(solution.horizon, 6)
+        self.assertEqual(solution.tasks["T0"].assigned_resources, ["Machine"])
+        self.assertGreaterEqual(min(solution.tasks[t.name].start for t in tasks), 1)
+        machine_solution = solution.resources["Machine"]
+        self.assertEqual(
+            sorted(name for name, _, _ in machine_solution.assignments),
+            ["T0", "T1", "T2", "T3"],
+        )
+        self.assertEqual(solution.indicators[cost.name], 30)
+        # check the capacity
+        for time in range(solution.horizon):
+            in_progress = [
+                name
+                for name, start, end in machine_solution.assignments
+                if start <= time < end
+            ]
+            self.assertLessEqual(len(in_progress), 2)
+
+    def test_native_cumulative_large_capacity(self):
+        # 300 tasks, 600 time units of work on a size 100 worker
+        problem = ps.SchedulingProblem("NativeCumulativeLargeCapacity", horizon=20)
+        machine = ps.CumulativeWorker("Machine", size=100, encoding="native")
+        for i in range(300):
+            task = ps.FixedDurationTask(f"T{i}", duration=i % 3 + 1)
+            task.add_required_resource(machine)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem, max_time=60)
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 6)
+        for time in range(6):
+            in_progress = [
+                task_solution
+                for task_solution in solution.tasks.values()
+                if task_solution.start <= time < task_solution.end
+            ]
+            self.assertLessEqual(len(in_progress), 100)
+
 
 if __name__ == "__main__":
     unittest.main()
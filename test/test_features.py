@@ -13,6 +13,8 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import concurrent.futures
+import time
 import unittest
 
 import processscheduler as ps
@@ -30,10 +32,44 @@ def new_problem_or_clear() -> None:
 
 class TestFeatures(unittest.TestCase):
     def test_clear_context(self) -> None:
-        ps_context.main_context = None
+        ps_context.set_main_context(None)
         new_problem_or_clear()
         self.assertIsInstance(ps_context.main_context, ps.SchedulingContext)
 
+    def test_problem_context_manager(self) -> None:
+        problem_1 = ps.SchedulingProblem("ContextManager1")
+        problem_2 = ps.SchedulingProblem("ContextManager2")
+        with problem_1:
+            self.assertIs(ps.get_main_context(), problem_1.context)
+            task_1 = ps.FixedDurationTask("task1", duration=1)
+            with problem_2:
+                task_2 = ps.FixedDurationTask("task1", duration=1)
+            ps.FixedDurationTask("task2", duration=1)
+        self.assertIs(ps.get_main_context(), problem_2.context)
+        self.assertEqual(len(problem_1.context.tasks), 2)
+        self.assertEqual(problem_2.context.tasks, [task_2])
+        self.assertIn(task_1, problem_1.context.tasks)
+
+    def test_build_problems_in_threads(self) -> None:
+        def build_problem(i):
+            problem = ps.SchedulingProblem(f"Thread{i}", private_z3_context=True)
+            worker = ps.Worker("Worker")
+            for j in range(50):
+                task = ps.FixedDurationTask(f"task{j}", duration=i + 1)
+                task.add_required_resource(worker)
+            return problem
+
+        main_context = ps.get_main_context()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            problems = list(executor.map(build_problem, range(8)))
+        # the context of this thread is unchanged
+        self.assertIs(ps.get_main_context(), main_context)
+        for i, problem in enumerate(problems):
+            self.assertEqual(len(problem.context.tasks), 50)
+            self.assertEqual(len(problem.context.resources), 1)
+            for task in problem.context.tasks:
+                self.assertEqual(task.duration_defined_value, i + 1)
+
     def test_create_problem_with_horizon(self) -> None:
         pb = ps.SchedulingProblem("ProblemWithHorizon", horizon=10)
         self.assertIsInstance(pb, ps.SchedulingProblem)
@@ -98,6 +134,68 @@ class TestFeatures(unittest.TestCase):
         with self.assertRaises(ValueError):
             ps.Worker("wkr_1")
 
+    def test_cumulative_worker_same_name(self) -> None:
+        new_problem_or_clear()
+        ps.CumulativeWorker("MachineA", size=2)
+        with self.assertRaises(ValueError):
+            ps.CumulativeWorker("MachineA", size=3)
+
+    #
+    # Context lookups
+    #
+    def test_context_lookups(self) -> None:
+        problem = ps.SchedulingProblem("ContextLookups")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.ZeroDurationTask("task2")
+        task_3 = ps.FixedDurationTask("task3", duration=3)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        machine = ps.CumulativeWorker("Machine", size=2)
+        buffer = ps.NonConcurrentBuffer("Buffer", initial_state=10)
+        task_1.add_required_resource(worker_1)
+        task_2.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+        task_3.add_required_resource(machine)
+        precedence = ps.TaskPrecedence(task_1, task_2)
+        synced = ps.TasksStartSynced(task_1, task_3)
+        start_at = ps.TaskStartAt(task_3, 1)
+        unavailable = ps.ResourceUnavailable(worker_2, [(0, 1)])
+
+        context = problem.context
+        self.assertIs(context.get_task_by_name("task2"), task_2)
+        self.assertIsNone(context.get_task_by_name("task4"))
+        self.assertIs(context.get_resource_by_name("Worker1"), worker_1)
+        self.assertIs(context.get_resource_by_name("Machine"), machine)
+        self.assertIs(context.get_buffer_by_name("Buffer"), buffer)
+        self.assertEqual(
+            context.get_tasks_by_type(ps.FixedDurationTask), [task_1, task_3]
+        )
+        self.assertEqual(context.get_tasks_by_type(ps.Task), [task_1, task_2, task_3])
+        self.assertEqual(
+            context.get_constraints_by_type(ps.TaskConstraint),
+            [precedence, synced, start_at],
+        )
+        self.assertEqual(
+            context.get_constraints_by_type(ps.ResourceUnavailable), [unavailable]
+        )
+        self.assertEqual(context.get_tasks_of_resource(worker_1), [task_1, task_2])
+        self.assertEqual(context.get_tasks_of_resource(worker_2), [task_2])
+        self.assertEqual(context.get_tasks_of_resource(machine), [task_3])
+        self.assertEqual(context.get_constraints_of_task(task_1), [precedence, synced])
+        self.assertEqual(context.get_constraints_of_task(task_3), [synced, start_at])
+        # the index is updated when a constraint is added
+        end_at = ps.TaskEndAt(task_2, 5)
+        self.assertEqual(context.get_constraints_of_task(task_2), [precedence, end_at])
+
+    def test_context_many_tasks(self) -> None:
+        problem = ps.SchedulingProblem("ContextManyTasks")
+        init_time = time.perf_counter()
+        for i in range(20000):
+            ps.ZeroDurationTask(f"task{i}")
+        self.assertLess(time.perf_counter() - init_time, 20)
+        self.assertEqual(len(problem.context.tasks), 20000)
+        with self.assertRaises(ValueError):
+            ps.ZeroDurationTask("task19999")
+
     #
     # Indicators
     #
@@ -0,0 +1,153 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import processscheduler as ps
+from processscheduler.heuristic import GreedyScheduler
+
+
+class TestHeuristic(unittest.TestCase):
+    def test_heuristic_wrong_type(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, heuristic="greedy")
+        with self.assertRaises(ValueError):
+            GreedyScheduler(problem).schedule("greedy")
+
+    def test_heuristic_precedences(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicPrecedences")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        task_3 = ps.VariableDurationTask("task3", min_duration=4)
+        ps.TaskPrecedence(task_1, task_2, offset=1)
+        ps.TaskPrecedence(task_2, task_3, kind="strict")
+        ps.TaskStartAfterLax(task_1, 5)
+        for scheme in ["serial", "parallel"]:
+            schedule = GreedyScheduler(problem).schedule(scheme)
+            self.assertEqual(schedule[task_1], (5, []))
+            self.assertEqual(schedule[task_2], (8, []))
+            self.assertEqual(schedule[task_3], (12, []))
+
+    def test_heuristic_workers(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicWorkers")
+        task_1 = ps.FixedDurationTask("task1", duration=2, priority=1)
+        task_2 = ps.FixedDurationTask("task2", duration=3, priority=10)
+        task_3 = ps.FixedDurationTask("task3", duration=4)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        task_1.add_required_resource(worker_1)
+        task_2.add_required_resource(worker_1)
+        task_3.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+        ps.ResourceUnavailable(worker_2, [(0, 1)])
+        for scheme in ["serial", "parallel"]:
+            schedule = GreedyScheduler(problem).schedule(scheme)
+            # the task with the highest priority first
+            self.assertEqual(schedule[task_2], (0, [worker_1]))
+            self.assertEqual(schedule[task_1], (3, [worker_1]))
+            self.assertEqual(schedule[task_3], (1, [worker_2]))
+
+    def test_heuristic_required_and_selected(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicRequiredAndSelected")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        task_1.add_required_resource(worker_1)
+        task_1.add_required_resource(
+            ps.SelectWorkers([worker_1, worker_2], 2, kind="exact")
+        )
+        problem.add_objective_makespan()
+        for scheme in ["serial", "parallel"]:
+            schedule = GreedyScheduler(problem).schedule(scheme)
+            # the required worker is one of the selected ones
+            self.assertEqual(schedule[task_1], (0, [worker_1, worker_2]))
+            solver = ps.SchedulingSolver(problem, heuristic=scheme)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            self.assertEqual(solution.horizon, 2)
+
+    def test_heuristic_no_workers(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicNoWorkers")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        task_1.add_required_resources([worker_1, worker_2])
+        task_1.add_required_resource(
+            ps.SelectWorkers([worker_1, worker_2], 1, kind="exact")
+        )
+        problem.add_objective_makespan()
+        for scheme in ["serial", "parallel"]:
+            self.assertIsNone(GreedyScheduler(problem).schedule(scheme))
+            # the solver still finds the solution
+            solver = ps.SchedulingSolver(problem, heuristic=scheme)
+            self.assertIsNone(solver.heuristic_solution)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            self.assertEqual(solution.horizon, 2)
+
+    def test_heuristic_fixed_start(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicFixedStart")
+        task_1 = ps.FixedDurationTask("task1", duration=4)
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        worker_1 = ps.Worker("Worker1")
+        task_1.add_required_resource(worker_1)
+        task_2.add_required_resource(worker_1)
+        ps.TaskStartAt(task_2, 3)
+        for scheme in ["serial", "parallel"]:
+            schedule = GreedyScheduler(problem).schedule(scheme)
+            self.assertEqual(schedule[task_2][0], 3)
+            self.assertEqual(schedule[task_1][0], 5)
+
+    def test_heuristic_missed_deadline(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicMissedDeadline", horizon=10)
+        task_1 = ps.FixedDurationTask("task1", duration=4, priority=2)
+        task_2 = ps.FixedDurationTask("task2", duration=4)
+        worker_1 = ps.Worker("Worker1")
+        task_1.add_required_resource(worker_1)
+        task_2.add_required_resource(worker_1)
+        ps.TaskEndBeforeLax(task_2, 4)
+        self.assertIsNone(GreedyScheduler(problem).schedule())
+        # the solver still finds the solution
+        solver = ps.SchedulingSolver(problem, heuristic="serial")
+        self.assertIsNone(solver.heuristic_solution)
+        self.assertTrue(solver.solve())
+
+    def test_heuristic_unsupported(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicUnsupported")
+        task_1 = ps.FixedDurationTask("task1", duration=4)
+        task_2 = ps.FixedDurationTask("task2", duration=4, optional=True)
+        self.assertIsNone(GreedyScheduler(problem).schedule())
+
+    def test_heuristic_solve_makespan(self) -> None:
+        problem = ps.SchedulingProblem("HeuristicMakespan", horizon=50)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=i + 1) for i in range(6)]
+        for task in tasks:
+            task.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+        ps.TaskPrecedence(tasks[0], tasks[5])
+        problem.add_objective_makespan()
+        for scheme in ["serial", "parallel"]:
+            solver = ps.SchedulingSolver(problem, heuristic=scheme)
+            self.assertTrue(solver.heuristic_solution)
+            heuristic_horizon = solver.heuristic_solution.horizon
+            solution = solver.solve()
+            self.assertTrue(solution)
+            self.assertLessEqual(solution.horizon, heuristic_horizon)
+            self.assertEqual(solution.horizon, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
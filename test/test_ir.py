@@ -0,0 +1,160 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+import unittest
+
+import processscheduler as ps
+
+
+def build_ir_problem() -> ps.SchedulingProblem:
+    """returns a problem that uses most of the features supported by the IR"""
+    problem = ps.SchedulingProblem("IRProblem", horizon=30)
+    worker_1 = ps.Worker("Worker1", cost=ps.ConstantCostPerPeriod(3))
+    worker_2 = ps.Worker("Worker2")
+    machine = ps.CumulativeWorker("Machine", size=2)
+    task_1 = ps.FixedDurationTask("task1", duration=3, priority=2)
+    task_2 = ps.VariableDurationTask("task2", min_duration=2, max_duration=5)
+    task_3 = ps.ZeroDurationTask("task3")
+    task_4 = ps.FixedDurationTask("task4", duration=2, optional=True)
+    task_1.add_required_resource(worker_1)
+    task_2.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+    task_3.add_required_resource(worker_2, dynamic=True)
+    task_4.add_required_resource(machine)
+    ps.TaskPrecedence(task_1, task_2, offset=1)
+    ps.ResourceUnavailable(worker_2, [(0, 2)])
+    ps.TaskStartAt(task_4, 1, optional=True)
+    problem.add_objective_makespan()
+    return problem
+
+
+class TestIR(unittest.TestCase):
+    def test_ir_from_problem(self) -> None:
+        problem_ir = ps.ProblemIR.from_problem(build_ir_problem())
+        self.assertEqual(len(problem_ir.tasks), 4)
+        self.assertEqual(
+            [resource.name for resource in problem_ir.resources],
+            ["Worker1", "Worker2", "Machine"],
+        )
+        self.assertEqual(problem_ir.resources[0].cost, 3)
+        self.assertEqual(
+            problem_ir.tasks[0].required_resources, [("Worker", "Worker1", False)]
+        )
+        self.assertEqual(
+            problem_ir.tasks[1].required_resources,
+            [("SelectWorkers", ["Worker1", "Worker2"], 1, "exact")],
+        )
+        self.assertEqual(
+            problem_ir.tasks[2].required_resources, [("Worker", "Worker2", True)]
+        )
+        self.assertEqual(
+            problem_ir.tasks[3].required_resources, [("CumulativeWorker", "Machine")]
+        )
+        self.assertEqual(
+            problem_ir.constraints[0].arguments,
+            {"task_before": "task1", "task_after": "task2", "offset": 1, "kind": "lax"},
+        )
+        self.assertEqual(problem_ir.objectives[0].kind, "makespan")
+
+    def test_ir_pickle_compile(self) -> None:
+        problem = build_ir_problem()
+        problem_ir = ps.ProblemIR.from_problem(problem)
+        unpickled_problem_ir = pickle.loads(pickle.dumps(problem_ir))
+        self.assertEqual(unpickled_problem_ir, problem_ir)
+        compiled_problem = unpickled_problem_ir.compile()
+        self.assertIsNot(compiled_problem, problem)
+        self.assertEqual(ps.ProblemIR.from_problem(compiled_problem), problem_ir)
+        self.assertEqual(
+            ps.SchedulingSolver(compiled_problem).solve().horizon,
+            ps.SchedulingSolver(problem).solve().horizon,
+        )
+
+    def test_ir_declare_and_solve(self) -> None:
+        problem_ir = ps.ProblemIR("IRDeclare", horizon=20)
+        problem_ir.add_resource("Worker")
+        for i in range(3):
+            problem_ir.add_task(
+                f"task{i}",
+                "FixedDurationTask",
+                duration=i + 1,
+                required_resources=[("Worker", "Worker", False)],
+            )
+        problem_ir.add_constraint("TaskStartAfterLax", {"task": "task0", "value": 2})
+        problem_ir.add_objective("makespan")
+        # no z3 object until the solver compiles the IR
+        self.assertNotIn("z3", repr(problem_ir))
+        solution = ps.SchedulingSolver(problem_ir).solve()
+        self.assertEqual(solution.horizon, 6)
+        self.assertGreaterEqual(solution.tasks["task0"].start, 2)
+
+    def test_ir_compile_buffer(self) -> None:
+        problem_ir = ps.ProblemIR("IRBuffer", horizon=10)
+        problem_ir.add_buffer("Buffer", initial_state=5, final_state=2, lower_bound=0)
+        buffer = problem_ir.compile().context.buffers[0]
+        self.assertEqual(buffer.name, "Buffer")
+        self.assertEqual(buffer.initial_state, 5)
+        self.assertEqual(buffer.final_state, 2)
+        self.assertEqual(buffer.lower_bound, 0)
+        self.assertIsNone(buffer.upper_bound)
+
+    def test_ir_cumulative_worker_select_workers(self) -> None:
+        problem = ps.SchedulingProblem("IRCumulativeSelectWorkers", horizon=10)
+        machine = ps.CumulativeWorker("Machine", size=3)
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        task_1.add_required_resource(machine)
+        task_2.add_required_resource(
+            ps.SelectWorkers(machine.get_workers(), 2, kind="exact")
+        )
+        problem_ir = ps.ProblemIR.from_problem(problem)
+        # the workers of the cumulative worker are not part of the IR
+        self.assertEqual(
+            problem_ir.tasks[1].required_resources,
+            [("CumulativeWorker", "Machine", 2, "exact")],
+        )
+        compiled_problem = problem_ir.compile()
+        self.assertEqual(ps.ProblemIR.from_problem(compiled_problem), problem_ir)
+        compiled_machine = compiled_problem.context.cumulative_workers[0]
+        compiled_select_workers = compiled_problem.context.tasks[1].select_workers[0]
+        self.assertEqual(
+            compiled_select_workers.list_of_workers, compiled_machine.cumulative_workers
+        )
+        self.assertEqual(compiled_select_workers.nb_workers_to_select, 2)
+        self.assertTrue(ps.SchedulingSolver(compiled_problem).solve())
+
+    def test_ir_unsupported(self) -> None:
+        problem = ps.SchedulingProblem("IRUnsupported")
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        problem.add_constraint(task_1.start > 2)
+        with self.assertRaises(ValueError):
+            ps.ProblemIR.from_problem(problem)
+        with self.assertRaises(ValueError):
+            ps.ProblemIR("IRWrongKind").add_task("task1", "UnknownTask")
+        # workers of a cumulative worker selected along with other workers
+        problem = ps.SchedulingProblem("IRUnsupportedSelectWorkers")
+        machine = ps.CumulativeWorker("Machine", size=2)
+        worker = ps.Worker("Worker")
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_1.add_required_resource(
+            ps.SelectWorkers(machine.get_workers()[:1] + [worker], 1)
+        )
+        with self.assertRaises(ValueError):
+            ps.ProblemIR.from_problem(problem)
+        with self.assertRaises(ValueError):
+            ps.ProblemIR("IRWrongKind").add_constraint("UnknownConstraint", {})
+
+
+if __name__ == "__main__":
+    unittest.main()
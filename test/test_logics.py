@@ -0,0 +1,143 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from z3 import Array, Bool, If, IntSort, Ints, Or, PbEq, Real, Reals, ToReal
+
+import processscheduler as ps
+from processscheduler.logics import belong_to_logics, get_logics
+
+
+class TestLogics(unittest.TestCase):
+    def test_get_logics(self) -> None:
+        x, y, z = Ints("x y z")
+        a, b = Reals("a b")
+        flag = Bool("flag")
+        # difference constraints, inside any boolean formula
+        self.assertEqual(
+            get_logics([x - y >= 2, Or(x + 3 <= y, y == z), -x < 0, flag]), "QF_IDL"
+        )
+        self.assertEqual(get_logics([PbEq([(flag, 1)], 1), x == y + 2]), "QF_IDL")
+        # linear sums, conditional terms
+        self.assertEqual(get_logics([x + y + z == 7]), "QF_LIA")
+        self.assertEqual(get_logics([2 * x <= y]), "QF_LIA")
+        self.assertEqual(get_logics([If(flag, x, 0) <= 3]), "QF_LIA")
+        self.assertEqual(get_logics([x % 2 == 0]), "QF_LIA")
+        # reals
+        self.assertEqual(get_logics([a - b >= 1.5]), "QF_RDL")
+        self.assertEqual(get_logics([a + b >= 1.5]), "QF_LRA")
+        self.assertEqual(get_logics([ToReal(x) + a >= 1.5]), "QF_LIRA")
+        # non linear terms and arrays
+        self.assertIsNone(get_logics([x * y == 6]))
+        self.assertIsNone(get_logics([x % y == 0]))
+        self.assertIsNone(get_logics([Array("t", IntSort(), IntSort())[x] == 2]))
+
+    def test_belong_to_logics(self) -> None:
+        x, y = Ints("x y")
+        self.assertTrue(belong_to_logics([x - y >= 2], "QF_IDL"))
+        self.assertTrue(belong_to_logics([x - y >= 2], "QF_LIA"))
+        self.assertTrue(belong_to_logics([Bool("flag")], "QF_RDL"))
+        self.assertFalse(belong_to_logics([x + y >= 2], "QF_IDL"))
+        self.assertFalse(belong_to_logics([Real("a") >= 2], "QF_LIA"))
+        self.assertFalse(belong_to_logics([x * y >= 2], "QF_LIA"))
+        self.assertTrue(belong_to_logics([x * y >= 2], None))
+
+    def test_select_difference_logics(self) -> None:
+        problem = ps.SchedulingProblem("SelectDifferenceLogics")
+        worker = ps.Worker("Worker")
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=i + 1) for i in range(4)]
+        for task in tasks:
+            task.add_required_resource(worker)
+        ps.TaskPrecedence(tasks[0], tasks[3], offset=2)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.logics, "QF_IDL")
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 10)
+
+    def test_select_linear_logics(self) -> None:
+        problem = ps.SchedulingProblem("SelectLinearLogics")
+        worker = ps.Worker("Worker")
+        task = ps.VariableDurationTask("task", work_amount=10)
+        task.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.logics, "QF_LIA")
+        self.assertEqual(solver.solve().horizon, 10)
+
+    def test_select_standard_solver(self) -> None:
+        problem = ps.SchedulingProblem("SelectStandardSolver", horizon=10)
+        task = ps.FixedDurationTask("task", duration=2)
+        problem.add_constraint(task.start * task.start == 4)
+        solver = ps.SchedulingSolver(problem)
+        self.assertIsNone(solver.logics)
+        self.assertEqual(solver.solve().tasks["task"].start, 2)
+
+    def test_logics_override(self) -> None:
+        problem = ps.SchedulingProblem("LogicsOverride", horizon=10)
+        ps.FixedDurationTask("task", duration=2)
+        solver = ps.SchedulingSolver(problem, logics="QF_LIA")
+        self.assertEqual(solver.logics, "QF_LIA")
+        self.assertTrue(solver.solve())
+        # no selection in debug mode
+        solver = ps.SchedulingSolver(problem, debug=True)
+        self.assertIsNone(solver.logics)
+
+    def test_logics_initial_values(self) -> None:
+        problem = ps.SchedulingProblem("LogicsInitialValues", horizon=10)
+        ps.FixedDurationTask("task", duration=2)
+        solution = ps.SchedulingSolver(problem).solve()
+        # the QF_IDL solver does not accept initial values
+        solver = ps.SchedulingSolver(problem, initial_solution=solution)
+        self.assertEqual(solver.logics, "QF_LIA")
+        self.assertTrue(solver.solve())
+        # initial values given after the logics selection
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.logics, "QF_IDL")
+        self.assertGreater(solver.set_initial_solution(solution), 0)
+        self.assertEqual(solver.logics, "QF_LIA")
+        self.assertTrue(solver.solve())
+        # an explicit logics is kept
+        solver = ps.SchedulingSolver(problem, logics="QF_IDL")
+        with self.assertWarns(UserWarning):
+            self.assertEqual(solver.set_initial_solution(solution), 0)
+        self.assertEqual(solver.logics, "QF_IDL")
+
+    def test_logics_live_switch(self) -> None:
+        problem = ps.SchedulingProblem("LogicsLiveSwitch")
+        worker = ps.Worker("Worker")
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=2) for i in range(3)]
+        for task in tasks:
+            task.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.logics, "QF_IDL")
+        self.assertEqual(solver.solve().horizon, 6)
+        # a sum of busy times does not belong to the difference logics
+        solver.add_constraint(ps.WorkLoad(worker, {(0, 6): 4}))
+        self.assertEqual(solver.logics, "QF_LIA")
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 8)
+        # a non linear assertion
+        solver.append_z3_assertion(tasks[0].start * tasks[1].start == 0)
+        self.assertIsNone(solver.logics)
+        self.assertTrue(solver.solve())
+
+
+if __name__ == "__main__":
+    unittest.main()
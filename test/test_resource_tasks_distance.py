@@ -35,6 +35,22 @@ class TestResourceTasksDistance(unittest.TestCase):
         with self.assertRaises(AssertionError):
             ps.ResourceTasksDistance(worker, 0, [(0, 5)])
 
+    def test_resource_tasks_distance_sort_methods(self) -> None:
+        for sort_method in ["pairwise", "network", "permutation"]:
+            pb = ps.SchedulingProblem(f"ResourceTasksDistance{sort_method}", horizon=20)
+            task_1 = ps.FixedDurationTask("task1", duration=8)
+            task_2 = ps.FixedDurationTask("task2", duration=4)
+            worker_1 = ps.Worker("Worker1")
+            task_1.add_required_resource(worker_1)
+            task_2.add_required_resource(worker_1)
+            ps.ResourceTasksDistance(
+                worker_1, distance=4, mode="exact", sort_method=sort_method
+            )
+            ps.TaskStartAt(task_1, 1)
+            solution = ps.SchedulingSolver(pb).solve()
+            self.assertTrue(solution)
+            self.assertEqual(solution.tasks[task_2.name].start, 13)
+
     def test_resource_tasks_distance_1(self) -> None:
         pb = ps.SchedulingProblem("ResourceTasksDistance1", horizon=20)
         task_1 = ps.FixedDurationTask("task1", duration=8)
@@ -0,0 +1,130 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import random
+import unittest
+
+import processscheduler as ps
+from processscheduler.schedule_index import ScheduleIndex
+
+
+class TestScheduleIndex(unittest.TestCase):
+    def test_time_queries(self) -> None:
+        index = ScheduleIndex(
+            [("C", 10, 12), ("A", 0, 3), ("B", 2, 5), ("D", 12, 12), ("E", 15, 20)]
+        )
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.get_tasks_at(0), ["A"])
+        self.assertEqual(index.get_tasks_at(2), ["A", "B"])
+        self.assertEqual(index.get_tasks_at(3), ["B"])
+        self.assertEqual(index.get_tasks_at(5), [])
+        self.assertEqual(index.get_tasks_at(12), [])
+        self.assertEqual(index.get_tasks_in_interval(4, 11), ["B", "C"])
+        self.assertEqual(index.get_tasks_in_interval(5, 10), [])
+        self.assertEqual(index.get_tasks_in_interval(11, 13), ["C", "D"])
+
+    def test_first_free_slot(self) -> None:
+        index = ScheduleIndex(
+            [("C", 10, 12), ("A", 0, 3), ("B", 2, 5), ("D", 12, 12), ("E", 15, 20)]
+        )
+        self.assertEqual(index.get_first_free_slot(5), 5)
+        self.assertEqual(index.get_first_free_slot(6), 20)
+        self.assertEqual(index.get_first_free_slot(3), 5)
+        self.assertEqual(index.get_first_free_slot(3, earliest=8), 12)
+        self.assertEqual(index.get_first_free_slot(4, earliest=8), 20)
+        self.assertEqual(index.get_first_free_slot(1, earliest=13), 13)
+        self.assertEqual(index.get_first_free_slot(1, earliest=17), 20)
+        self.assertEqual(ScheduleIndex([]).get_first_free_slot(4, earliest=3), 3)
+
+    def test_unavailable_intervals(self) -> None:
+        index = ScheduleIndex([("A", 3, 5)], [(0, 2), (8, 10)])
+        self.assertEqual(index.get_tasks_at(0), [])
+        self.assertEqual(index.get_first_free_slot(2), 5)
+        self.assertEqual(index.get_first_free_slot(1), 2)
+        self.assertEqual(index.get_first_free_slot(3, earliest=6), 10)
+        self.assertEqual(ScheduleIndex([], [(0, 2)]).get_first_free_slot(2), 2)
+
+    def test_random_assignments(self) -> None:
+        rng = random.Random(1)
+        assignments = []
+        for i in range(300):
+            start = rng.randint(0, 1000)
+            assignments.append((f"T{i}", start, start + rng.randint(0, 6)))
+        index = ScheduleIndex(assignments)
+        for _ in range(200):
+            lower = rng.randint(-5, 1010)
+            upper = lower + rng.randint(1, 20)
+            expected = {
+                name
+                for name, start, end in assignments
+                if start < upper and end > lower
+            }
+            self.assertEqual(set(index.get_tasks_in_interval(lower, upper)), expected)
+            duration = rng.randint(1, 8)
+            slot = lower
+            while any(
+                start < slot + duration and end > slot and end > start
+                for _, start, end in assignments
+            ):
+                slot += 1
+            self.assertEqual(index.get_first_free_slot(duration, lower), slot)
+
+    def test_solution_schedule_index(self) -> None:
+        problem = ps.SchedulingProblem("ScheduleIndex")
+        worker = ps.Worker("Worker")
+        machine = ps.CumulativeWorker("Machine", size=2)
+        task_1 = ps.FixedDurationTask("Task1", duration=3)
+        task_2 = ps.FixedDurationTask("Task2", duration=2)
+        task_3 = ps.FixedDurationTask("Task3", duration=2)
+        task_1.add_required_resources([worker, machine])
+        task_2.add_required_resource(machine)
+        task_3.add_required_resource(worker)
+        ps.TaskStartAt(task_1, 0)
+        ps.TaskStartAt(task_2, 1)
+        ps.TaskStartAt(task_3, 5)
+        ps.ResourceUnavailable(worker, [(8, 10)])
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve()
+        solver.columnar_solution = True
+        columnar_solution = solver.build_solution(solver.current_solution)
+        for sol in [solution, columnar_solution]:
+            self.assertEqual(
+                sol.get_schedule_index("Worker").get_tasks_at(1), ["Task1"]
+            )
+            self.assertEqual(
+                sol.get_schedule_index("Machine").get_tasks_at(2), ["Task1", "Task2"]
+            )
+            self.assertEqual(sol.get_schedule_index("Worker").get_first_free_slot(2), 3)
+            self.assertEqual(
+                sol.get_schedule_index("Machine").get_first_free_slot(2), 3
+            )
+            # the worker is unavailable from 8 to 10
+            self.assertEqual(
+                sol.get_schedule_index("Worker").get_first_free_slot(3, earliest=7),
+                10,
+            )
+            self.assertEqual(
+                sol.get_schedule_index("Machine").get_first_free_slot(3, earliest=7), 7
+            )
+            self.assertEqual(
+                sol.get_schedule_index().get_tasks_in_interval(2, 6),
+                ["Task1", "Task2", "Task3"],
+            )
+            # the index is built once
+            self.assertIs(sol.get_schedule_index(), sol.get_schedule_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,24 @@ class ScheduleNTasksInTimeIntervals(unittest.TestCase):
         self.assertTrue(solution.tasks[task_1.name].start >= 10)
         self.assertTrue(solution.tasks[task_2.name].end <= 10)
 
+    def test_single_interval_uncounted_overlap(self) -> None:
+        # a task that is not counted cannot partly overlap the time interval
+        for logics in [None, "ALL"]:
+            pb = ps.SchedulingProblem(
+                "ScheduleNTasksInTimeIntervalsUncountedOverlap", horizon=20
+            )
+            task_1 = ps.FixedDurationTask("task1", duration=3)
+            task_2 = ps.FixedDurationTask("task2", duration=3)
+            ps.ScheduleNTasksInTimeIntervals(
+                [task_1, task_2],
+                nb_tasks_to_schedule=1,
+                list_of_time_intervals=[[10, 20]],
+            )
+            ps.TaskStartAt(task_1, 10)
+            ps.TaskStartAt(task_2, 8)
+            solver = ps.SchedulingSolver(pb, logics=logics)
+            self.assertFalse(solver.solve())
+
     def test_single_interval_no_solution(self) -> None:
         pb = ps.SchedulingProblem("ScheduleNTasksInTimeIntervalsNoSolution", horizon=20)
         task_1 = ps.FixedDurationTask("task1", duration=3)
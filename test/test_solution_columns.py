@@ -0,0 +1,113 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta
+import pickle
+import unittest
+
+import processscheduler as ps
+from processscheduler.solution import TaskSolution
+
+
+def build_problem():
+    problem = ps.SchedulingProblem(
+        "SolutionColumns",
+        delta_time=timedelta(minutes=15),
+        start_time=datetime(2021, 5, 1, 8),
+    )
+    worker_1 = ps.Worker("Worker1")
+    worker_2 = ps.Worker("Worker2")
+    machine = ps.CumulativeWorker("Machine", size=2)
+    task_1 = ps.FixedDurationTask("Task1", duration=3)
+    task_2 = ps.FixedDurationTask("Task2", duration=2)
+    task_3 = ps.VariableDurationTask("Task3", work_amount=4)
+    task_4 = ps.FixedDurationTask("Task4", duration=2, optional=True)
+    task_1.add_required_resource(worker_1)
+    task_2.add_required_resources([worker_2, machine])
+    task_3.add_required_resource(ps.SelectWorkers([worker_1, worker_2], 1))
+    task_4.add_required_resource(machine)
+    ps.ResourceUnavailable(worker_2, [(0, 1)])
+    ps.TaskPrecedence(task_1, task_4)
+    problem.add_objective_makespan()
+    return problem
+
+
+class TestSolutionColumns(unittest.TestCase):
+    def test_columnar_solution_wrong_type(self) -> None:
+        problem = ps.SchedulingProblem("ColumnarSolutionWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, columnar_solution=1)
+
+    def test_columnar_solution_views(self) -> None:
+        solver = ps.SchedulingSolver(build_problem())
+        solution = solver.solve()
+        # build both representations from the same model
+        solver.columnar_solution = True
+        columnar_solution = solver.build_solution(solver.current_solution)
+        self.assertIsNone(solution.columns)
+        self.assertIsNotNone(columnar_solution.columns)
+        self.assertEqual(solution.horizon, columnar_solution.horizon)
+        self.assertEqual(list(solution.tasks), list(columnar_solution.tasks))
+        for task_name, task_solution in solution.tasks.items():
+            self.assertEqual(
+                vars(task_solution), vars(columnar_solution.tasks[task_name])
+            )
+        self.assertEqual(list(solution.resources), list(columnar_solution.resources))
+        for resource_name, resource_solution in solution.resources.items():
+            self.assertEqual(
+                vars(resource_solution),
+                vars(columnar_solution.resources[resource_name]),
+            )
+        self.assertEqual(
+            solution.get_scheduled_tasks().keys(),
+            columnar_solution.get_scheduled_tasks().keys(),
+        )
+        self.assertEqual(solution.to_json_string(), columnar_solution.to_json_string())
+        # the views are read only
+        with self.assertRaises(TypeError):
+            columnar_solution.add_task_solution(TaskSolution("Task5"))
+
+    def test_columnar_solution_arrays(self) -> None:
+        solution = ps.SchedulingSolver(build_problem(), columnar_solution=True).solve()
+        columns = solution.columns
+        index = columns.get_task_index("Task2")
+        self.assertEqual(columns.task_names[index], "Task2")
+        self.assertEqual(columns.durations[index], 2)
+        self.assertEqual(columns.ends[index] - columns.starts[index], 2)
+        self.assertEqual(
+            (columns.ends - columns.starts).tolist(), columns.durations.tolist()
+        )
+        # the CSR task to resource index
+        first = columns.task_resources_indptr[index]
+        last = columns.task_resources_indptr[index + 1]
+        self.assertEqual(
+            sorted(
+                columns.resource_names[j] for j in columns.task_resources[first:last]
+            ),
+            ["Machine", "Worker2"],
+        )
+        self.assertEqual(columns.task_resources_indptr[-1], len(columns.task_resources))
+        # the resource assignments
+        worker_2 = columns.resource_names.index("Worker2")
+        first = columns.assignments_indptr[worker_2]
+        last = columns.assignments_indptr[worker_2 + 1]
+        self.assertIn(index, columns.assignment_tasks[first:last].tolist())
+        # the views can be stored in the solution cache
+        tasks = pickle.loads(pickle.dumps(solution.tasks))
+        self.assertEqual(vars(tasks["Task3"]), vars(solution.tasks["Task3"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,9 +13,16 @@
 # You should have received a copy of the GNU General Public License along with
 # this program. If not, see <http://www.gnu.org/licenses/>.
 
+import concurrent.futures
+import os
+import tempfile
+import time
 import unittest
 
 import processscheduler as ps
+from processscheduler.decomposition import get_connected_components
+from processscheduler.portfolio import PORTFOLIO_OBJECTIVE_NAME, solve_smt2
+import z3
 
 
 def build_complex_problem(name: str, n: int) -> ps.SchedulingProblem:
@@ -49,6 +56,24 @@ def build_complex_problem(name: str, n: int) -> ps.SchedulingProblem:
     return problem
 
 
+def build_warm_start_problem(name: str, duration_3: int) -> ps.SchedulingProblem:
+    """returns a problem with three tasks, two workers and an optional task"""
+    problem = ps.SchedulingProblem(name)
+    worker_1 = ps.Worker("Worker1")
+    worker_2 = ps.Worker("Worker2")
+    task_1 = ps.FixedDurationTask("task1", duration=2)
+    task_2 = ps.FixedDurationTask("task2", duration=2)
+    task_3 = ps.FixedDurationTask("task3", duration=duration_3)
+    task_4 = ps.FixedDurationTask("task4", duration=1, optional=True)
+    task_1.add_required_resource(worker_1)
+    task_2.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+    task_3.add_required_resource(worker_2)
+    task_4.add_required_resource(worker_1)
+    ps.TaskPrecedence(task_1, task_3)
+    problem.add_objective_makespan()
+    return problem
+
+
 def _solve_problem(problem, debug=True):
     """create a solver instance, return True if sat else False"""
     solver = ps.SchedulingSolver(problem, debug)
@@ -294,6 +319,446 @@ class TestSolver(unittest.TestCase):
         self.assertEqual(solution.tasks[task_1.name].start, 51 - (3 + 2))
         self.assertEqual(solution.tasks[task_2.name].start, 51 - 3)
 
+    def test_optimizer_wrong_type(self):
+        problem = ps.SchedulingProblem("OptimizerWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, optimizer="foo")
+
+    def test_bisect_makespan(self):
+        makespans = []
+        for optimizer in ["incremental", "bisect"]:
+            problem = build_complex_problem(f"BisectMakespan{optimizer}", 4)
+            problem.add_objective_makespan()
+            solver = ps.SchedulingSolver(problem, optimizer=optimizer)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            makespans.append(solution.horizon)
+        self.assertEqual(makespans[0], makespans[1])
+
+    def test_bisect_long_horizon(self):
+        problem = ps.SchedulingProblem("BisectLongHorizon", horizon=5000)
+        task_1 = ps.FixedDurationTask("task1", duration=800)
+        # the solver may find a first solution anywhere in [800, 5000]
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem, optimizer="bisect")
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 800)
+        self.assertEqual(solution.tasks[task_1.name].start, 0)
+
+    def test_bisect_start_latest(self):
+        problem = ps.SchedulingProblem("BisectStartLatest", horizon=51)
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+
+        ps.TaskPrecedence(task_1, task_2)
+
+        problem.add_objective_start_latest()
+        solver = ps.SchedulingSolver(problem, optimizer="bisect")
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.tasks[task_1.name].start, 51 - (3 + 2))
+        self.assertEqual(solution.tasks[task_2.name].start, 51 - 3)
+
+    def test_bisect_multiple_objectives(self):
+        problem = ps.SchedulingProblem("BisectMultipleObjectives", horizon=20)
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        worker = ps.Worker("Worker")
+        task_1.add_required_resource(worker)
+        task_2.add_required_resource(worker)
+        problem.add_objective_makespan()
+        problem.add_objective_flowtime()
+        solver = ps.SchedulingSolver(problem, optimizer="bisect")
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 6)
+        self.assertEqual(solution.indicators["FlowTime"], 9)
+
+    def test_incremental_optimizer_long_run(self):
+        problem = ps.SchedulingProblem("IncrementalLongRun", horizon=2000)
+        tasks = [
+            ps.VariableDurationTask(f"task{i}", max_duration=1000) for i in range(20)
+        ]
+        worker = ps.Worker("Worker")
+        for task in tasks:
+            task.add_required_resource(worker)
+        duration_indicator = ps.Indicator("Duration", tasks[0].duration)
+        ps.MaximizeObjective("", duration_indicator)
+
+        solver = ps.SchedulingSolver(problem, max_time="inf")
+        nb_assertions_before = len(solver._solver.assertions())
+        nb_guards_before = solver._nb_guards
+        memory_before = z3.Z3_get_estimated_alloc_size()
+        solution = solver.solve_optimize_incremental(
+            duration_indicator.indicator_variable, max_recursion_depth=500, kind="max"
+        )
+        memory_after = z3.Z3_get_estimated_alloc_size()
+        self.assertTrue(solution)
+        # bounds are assumptions, no scope is left on the solver stack
+        self.assertEqual(solver._solver.num_scopes(), 0)
+        # one literal guards all the bounds, one assertion per iteration
+        self.assertEqual(solver._nb_guards, nb_guards_before + 1)
+        self.assertLessEqual(
+            len(solver._solver.assertions()) - nb_assertions_before, 500 + 1
+        )
+        # less than 20MB for 500 iterations
+        self.assertLess(memory_after - memory_before, 20e6)
+
+    def test_incremental_optimizer_max_time(self):
+        problem = ps.SchedulingProblem("IncrementalMaxTime", horizon=100000)
+        tasks = [
+            ps.VariableDurationTask(f"task{i}", max_duration=100000) for i in range(20)
+        ]
+        worker = ps.Worker("Worker")
+        for task in tasks:
+            task.add_required_resource(worker)
+        duration_indicator = ps.Indicator("Duration", tasks[0].duration)
+        ps.MaximizeObjective("", duration_indicator)
+
+        solver = ps.SchedulingSolver(problem, max_time=1)
+        init_time = time.perf_counter()
+        solution = solver.solve_optimize_incremental(
+            duration_indicator.indicator_variable, kind="max"
+        )
+        self.assertTrue(solution)
+        # the whole iteration time counts, model extraction included
+        self.assertLess(time.perf_counter() - init_time, 5)
+
+    def test_portfolio_wrong_nb_workers(self):
+        problem = ps.SchedulingProblem("PortfolioWrongNbWorkers")
+        solver = ps.SchedulingSolver(problem)
+        with self.assertRaises(TypeError):
+            solver.solve_portfolio(nb_workers=0)
+        with self.assertRaises(ValueError):
+            solver.solve_portfolio(nb_workers=2, configurations=[])
+
+    def test_portfolio_makespan(self):
+        problem = ps.SchedulingProblem("PortfolioMakespan")
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=4)
+        worker = ps.Worker("Worker")
+        task_1.add_required_resource(worker)
+        task_2.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve_portfolio(nb_workers=2)
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 7)
+        self.assertEqual(len(solution.resources[worker.name].assignments), 2)
+
+    def test_portfolio_configurations(self):
+        problem = ps.SchedulingProblem("PortfolioConfigurations", horizon=10)
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=4)
+        ps.TaskPrecedence(task_1, task_2)
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve_portfolio(
+            configurations=[{"logics": "QF_IDL"}, {"tactic": "qflia", "seed": 3}]
+        )
+        self.assertTrue(solution)
+        self.assertLessEqual(
+            solution.tasks[task_1.name].end, solution.tasks[task_2.name].start
+        )
+
+    def test_portfolio_unsat(self):
+        problem = ps.SchedulingProblem("PortfolioUnsat", horizon=5)
+        ps.FixedDurationTask("task1", duration=6)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertFalse(solver.solve_portfolio(nb_workers=2))
+
+    def test_portfolio_logics_parameters(self):
+        # the QF_IDL solver rejects the smt parameters
+        x, y, objective = z3.Ints(f"x y {PORTFOLIO_OBJECTIVE_NAME}")
+        exported_solver = z3.Solver()
+        exported_solver.add(x >= 0, y >= x + 3, objective == y + 4)
+        result = solve_smt2(
+            exported_solver.to_smt2(), {"logics": "QF_IDL", "seed": 1}, 10, "min"
+        )
+        self.assertNotIn("error", result)
+        self.assertTrue(result["optimal"])
+        self.assertEqual(result["value"], 7)
+
+    def test_portfolio_tactic_optimization(self):
+        problem = ps.SchedulingProblem("PortfolioTactic")
+        for i in range(4):
+            ps.FixedDurationTask(f"task{i}", duration=i + 1)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        with self.assertRaises(ValueError):
+            solver.solve_portfolio(
+                configurations=[{"tactic": "qflia", "optimizer": "incremental"}]
+            )
+        solution = solver.solve_portfolio(configurations=[{"tactic": "qflia"}])
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 4)
+
+    def test_connected_components(self):
+        x, y, z, horizon = z3.Ints("x y z horizon")
+        components = get_connected_components(
+            [x <= horizon, y <= horizon, z > y, horizon <= 10], ["horizon"]
+        )
+        self.assertEqual(len(components), 2)
+        components.sort(key=lambda component: sorted(component[1]))
+        self.assertEqual(components[0][1], {"x"})
+        self.assertEqual(components[1][1], {"y", "z"})
+        # the assertion that contains only the horizon is added to each component
+        self.assertEqual(len(components[0][0]), 2)
+        self.assertEqual(len(components[1][0]), 3)
+
+    def test_decomposed_makespan(self):
+        problem = ps.SchedulingProblem("DecomposedMakespan")
+        tasks = []
+        for line in range(3):
+            worker = ps.Worker(f"Worker{line}")
+            for i in range(2):
+                task = ps.FixedDurationTask(f"task{line}_{i}", duration=line + i + 1)
+                task.add_required_resource(worker)
+                tasks.append(task)
+        ps.TaskPrecedence(tasks[4], tasks[5], offset=2)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve_decomposed(nb_workers=2)
+        self.assertTrue(solution)
+        # the longest line is the last one: 3 + 2 + 4
+        self.assertEqual(solution.horizon, 9)
+        self.assertEqual(solution.tasks["task2_1"].end, 9)
+        for task in tasks:
+            self.assertLessEqual(solution.tasks[task.name].end, 9)
+
+    def test_decomposed_identical_tasks(self):
+        # the symmetry breaking assertions, on by default, must not link the
+        # independent lines
+        problem = ps.SchedulingProblem("DecomposedIdenticalTasks")
+        for line in range(3):
+            worker = ps.Worker(f"Worker{line}")
+            for i in range(2):
+                task = ps.FixedDurationTask(f"task{line}_{i}", duration=line + 1)
+                task.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        components = get_connected_components(
+            list(solver._solver.assertions()) + solver.get_active_guards(),
+            [problem.horizon.decl().name()],
+        )
+        self.assertEqual(len(components), 3)
+        solution = solver.solve_decomposed(nb_workers=2)
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 6)
+
+    def test_decomposed_horizon_indicator(self):
+        # the utilization depends on the horizon, that differs between the
+        # sub problems and the merged solution
+        problem = ps.SchedulingProblem("DecomposedHorizonIndicator")
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        for i, (worker, duration) in enumerate(
+            [(worker_1, 3), (worker_1, 4), (worker_2, 5), (worker_2, 6)]
+        ):
+            task = ps.FixedDurationTask(f"task{i}", duration=duration)
+            task.add_required_resource(worker)
+        problem.add_indicator_resource_utilization(worker_1)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve_decomposed(nb_workers=2)
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 11)
+        self.assertEqual(solution.indicators["Utilization (Worker1)"], 700 // 11)
+
+    def test_decomposed_satisfaction(self):
+        problem = ps.SchedulingProblem("DecomposedSatisfaction", horizon=5)
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=4)
+        ps.TaskStartAt(task_1, 2)
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve_decomposed(nb_workers=2)
+        self.assertTrue(solution)
+        self.assertEqual(solution.tasks[task_1.name].start, 2)
+        self.assertLessEqual(solution.tasks[task_2.name].end, 5)
+
+    def test_decomposed_unsat(self):
+        problem = ps.SchedulingProblem("DecomposedUnsat", horizon=5)
+        ps.FixedDurationTask("task1", duration=3)
+        ps.FixedDurationTask("task2", duration=6)
+        solver = ps.SchedulingSolver(problem)
+        self.assertFalse(solver.solve_decomposed(nb_workers=2))
+
+    def test_decomposed_other_objective(self):
+        problem = ps.SchedulingProblem("DecomposedFlowtime", horizon=10)
+        ps.FixedDurationTask("task1", duration=3)
+        ps.FixedDurationTask("task2", duration=4)
+        problem.add_objective_flowtime()
+        solver = ps.SchedulingSolver(problem)
+        with self.assertWarns(UserWarning):
+            solution = solver.solve_decomposed()
+        self.assertTrue(solution)
+        self.assertEqual(solution.indicators["FlowTime"], 7)
+
+    #
+    # Warm start
+    #
+    def test_warm_start_wrong_type(self):
+        problem = ps.SchedulingProblem("WarmStartWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, initial_solution=1)
+
+    def test_warm_start_from_solution(self):
+        previous_solution = _solve_problem(
+            build_warm_start_problem("WarmStartPrevious", 3), debug=False
+        )
+        self.assertTrue(previous_solution)
+        # the same problem, with a longer task
+        problem = build_warm_start_problem("WarmStart", 4)
+        solver = ps.SchedulingSolver(problem, initial_solution=previous_solution)
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 6)
+
+    def test_warm_start_from_json(self):
+        previous_solution = _solve_problem(
+            build_warm_start_problem("WarmStartJsonPrevious", 3), debug=False
+        )
+        problem = build_warm_start_problem("WarmStartJson", 4)
+        solver = ps.SchedulingSolver(problem)
+        # horizon, start/end of 4 tasks, the optional task duration and
+        # scheduled flag and 2 selected workers
+        self.assertEqual(
+            solver.set_initial_solution(previous_solution.to_json_string()), 13
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_filename = os.path.join(tmp_dir, "warm_start.json")
+            previous_solution.export_to_json_file(json_filename)
+            self.assertEqual(solver.set_initial_solution(json_filename), 13)
+        self.assertTrue(solver.solve())
+
+    #
+    # Live modifications
+    #
+    def test_live_add_remove_task(self):
+        problem = ps.SchedulingProblem("LiveTask")
+        worker = ps.Worker("Worker")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        task_1.add_required_resource(worker)
+        task_2.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.solve().horizon, 4)
+
+        task_3 = ps.FixedDurationTask("task3", duration=3)
+        task_3.add_required_resource(worker)
+        solver.add_task(task_3)
+        with self.assertRaises(ValueError):
+            solver.add_task(task_3)
+        solution = solver.solve()
+        self.assertEqual(solution.horizon, 7)
+        self.assertIn("task3", solution.tasks)
+
+        solver.remove_task(task_3)
+        solution = solver.solve()
+        self.assertEqual(solution.horizon, 4)
+        self.assertNotIn("task3", solution.tasks)
+        with self.assertRaises(ValueError):
+            solver.remove_task(task_1)
+
+    def test_live_add_remove_constraint(self):
+        problem = ps.SchedulingProblem("LiveConstraint")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        precedence = ps.TaskPrecedence(task_1, task_2)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.solve().horizon, 4)
+
+        start_at = ps.TaskStartAt(task_1, 3)
+        solver.add_constraint(start_at)
+        solution = solver.solve()
+        self.assertEqual(solution.tasks["task1"].start, 3)
+        self.assertEqual(solution.horizon, 7)
+
+        solver.remove_constraint(start_at)
+        self.assertEqual(solver.solve().horizon, 4)
+        with self.assertRaises(ValueError):
+            solver.remove_constraint(precedence)
+
+    def test_live_add_remove_required_resource(self):
+        problem = ps.SchedulingProblem("LiveResource")
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        task_3 = ps.FixedDurationTask("task3", duration=2)
+        task_1.add_required_resource(worker_1)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.solve().horizon, 2)
+
+        solver.add_required_resource(task_2, worker_1)
+        solver.add_required_resource(task_3, ps.SelectWorkers([worker_1, worker_2]))
+        solution = solver.solve()
+        self.assertEqual(solution.horizon, 4)
+        self.assertEqual(solution.tasks["task2"].assigned_resources, ["Worker1"])
+
+        solver.remove_required_resource(task_2, worker_1)
+        solution = solver.solve()
+        self.assertEqual(solution.horizon, 2)
+        self.assertEqual(solution.tasks["task2"].assigned_resources, [])
+        self.assertEqual(solution.tasks["task3"].assigned_resources, ["Worker2"])
+
+    def test_live_task_resource_unavailable(self):
+        problem = ps.SchedulingProblem("LiveUnavailable")
+        worker = ps.Worker("Worker")
+        ps.FixedDurationTask("task1", duration=2)
+        ps.ResourceUnavailable(worker, [(0, 3)])
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem, heuristic="serial")
+        self.assertEqual(solver.solve().horizon, 2)
+
+        task_2 = ps.FixedDurationTask("task2", duration=2)
+        task_2.add_required_resource(worker)
+        solver.add_task(task_2)
+        solution = solver.solve()
+        self.assertEqual(solution.tasks["task2"].start, 3)
+        self.assertEqual(solution.horizon, 5)
+
+    def test_private_z3_context_wrong_type(self):
+        with self.assertRaises(TypeError):
+            ps.SchedulingProblem("PrivateContextWrongType", private_z3_context=1)
+
+    def test_private_z3_context(self):
+        problem_1 = build_warm_start_problem("PrivateContext1", 3)
+        problem_2 = ps.SchedulingProblem("PrivateContext2", private_z3_context=True)
+        problem_3 = ps.SchedulingProblem("PrivateContext3", private_z3_context=True)
+        self.assertIsNone(problem_1.context.z3_context)
+        self.assertIsNotNone(problem_2.context.z3_context)
+        self.assertNotEqual(problem_2.context.z3_context, problem_3.context.z3_context)
+        task = ps.FixedDurationTask("task", duration=2)
+        self.assertEqual(task.start.ctx, problem_3.context.z3_context)
+        # the default z3 context is not polluted by private problems
+        self.assertEqual(problem_1.horizon.ctx, z3.main_ctx())
+
+    def test_private_z3_context_thread_pool(self):
+        # problems are built one after the other, then solved concurrently
+        problems = []
+        for i in range(4):
+            problem = ps.SchedulingProblem(f"ThreadPool{i}", private_z3_context=True)
+            worker = ps.Worker("Worker")
+            for j in range(i + 2):
+                task = ps.FixedDurationTask(f"task{j}", duration=2)
+                task.add_required_resource(worker)
+            problem.add_objective_makespan()
+            problems.append(problem)
+        # each solver has its own timeout
+        solvers = [
+            ps.SchedulingSolver(problem, max_time=i + 1)
+            for i, problem in enumerate(problems)
+        ]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            solutions = list(executor.map(lambda solver: solver.solve(), solvers))
+        for i, solution in enumerate(solutions):
+            self.assertEqual(solution.horizon, 2 * (i + 2))
+
     def test_priorities(self):
         problem = ps.SchedulingProblem("SolvePriorities")
         task_1 = ps.FixedDurationTask("task1", duration=2, priority=1)
@@ -408,6 +873,58 @@ class TestSolver(unittest.TestCase):
         self.assertTrue(solution)
         self.assertEqual(solution.horizon, 4)
 
+    #
+    # Resource encodings
+    #
+    def test_resource_encoding_wrong_type(self):
+        problem = ps.SchedulingProblem("ResourceEncodingWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, resource_encoding="foo")
+
+    def test_resource_encoding_time_indexed(self):
+        problem = ps.SchedulingProblem("ResourceEncodingTimeIndexed")
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        fixed_tasks = [
+            ps.FixedDurationTask(f"fixed_task{i}", duration=i % 3 + 1)
+            for i in range(10)
+        ]
+        for task in fixed_tasks:
+            task.add_required_resource(worker_1)
+        # tasks that can't be time indexed
+        variable_task = ps.VariableDurationTask("variable_task", min_duration=2)
+        variable_task.add_required_resource(worker_1)
+        zero_task = ps.ZeroDurationTask("zero_task")
+        zero_task.add_required_resource(worker_1)
+        ps.TaskStartAt(zero_task, 3)
+        selected_task = ps.FixedDurationTask("selected_task", duration=2)
+        selected_task.add_required_resource(ps.SelectWorkers([worker_1, worker_2]))
+        ps.TaskStartAt(selected_task, 1)
+        optional_task = ps.FixedDurationTask("optional_task", duration=2, optional=True)
+        optional_task.add_required_resource(worker_1)
+
+        with self.assertWarns(UserWarning):
+            solver = ps.SchedulingSolver(problem, resource_encoding="time_indexed")
+        solution = solver.solve()
+        self.assertTrue(solution)
+
+        intervals = sorted(
+            (start, end) for _, start, end in solution.resources["Worker1"].assignments
+        )
+        for (_, end_1), (start_2, _) in zip(intervals, intervals[1:]):
+            self.assertLessEqual(end_1, start_2)
+
+    def test_resource_encoding_same_makespan(self):
+        makespans = []
+        for resource_encoding in ["pairwise", "time_indexed"]:
+            problem = build_complex_problem(f"ResourceEncoding{resource_encoding}", 4)
+            problem.add_objective_makespan()
+            solver = ps.SchedulingSolver(problem, resource_encoding=resource_encoding)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            makespans.append(solution.horizon)
+        self.assertEqual(makespans[0], makespans[1])
+
 
 if __name__ == "__main__":
     unittest.main()
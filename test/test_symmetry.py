@@ -0,0 +1,113 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import processscheduler as ps
+from processscheduler.symmetry import find_identical_tasks, find_identical_workers
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_symmetry_breaking_wrong_type(self) -> None:
+        problem = ps.SchedulingProblem("SymmetryWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, symmetry_breaking="yes")
+
+    def test_find_identical_tasks(self) -> None:
+        problem = ps.SchedulingProblem("IdenticalTasks")
+        worker = ps.Worker("Worker")
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=2) for i in range(6)]
+        for task in tasks:
+            task.add_required_resource(worker)
+        other_task = ps.FixedDurationTask("other_task", duration=3)
+        other_task.add_required_resource(worker)
+        # tasks referred to by a constraint, a buffer or a custom indicator
+        ps.TaskStartAt(tasks[3], 2)
+        buffer = ps.NonConcurrentBuffer("Buffer", initial_state=1)
+        ps.TaskUnloadBuffer(tasks[4], buffer, quantity=1)
+        ps.Indicator("Task5End", tasks[5].end)
+        # the flowtime and resource constraints apply to all the tasks
+        problem.add_objective_flowtime()
+        ps.WorkLoad(worker, {(0, 20): 16})
+        self.assertEqual(
+            find_identical_tasks(problem.context), [[tasks[0], tasks[1], tasks[2]]]
+        )
+
+    def test_find_identical_workers(self) -> None:
+        problem = ps.SchedulingProblem("IdenticalWorkers")
+        workers = [ps.Worker(f"Worker{i}") for i in range(5)]
+        for i in range(4):
+            task = ps.FixedDurationTask(f"task{i}", duration=i + 1)
+            task.add_required_resource(ps.SelectWorkers(workers))
+        # a worker that is statically assigned, or unavailable
+        ps.FixedDurationTask("task4", duration=1).add_required_resource(workers[3])
+        ps.ResourceUnavailable(workers[4], [(0, 1)])
+        groups = find_identical_workers(problem.context)
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0][0], workers[:3])
+        self.assertEqual(len(groups[0][1]), 4)
+
+    def test_symmetry_breaking_solution(self) -> None:
+        # dev teams pick one of three workers A and one of three workers B
+        for symmetry_breaking in [True, False]:
+            problem = ps.SchedulingProblem("SymmetryDevTeams", horizon=3)
+            workers_a = [ps.Worker(f"A_{i}") for i in range(3)]
+            workers_b = [ps.Worker(f"B_{i}") for i in range(3)]
+            for i in range(9):
+                task = ps.FixedDurationTask(f"DevTeam_{i}", duration=1)
+                task.add_required_resource(ps.SelectWorkers(workers_a))
+                task.add_required_resource(ps.SelectWorkers(workers_b))
+            solver = ps.SchedulingSolver(problem, symmetry_breaking=symmetry_breaking)
+            solution = solver.solve()
+            self.assertTrue(solution)
+            starts = [solution.tasks[f"DevTeam_{i}"].start for i in range(9)]
+            if symmetry_breaking:
+                self.assertEqual(starts, sorted(starts))
+                # the first task selects the first workers
+                self.assertEqual(
+                    solution.tasks["DevTeam_0"].assigned_resources, ["A_0", "B_0"]
+                )
+
+    def test_symmetry_breaking_unsat(self) -> None:
+        # 12 identical tasks do not fit in the horizon
+        problem = ps.SchedulingProblem("SymmetryUnsat", horizon=23)
+        worker = ps.Worker("Worker")
+        for i in range(12):
+            task = ps.FixedDurationTask(f"task{i}", duration=2)
+            task.add_required_resource(worker)
+        solver = ps.SchedulingSolver(problem, max_time=20)
+        self.assertFalse(solver.solve())
+
+    def test_symmetry_breaking_live(self) -> None:
+        problem = ps.SchedulingProblem("SymmetryLive")
+        worker = ps.Worker("Worker")
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=2) for i in range(3)]
+        for task in tasks:
+            task.add_required_resource(worker)
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve()
+        self.assertEqual(
+            [solution.tasks[f"task{i}"].start for i in range(3)], [0, 2, 4]
+        )
+        # the last task is not identical to the others anymore
+        solver.add_constraint(ps.TaskStartAt(tasks[2], 0))
+        solution = solver.solve()
+        self.assertEqual(solution.tasks["task2"].start, 0)
+        self.assertEqual(solution.horizon, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,8 @@
 
 import unittest
 
+from z3 import is_int_value
+
 import processscheduler as ps
 import processscheduler.context as ps_context
 
@@ -30,12 +32,12 @@ def new_problem_or_clear() -> None:
 
 class TestTask(unittest.TestCase):
     def test_clear_context(self) -> None:
-        ps_context.main_context = None
+        ps_context.set_main_context(None)
         new_problem_or_clear()
         self.assertIsInstance(ps_context.main_context, ps.SchedulingContext)
 
     def test_create_task_without_problem(self) -> None:
-        ps_context.main_context = None
+        ps_context.set_main_context(None)
         with self.assertRaises(AssertionError):
             ps.ZeroDurationTask("AZeroDurationTask")
 
@@ -143,6 +145,26 @@ class TestTask(unittest.TestCase):
         self.assertTrue(solution)
         self.assertEqual(len(solution.tasks["task1"].assigned_resources), 4)
 
+    def test_static_worker_aliasing(self) -> None:
+        pb = ps.SchedulingProblem("StaticWorkerAliasing")
+        task_1 = ps.FixedDurationTask("task1", duration=3)
+        task_2 = ps.FixedDurationTask("task2", duration=2, optional=True)
+        worker_1 = ps.Worker("Worker1")
+        worker_2 = ps.Worker("Worker2")
+        task_1.add_required_resource(worker_1)
+        task_1.add_required_resource(worker_2, dynamic=True)
+        task_2.add_required_resource(worker_1)
+        # static workers reuse the task start and end
+        self.assertEqual(worker_1.busy_intervals[task_1], (task_1.start, task_1.end))
+        self.assertIsNot(worker_2.busy_intervals[task_1][0], task_1.start)
+        # mandatory fixed durations are constants
+        self.assertTrue(is_int_value(task_1.duration))
+        self.assertFalse(is_int_value(task_2.duration))
+        pb.add_objective_makespan()
+        solution = ps.SchedulingSolver(pb).solve()
+        self.assertEqual(solution.tasks["task1"].duration, 3)
+        self.assertEqual(solution.horizon, 3)
+
     def test_wrong_assignement(self) -> None:
         new_problem_or_clear()
         task_1 = ps.FixedDurationTask("task1", duration=3)
@@ -331,6 +353,23 @@ class TestTask(unittest.TestCase):
         self.assertTrue(solution)
         self.assertEqual(solution.horizon, 56)
 
+    def test_tasks_contiguous_sort_methods(self) -> None:
+        for sort_method in ["pairwise", "network", "permutation"]:
+            pb = ps.SchedulingProblem(f"TasksContiguous{sort_method}")
+            tasks = [ps.FixedDurationTask(f"t_{i}", duration=i + 1) for i in range(3)]
+            worker = ps.Worker("Worker")
+            for t in tasks:
+                t.add_required_resource(worker)
+            ps.TaskStartAt(tasks[0], 2)
+            ps.TasksContiguous(tasks, sort_method=sort_method)
+            solution = ps.SchedulingSolver(pb).solve()
+            self.assertTrue(solution)
+            starts = sorted(solution.tasks[t.name].start for t in tasks)
+            ends = sorted(solution.tasks[t.name].end for t in tasks)
+            self.assertEqual(starts[1:], ends[:-1])
+        with self.assertRaises(ValueError):
+            ps.TasksContiguous(tasks, sort_method="bubble")
+
 
 if __name__ == "__main__":
     unittest.main()
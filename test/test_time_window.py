@@ -0,0 +1,138 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import unittest
+
+import processscheduler as ps
+from processscheduler.time_window import compute_time_windows
+
+
+class TestTimeWindow(unittest.TestCase):
+    def test_time_window_propagation_wrong_type(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowWrongType")
+        with self.assertRaises(TypeError):
+            ps.SchedulingSolver(problem, time_window_propagation=1)
+
+    def test_time_window_chain(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowChain", horizon=20)
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        task_3 = ps.VariableDurationTask("task3", min_duration=4)
+        ps.TaskPrecedence(task_1, task_2, offset=1)
+        ps.TaskPrecedence(task_2, task_3, kind="strict")
+        ps.TaskStartAfterLax(task_1, 5)
+        time_windows = compute_time_windows(
+            problem.context.tasks, problem.context.constraints, 20
+        )
+        self.assertEqual(time_windows[task_1], (5, 9))
+        self.assertEqual(time_windows[task_2], (8, 12))
+        self.assertEqual(time_windows[task_3], (12, 16))
+
+    def test_time_window_no_horizon(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowNoHorizon")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        ps.TaskPrecedence(task_1, task_2)
+        ps.TaskEndBeforeLax(task_2, 10)
+        time_windows = compute_time_windows(
+            problem.context.tasks, problem.context.constraints
+        )
+        self.assertEqual(time_windows[task_1], (0, 5))
+        self.assertEqual(time_windows[task_2], (2, 7))
+
+    def test_time_window_tight_precedence(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowTight")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        ps.TaskPrecedence(task_1, task_2, kind="tight")
+        ps.TaskStartAt(task_2, 6)
+        time_windows = compute_time_windows(
+            problem.context.tasks, problem.context.constraints
+        )
+        self.assertEqual(time_windows[task_1], (4, 4))
+
+    def test_time_window_skip_optional(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowOptional", horizon=10)
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3, optional=True)
+        task_3 = ps.FixedDurationTask("task3", duration=3)
+        ps.TaskPrecedence(task_1, task_2, offset=4)
+        ps.TaskStartAt(task_3, 8, optional=True)
+        time_windows = compute_time_windows(
+            problem.context.tasks, problem.context.constraints, 10
+        )
+        self.assertNotIn(task_2, time_windows)
+        self.assertEqual(time_windows[task_1], (0, 8))
+        self.assertEqual(time_windows[task_3], (0, 7))
+
+    def test_time_window_solve(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowSolve", horizon=20)
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=2) for i in range(5)]
+        for i in range(4):
+            ps.TaskPrecedence(tasks[i], tasks[i + 1])
+        problem.add_objective_makespan()
+        solver = ps.SchedulingSolver(problem)
+        self.assertEqual(solver.time_windows[tasks[4]], (8, 18))
+        solution = solver.solve()
+        self.assertTrue(solution)
+        self.assertEqual(solution.horizon, 10)
+
+    def test_time_window_positive_cycle(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowPositiveCycle")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        ps.TaskPrecedence(task_1, task_2)
+        ps.TaskPrecedence(task_2, task_1)
+        solver = ps.SchedulingSolver(problem)
+        self.assertTrue(solver.time_windows_infeasible)
+        self.assertFalse(solver.solve())
+
+    def test_time_window_inconsistent_bounds(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowInconsistent", horizon=10)
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        ps.TaskPrecedence(task_1, task_2)
+        ps.TaskStartAfterLax(task_1, 7)
+        solver = ps.SchedulingSolver(problem)
+        self.assertTrue(solver.time_windows_infeasible)
+        self.assertFalse(solver.solve())
+
+    def test_time_window_long_chain(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowLongChain", horizon=2000)
+        tasks = [ps.FixedDurationTask(f"task{i}", duration=2) for i in range(1000)]
+        for i in range(999):
+            ps.TaskPrecedence(tasks[i], tasks[i + 1])
+        # starting at 1, the last task ends after the horizon
+        ps.TaskStartAfterLax(tasks[0], 1)
+        init_time = time.perf_counter()
+        solver = ps.SchedulingSolver(problem)
+        self.assertLess(time.perf_counter() - init_time, 10)
+        self.assertTrue(solver.time_windows_infeasible)
+
+    def test_time_window_disabled(self) -> None:
+        problem = ps.SchedulingProblem("TimeWindowDisabled")
+        task_1 = ps.FixedDurationTask("task1", duration=2)
+        task_2 = ps.FixedDurationTask("task2", duration=3)
+        ps.TaskPrecedence(task_1, task_2)
+        ps.TaskPrecedence(task_2, task_1)
+        solver = ps.SchedulingSolver(problem, time_window_propagation=False)
+        self.assertIsNone(solver.time_windows)
+        self.assertFalse(solver.time_windows_infeasible)
+        self.assertFalse(solver.solve())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,7 +16,9 @@
 import unittest
 
 from processscheduler.util import (
+    DEFAULT_SORT_METHOD,
     calc_parabola_from_three_points,
+    get_model_values,
     is_positive_integer,
     is_strict_positive_integer,
     is_list_of_positive_integers,
@@ -24,7 +26,7 @@ from processscheduler.util import (
     sort_bubble,
 )
 
-from z3 import Solver, sat
+from z3 import Bool, BoolVal, Int, IntVal, Not, Solver, sat, unsat
 
 
 class TestUtil(unittest.TestCase):
@@ -68,6 +70,33 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(result, sat)
         self.assertEqual(sorted_integers, [-2, -1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
 
+    def test_sort_no_duplicates_methods(self):
+        lst_to_sort = [Int(f"x{i}") for i in range(11)]
+        values = [7, 3, 10, -1, 0, 8, 2, 5, 4, 9, 1]
+        for method in ["pairwise", "network", "permutation"]:
+            sorted_variables, assertions = sort_no_duplicates(lst_to_sort, method)
+            s = Solver()
+            s.add(assertions)
+            s.add([x == v for x, v in zip(lst_to_sort, values)])
+            self.assertEqual(s.check(), sat)
+            solution = s.model()
+            sorted_integers = [solution[v].as_long() for v in sorted_variables]
+            self.assertEqual(sorted_integers, sorted(values))
+            # duplicates are not allowed
+            s.add(lst_to_sort[0] == lst_to_sort[1])
+            self.assertEqual(s.check(), unsat)
+        with self.assertRaises(ValueError):
+            sort_no_duplicates(lst_to_sort, "bubble")
+        # the same encoding as the constraints and the solver by default
+        self.assertEqual(
+            len(sort_no_duplicates(lst_to_sort)[1]),
+            len(sort_no_duplicates(lst_to_sort, DEFAULT_SORT_METHOD)[1]),
+        )
+        self.assertNotEqual(
+            len(sort_no_duplicates(lst_to_sort)[1]),
+            len(sort_no_duplicates(lst_to_sort, "pairwise")[1]),
+        )
+
     def test_sort_duplicates(self):
         lst_to_sort = [10, 9, 8, 7, 6, 10, 9, 8, 7, 6, 1]
         sorted_variables, assertions = sort_bubble(lst_to_sort)
@@ -79,6 +108,20 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(result, sat)
         self.assertEqual(sorted_integers, [1, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10])
 
+    def test_get_model_values(self):
+        x, y, z = Int("x"), Int("y"), Int("z")
+        a, b = Bool("a"), Bool("b")
+        solver = Solver()
+        solver.add(x == -5, y == 2**70, Not(a))
+        self.assertEqual(solver.check(), sat)
+        model = solver.model()
+        # z and b are not part of the model, big integers and expressions
+        # are evaluated
+        self.assertEqual(
+            get_model_values(model, [x, y, a, z, b, IntVal(4), x + 1, BoolVal(True)]),
+            [-5, 2**70, False, 0, False, 4, -4, True],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,147 @@
+# Copyright (c) 2020-2021 Thomas Paviot (tpaviot@gmail.com)
+#
+# This file is part of ProcessScheduler.
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import processscheduler as ps
+
+
+def build_problem():
+    problem = ps.SchedulingProblem("Validation")
+    worker_1 = ps.Worker("Worker1")
+    worker_2 = ps.Worker("Worker2")
+    machine = ps.CumulativeWorker("Machine", size=2)
+    task_1 = ps.FixedDurationTask("Task1", duration=3)
+    task_2 = ps.FixedDurationTask("Task2", duration=2)
+    task_3 = ps.VariableDurationTask("Task3", min_duration=2, max_duration=4)
+    task_4 = ps.FixedDurationTask("Task4", duration=2)
+    task_5 = ps.FixedDurationTask("Task5", duration=1)
+    task_1.add_required_resources([worker_1, machine])
+    task_2.add_required_resources([worker_2, machine])
+    task_3.add_required_resource(worker_1)
+    task_4.add_required_resource(machine)
+    task_5.add_required_resource(worker_2)
+    ps.TaskPrecedence(task_1, task_3, offset=1)
+    ps.TaskStartAfterLax(task_2, 1)
+    ps.TaskEndBeforeLax(task_5, 8)
+    ps.ResourceUnavailable(worker_2, [(4, 5)])
+    ps.WorkLoad(worker_1, {(0, 4): 3})
+    buffer = ps.NonConcurrentBuffer("Buffer", initial_state=3, lower_bound=0)
+    ps.TaskUnloadBuffer(task_4, buffer, quantity=4)
+    ps.TaskLoadBuffer(task_1, buffer, quantity=2)
+    problem.add_objective_makespan()
+    return problem
+
+
+def move_task(solution, task_name, start) -> None:
+    """move a task of a solution, along with its assignments"""
+    task_solution = solution.tasks[task_name]
+    end = start + task_solution.duration
+    for resource_solution in solution.resources.values():
+        resource_solution.assignments = [
+            (name, start, end) if name == task_name else (name, old_start, old_end)
+            for name, old_start, old_end in resource_solution.assignments
+        ]
+    task_solution.start = start
+    task_solution.end = end
+
+
+class TestValidation(unittest.TestCase):
+    def test_validate_solution(self) -> None:
+        problem = build_problem()
+        solver = ps.SchedulingSolver(problem)
+        solution = solver.solve()
+        self.assertEqual(solution.validate(), [])
+        # the columnar solution
+        solver.columnar_solution = True
+        columnar_solution = solver.build_solution(solver.current_solution)
+        self.assertEqual(columnar_solution.validate(), [])
+
+    def test_validate_violations(self) -> None:
+        problem = build_problem()
+        solution = ps.SchedulingSolver(problem).solve()
+        solution.horizon = 20
+        # the precedence, workload and worker 1 overlap
+        move_task(solution, "Task1", 0)
+        move_task(solution, "Task3", 2)
+        violations = solution.validate()
+        self.assertTrue(
+            any(violation.startswith("TaskPrecedence") for violation in violations)
+        )
+        self.assertIn(
+            "WorkLoad (max): Worker1 is busy 5 from 0 to 4, the bound is 3",
+            violations,
+        )
+        self.assertIn(
+            "Resource: Worker1 processes 2 tasks at time 2, more than 1", violations
+        )
+
+    def test_validate_time_windows(self) -> None:
+        problem = build_problem()
+        solution = ps.SchedulingSolver(problem).solve()
+        solution.horizon = 20
+        move_task(solution, "Task1", 0)
+        move_task(solution, "Task3", 14)
+        move_task(solution, "Task2", 0)
+        move_task(solution, "Task5", 8)
+        move_task(solution, "Task4", 4)
+        self.assertEqual(
+            solution.validate(),
+            [
+                "TaskStartAfterLax: Task2 start 0 < 1",
+                "TaskEndBeforeLax: Task5 end 9 > 8",
+            ],
+        )
+
+    def test_validate_resources_and_buffers(self) -> None:
+        problem = build_problem()
+        solution = ps.SchedulingSolver(problem).solve()
+        solution.horizon = 20
+        move_task(solution, "Task1", 1)
+        move_task(solution, "Task3", 14)
+        move_task(solution, "Task2", 1)
+        move_task(solution, "Task4", 1)
+        move_task(solution, "Task5", 4)
+        violations = solution.validate()
+        # task 1 loads the buffer after task 4 unloads it
+        self.assertIn("Buffer: Buffer level -1 at time 1 is lower than 0", violations)
+        self.assertIn(
+            "Resource: Machine processes 3 tasks at time 1, more than 2", violations
+        )
+        self.assertIn(
+            "ResourceUnavailable: Worker2 is busy from 4 to 5, during an "
+            "unavailability",
+            violations,
+        )
+
+    def test_validate_durations(self) -> None:
+        problem = build_problem()
+        solution = ps.SchedulingSolver(problem).solve()
+        solution.tasks["Task3"].end += 3
+        solution.tasks["Task3"].duration += 3
+        solution.horizon = solution.tasks["Task3"].end - 1
+        violations = solution.validate()
+        self.assertIn(
+            f"Task: the duration {solution.tasks['Task3'].duration} of Task3 is not "
+            "allowed",
+            violations,
+        )
+        self.assertTrue(
+            any("outside the horizon" in violation for violation in violations)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()